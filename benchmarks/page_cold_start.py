@@ -0,0 +1,67 @@
+"""Cold-start import time for every Streamlit page.
+
+Runs each page's top-level imports in a fresh interpreter (so nothing is cached
+in sys.modules) and reports the median wall time. Page bodies are not executed,
+so no API calls are made.
+
+    python benchmarks/page_cold_start.py
+    python benchmarks/page_cold_start.py --repeat 7 --json cold_start.json
+"""
+import argparse
+import ast
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TIMER = '''
+import time
+_start = time.perf_counter()
+{imports}
+print(time.perf_counter() - _start)
+'''
+
+
+def page_imports(path):
+    """Source of the module-level import statements of a page"""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    nodes = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return '\n'.join(ast.unparse(node) for node in nodes)
+
+
+def time_imports(imports, repeat):
+    samples = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, '-c', TIMER.format(imports=imports)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        samples.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure cold-start import time per page.')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', help='also write results to this file')
+    args = parser.parse_args(argv)
+
+    pages = [os.path.join(ROOT, 'app.py')] + sorted(glob.glob(os.path.join(ROOT, 'pages', '*.py')))
+    results = {}
+    for path in pages:
+        name = os.path.relpath(path, ROOT)
+        results[name] = time_imports(page_imports(path), args.repeat)
+        print(f'{name:<40} {results[name] * 1000:8.1f} ms')
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
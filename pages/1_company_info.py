@@ -1,14 +1,7 @@
 import streamlit as st
 from datetime import datetime
-from alpha_vantage.fundamentaldata import FundamentalData
-from dotenv import load_dotenv
-import os
-
-# Load .env if running locally
-load_dotenv()
-api_key = os.getenv("ALPHA_VANTAGE_API_KEY")
-
-fd = FundamentalData(key=api_key, output_format='json')
+from utils.fundamentals import get_overview_cache
+from utils.rate_limit import RateLimited
 
 st.set_page_config(page_title="📊 Company Snapshot", layout="wide")
 
@@ -112,7 +105,11 @@ with st.container():
 
     if ticker:
         try:
-            data, _ = fd.get_company_overview(ticker)
+            # Served from the local overview cache; Alpha Vantage is only hit when it is empty or stale
+            data = get_overview_cache().get(ticker)
+        except RateLimited:
+            st.error("⏳ Alpha Vantage request limit reached. Please try again in a minute.")
+            st.stop()
         except Exception as e:
             st.error("❌ Failed to fetch data from Alpha Vantage.")
             st.stop()
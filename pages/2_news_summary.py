@@ -1,19 +1,14 @@
 # ---------- 2_news_summary.py — Modern UI for News & AI Summary ----------
 
 import streamlit as st
-import requests
-import datetime
-from openai import OpenAI
-from dotenv import load_dotenv
-import os
+from utils.summarizer import stream_summary
+from utils.news_store import get_news_store
+from utils.sentiment import score_articles, sentiment_series
 
 # --------------------------
 # Setup & API Keys
 # --------------------------
-load_dotenv()
-news_api_key = os.getenv("NEWS_API_KEY")
-openai_key = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=openai_key)
+# Clients are shared across reruns and built on first use (see utils/clients.py)
 
 st.set_page_config(page_title="📰 News and AI Summary", layout="wide")
 
@@ -84,18 +79,16 @@ with st.container():
     ticker = st.text_input("Enter Stock Ticker", value="AAPL")
 
     if ticker:
-        today = datetime.date.today()
-        from_date = today - datetime.timedelta(days=30)
-
-        url = (
-            f"https://newsapi.org/v2/everything?q={ticker}&from={from_date}&to={today}"
-            f"&sortBy=publishedAt&language=en&apiKey={news_api_key}"
-        )
-
-        response = requests.get(url)
-
-        if response.status_code == 200:
-            articles = response.json().get("articles", [])
+        # Only articles newer than the last one seen are requested; syndicated copies are dropped
+        news_store = get_news_store()
+        try:
+            news_store.ingest(ticker)
+            fetch_failed = False
+        except Exception:
+            fetch_failed = True
+        articles = news_store.latest(ticker, limit=5)
+
+        if articles or not fetch_failed:
             if articles:
                 st.markdown('<div class="section-title">📢 Latest News</div>', unsafe_allow_html=True)
 
@@ -105,25 +98,35 @@ with st.container():
                     st.markdown(f'<a class="url-link" href="{article["url"]}" target="_blank">{article["url"]}</a>', unsafe_allow_html=True)
                     st.markdown("---")
 
-                st.markdown('<div class="section-title">🤖 AI-Generated Summary</div>', unsafe_allow_html=True)
+                # Local lexicon scoring over every stored story; the LLM is only used for the narrative
+                st.markdown('<div class="section-title">📊 News Sentiment (30 days)</div>', unsafe_allow_html=True)
+                recent_articles = news_store.recent(ticker, days=30)
+                daily_sentiment = sentiment_series(recent_articles)
+                if not daily_sentiment.empty:
+                    st.metric("Average sentiment (-1 to 1)", f"{score_articles(recent_articles).mean():+.2f}",
+                              help=f"Scored locally from {len(recent_articles)} distinct stories")
+                    st.line_chart(daily_sentiment)
 
-                combined_text = "\n\n".join(
-                    f"{article.get('title', '')}\n{article.get('description', '')}" for article in articles[:5]
-                )
+                st.markdown('<div class="section-title">🤖 AI-Generated Summary</div>', unsafe_allow_html=True)
 
-                if combined_text.strip():
-                    prompt = f"Summarize the following news and present them in bullet points. Add a short summary paragraph after the bullet indicating wether it is good or bad for the stock price. {ticker}:\n\n{combined_text}"
-                    try:
-                        summary_response = client.chat.completions.create(
-                            model="gpt-3.5-turbo",
-                            messages=[{"role": "user", "content": prompt}]
+                # Tokens are rendered as they arrive; identical article sets come from the summary cache
+                placeholder = st.empty()
+                metrics = {}
+                summary = ""
+                try:
+                    for text in stream_summary(ticker, articles[:5], metrics=metrics):
+                        summary += text
+                        placeholder.success(summary + "▌")
+                    if summary:
+                        placeholder.success(summary)
+                        st.caption(
+                            f"{'Cached' if metrics['cached'] else 'Generated'} · first token in "
+                            f"{metrics['time_to_first_token']:.2f}s · total {metrics['total_latency']:.2f}s"
                         )
-                        summary = summary_response.choices[0].message.content
-                        st.success(summary)
-                    except Exception as e:
-                        st.error(f"OpenAI API Error: {e}")
-                else:
-                    st.info("No content available for summarization.")
+                    else:
+                        st.info("No content available for summarization.")
+                except Exception as e:
+                    st.error(f"OpenAI API Error: {e}")
             else:
                 st.warning("No news articles found for this ticker.")
         else:
@@ -1,7 +1,11 @@
 # ---------- 3_Historical_Chart.py — Modern UI for Historical Stock Price Chart ----------
 
 import streamlit as st
-import yfinance as yf
+from utils.downsample import downsample_for_timeframe
+from utils.ohlcv_store import get_store
+
+# Intraday timeframe -> (bar interval, days shown)
+INTRADAY_VIEWS = {"1D": ("1m", 1), "5D": ("5m", 5), "7D": ("1h", 7)}
 
 # --------------------------
 # Page Setup
@@ -59,26 +63,49 @@ with st.container():
     st.markdown('''
     <div class="title-card">
         <h1 class="title">📉 Historical Stock Price Chart</h1>
-        <div class="subtitle">Visualize daily closing prices for your selected stock over multiple timeframes.</div>
+        <div class="subtitle">Visualize intraday and daily closing prices for one stock, or compare several, over multiple timeframes.</div>
     </div>
     ''', unsafe_allow_html=True)
 
-    ticker = st.text_input("Enter Stock Ticker", value="AAPL")
+    ticker_input = st.text_input("Enter Stock Ticker(s), comma-separated to compare", value="AAPL")
+    tickers = [t.strip().upper() for t in ticker_input.split(",") if t.strip()]
 
-    if ticker:
+    if tickers:
         st.markdown('<div class="radio-label">Select Timeframe</div>', unsafe_allow_html=True)
         chart_period = st.radio(
             label="",
-            options=["1y", "2y", "5y", "10y"],
-            index=3,
+            options=list(INTRADAY_VIEWS) + ["1y", "2y", "5y", "10y"],
+            index=len(INTRADAY_VIEWS) + 3,
             horizontal=True
         )
 
-        chart_data = yf.download(ticker, period=chart_period, interval="1d")[['Close']].dropna()
+        if chart_period in INTRADAY_VIEWS:
+            # Intraday bars come from the stored 1-minute series, resampled locally (UTC timestamps)
+            interval, days = INTRADAY_VIEWS[chart_period]
+            timeframe = interval
+        else:
+            interval, days = "1d", None
+            timeframe = chart_period
 
-        if not chart_data.empty:
-            st.line_chart(chart_data['Close'])
+        if len(tickers) > 1:
+            # Stale tickers are refreshed in one batched download, then rebased to 100 on shared dates
+            chart_data = get_store().compare(tickers, period=chart_period, interval=interval, days=days)
+            if not chart_data.empty:
+                date_format = "%Y-%m-%d" if interval == "1d" else "%Y-%m-%d %H:%M"
+                st.caption(f"Normalized to 100 at {chart_data.index[0].strftime(date_format)}")
+                st.line_chart(downsample_for_timeframe(chart_data, timeframe))
+            else:
+                st.warning("No overlapping data available for these tickers.")
         else:
-            st.warning("No data available for the selected period.")
+            if interval != "1d":
+                chart_data = get_store().bars(tickers[0], interval=interval, days=days)[['Close']].dropna()
+            else:
+                chart_data = get_store().history(tickers[0], period=chart_period)[['Close']].dropna()
+
+            if not chart_data.empty:
+                # Reduce to the chart's pixel budget; peaks and troughs survive downsampling
+                st.line_chart(downsample_for_timeframe(chart_data['Close'], timeframe))
+            else:
+                st.warning("No data available for the selected period.")
 
     st.markdown('</div>', unsafe_allow_html=True)
@@ -1,22 +1,20 @@
 import streamlit as st
-import yfinance as yf
-import numpy as np
-import pandas as pd
 import os
 import base64
 import time
-import pickle
-from sklearn.preprocessing import MinMaxScaler
-from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-from tensorflow.keras.models import Sequential, load_model
-from tensorflow.keras.layers import LSTM, Dense, Dropout
-from tensorflow.keras.optimizers import Adam
+import pandas as pd
+from utils.forecast import MAX_HORIZON, direct, load_direct_predictor, rollout
+from utils.lstm_predictor import StockLSTMPredictor
+from utils.model_registry import get_registry
+from utils.preprocessing import scaler_available
+from utils.tflite_model import fresh_tflite_path, load_tflite_artifacts
+from utils.training_jobs import ACTIVE_STATES, get_job_queue, model_paths
 import warnings
 warnings.filterwarnings('ignore')
 
 st.set_page_config(page_title="AI Predict | StockSense AI", layout="wide")
 st.title("📈 AI Stock Predictor")
-st.markdown("Enter a stock ticker to predict the next closing price using 10 years of historical OHLCV data.")
+st.markdown("Enter a stock ticker to predict upcoming closing prices using 10 years of historical OHLCV data.")
 
 def show_loading_gif(gif_path="trader_robot.gif"):
     try:
@@ -34,162 +32,42 @@ def show_loading_gif(gif_path="trader_robot.gif"):
     except FileNotFoundError:
         st.warning("⚠️ Loading GIF not found.")
 
-class StockLSTMPredictor:
-    def __init__(self, symbol='AAPL', lookback_window=90):
-        self.symbol = symbol
-        self.lookback_window = lookback_window
-        self.scaler = MinMaxScaler(feature_range=(0, 1))
-        self.model = None
-        
-    def fetch_data(self, period='10y'):
-        """Fetch stock data from Yahoo Finance"""
-        print(f"Fetching {self.symbol} data...")
-        stock = yf.Ticker(self.symbol)
-        data = stock.history(period=period)
-        
-        # Use multiple features for better prediction
-        features = ['Open', 'High', 'Low', 'Close', 'Volume']
-        self.data = data[features].copy()
-        
-        # Add technical indicators
-        self.data['MA_10'] = self.data['Close'].rolling(window=10).mean()
-        self.data['MA_30'] = self.data['Close'].rolling(window=30).mean()
-        self.data['Volatility'] = self.data['Close'].rolling(window=10).std()
-        self.data['Price_Change'] = self.data['Close'].pct_change()
-        
-        # Drop NaN values
-        self.data = self.data.dropna()
-        
-        return self.data
-    
-    def prepare_data(self, test_size=0.2):
-        """Prepare data for LSTM training"""
-        # Scale the data
-        scaled_data = self.scaler.fit_transform(self.data)
-        
-        # Create sequences
-        X, y = [], []
-        for i in range(self.lookback_window, len(scaled_data)):
-            X.append(scaled_data[i-self.lookback_window:i])
-            y.append(scaled_data[i, 3])  # Close price is at index 3
-        
-        X, y = np.array(X), np.array(y)
-        
-        # Split into train and test sets
-        split_idx = int(len(X) * (1 - test_size))
-        
-        self.X_train = X[:split_idx]
-        self.X_test = X[split_idx:]
-        self.y_train = y[:split_idx]
-        self.y_test = y[split_idx:]
-        
-    def build_model(self):
-        """Build LSTM model"""
-        model = Sequential([
-            LSTM(50, return_sequences=True, input_shape=(self.X_train.shape[1], self.X_train.shape[2])),
-            Dropout(0.2),
-            LSTM(50, return_sequences=True),
-            Dropout(0.2),
-            LSTM(50, return_sequences=False),
-            Dropout(0.2),
-            Dense(25),
-            Dense(1)
-        ])
-        
-        model.compile(optimizer=Adam(learning_rate=0.001), loss='mse', metrics=['mae'])
-        self.model = model
-        
-    def train_model(self, epochs=50, batch_size=32, validation_split=0.2):
-        """Train the LSTM model"""
-        from tensorflow.keras.callbacks import EarlyStopping
-        
-        early_stopping = EarlyStopping(
-            monitor='val_loss', patience=10, restore_best_weights=True
-        )
-        
-        history = self.model.fit(
-            self.X_train, self.y_train,
-            batch_size=batch_size,
-            epochs=epochs,
-            validation_split=validation_split,
-            callbacks=[early_stopping],
-            verbose=1
-        )
-        
-        return history
-    
-    def evaluate_model(self):
-        """Evaluate model performance"""
-        # Make predictions
-        train_pred = self.model.predict(self.X_train)
-        test_pred = self.model.predict(self.X_test)
-        
-        # Inverse transform predictions (only for close price)
-        # Create dummy array with same shape as original data
-        dummy_train = np.zeros((len(train_pred), self.data.shape[1]))
-        dummy_test = np.zeros((len(test_pred), self.data.shape[1]))
-        dummy_train[:, 3] = train_pred.flatten()
-        dummy_test[:, 3] = test_pred.flatten()
-        
-        train_pred_scaled = self.scaler.inverse_transform(dummy_train)[:, 3]
-        test_pred_scaled = self.scaler.inverse_transform(dummy_test)[:, 3]
-        
-        # Inverse transform actual values
-        dummy_y_train = np.zeros((len(self.y_train), self.data.shape[1]))
-        dummy_y_test = np.zeros((len(self.y_test), self.data.shape[1]))
-        dummy_y_train[:, 3] = self.y_train
-        dummy_y_test[:, 3] = self.y_test
-        
-        y_train_scaled = self.scaler.inverse_transform(dummy_y_train)[:, 3]
-        y_test_scaled = self.scaler.inverse_transform(dummy_y_test)[:, 3]
-        
-        # Calculate metrics
-        test_rmse = np.sqrt(mean_squared_error(y_test_scaled, test_pred_scaled))
-        test_mae = mean_absolute_error(y_test_scaled, test_pred_scaled)
-        test_r2 = r2_score(y_test_scaled, test_pred_scaled)
-        
-        return test_mae, test_rmse, test_r2
-    
-    def predict_next_day(self):
-        """Predict next day's closing price"""
-        # Get last sequence from the data
-        last_sequence = self.scaler.transform(self.data.tail(self.lookback_window))
-        last_sequence = last_sequence.reshape(1, self.lookback_window, -1)
-        
-        # Make prediction
-        pred_scaled = self.model.predict(last_sequence)
-        
-        # Inverse transform
-        dummy = np.zeros((1, self.data.shape[1]))
-        dummy[0, 3] = pred_scaled[0, 0]
-        pred_price = self.scaler.inverse_transform(dummy)[0, 3]
-        
-        return pred_price
-    
-    def save_model_and_scaler(self, model_path, scaler_path):
-        """Save trained model and scaler"""
-        self.model.save(model_path)
-        with open(scaler_path, 'wb') as f:
-            pickle.dump(self.scaler, f)
-    
-    def load_model_and_scaler(self, model_path, scaler_path):
-        """Load trained model and scaler"""
-        self.model = load_model(model_path)
-        with open(scaler_path, 'rb') as f:
-            self.scaler = pickle.load(f)
-
 # Streamlit UI
 ticker = st.text_input("📥 Enter Stock Ticker (e.g. AAPL, TSLA):", value="AAPL").upper()
+horizon = st.slider("📅 Forecast horizon (trading days)", min_value=1, max_value=MAX_HORIZON, value=1)
 look_back = 90
-model_path = f"models/{ticker}_lstm_model.keras"
-scaler_path = f"models/{ticker}_scaler.pkl"
+model_path, scaler_path, meta_path = model_paths(ticker)
 
 # Create models directory if it doesn't exist
 os.makedirs("models", exist_ok=True)
 
-if st.button("🔮 Predict Next Day Price"):
+model_ready = os.path.exists(model_path) and scaler_available(scaler_path)
+horizon_label = "Next Day" if horizon == 1 else f"{horizon}-Day"
+
+if st.button(f"🔮 Predict {horizon_label} Price"):
+    st.session_state["predict_ticker"] = ticker
+    if not model_ready:
+        # Train in a background worker; duplicate requests for the same ticker share one job
+        get_job_queue().submit(ticker, lookback_window=look_back, epochs=50, batch_size=32)
+
+if st.session_state.get("predict_ticker") == ticker and not model_ready:
+    job = get_job_queue().status(ticker)
+    if job is not None and job["status"] in ACTIVE_STATES:
+        st.info("🏗️ Training new model in the background...")
+        st.progress(job["epoch"] / job["epochs"], text=f"Epoch {job['epoch']} / {job['epochs']}")
+        time.sleep(2)
+        st.experimental_rerun()
+    elif job is not None and job["status"] == "done" and os.path.exists(model_path) and scaler_available(scaler_path):
+        # The job finished after model_ready was checked; the rerun takes the prediction branch
+        st.experimental_rerun()
+    else:
+        error = job.get("error") if job else None
+        st.error(f"❌ Error loading/training model: {error or 'No trained model was saved.'}")
+        st.session_state.pop("predict_ticker")
+
+elif st.session_state.get("predict_ticker") == ticker:
+    st.session_state.pop("predict_ticker")
     show_loading_gif()
-    time.sleep(2)
 
     try:
         # Initialize predictor
@@ -207,37 +85,44 @@ if st.button("🔮 Predict Next Day Price"):
         st.stop()
 
     try:
-        # Check if model exists
-        if os.path.exists(model_path) and os.path.exists(scaler_path):
-            st.info("🔄 Loading existing model...")
-            predictor.load_model_and_scaler(model_path, scaler_path)
-            
-            # Still need to prepare data for prediction
-            predictor.prepare_data(test_size=0.2)
-            
+        st.info("🔄 Loading existing model...")
+        meta = predictor.load_metadata(meta_path)
+        # A current TFLite export is lighter to keep resident; legacy models without metadata need Keras to backfill it
+        lite_path = fresh_tflite_path(model_path)
+        if lite_path is not None and meta is not None:
+            loaded = get_registry().get(f"{ticker}:tflite", lite_path, scaler_path, loader=load_tflite_artifacts)
         else:
-            st.info("🏗️ Training new model...")
-            # Prepare data
-            predictor.prepare_data(test_size=0.2)
-            
-            # Build and train model
-            predictor.build_model()
-            predictor.train_model(epochs=50, batch_size=32)
-            
-            # Save model and scaler
-            predictor.save_model_and_scaler(model_path, scaler_path)
-            st.success("💾 Model saved for future use!")
+            loaded = get_registry().get(ticker, model_path, scaler_path)
+        predictor.model, predictor.scaler = loaded.model, loaded.scaler
+        
+        # Models saved before metadata files existed are evaluated once and backfilled
+        if meta is None:
+            predictor.prepare_data(test_size=0.2, fit_scaler=False)
+            predictor.save_metadata(meta_path, predictor.evaluate_model())
+            meta = predictor.load_metadata(meta_path)
+        elif meta.get("scaler_version", predictor.scaler.version) != predictor.scaler.version:
+            st.error("❌ Saved scaler does not match the one this model was trained with. Retrain the model.")
+            st.stop()
             
     except Exception as e:
         st.error(f"❌ Error loading/training model: {str(e)}")
         st.stop()
 
     try:
-        # Evaluate model
-        mae, rmse, r2 = predictor.evaluate_model()
-        
-        # Make next day prediction
-        predicted_price = predictor.predict_next_day()
+        forecast = method = None
+        if horizon == 1:
+            predicted_price = predictor.predict_next_day()
+        else:
+            # A model trained for this horizon predicts every day in one pass; otherwise the
+            # next-day model is fed its own predictions, advancing the indicators incrementally
+            direct_predictor, _ = load_direct_predictor(ticker, horizon, lookback_window=look_back)
+            if direct_predictor is not None:
+                forecast, method = direct({ticker: direct_predictor}, horizon)[ticker], "direct"
+                # Report the hold-out metrics of the model that made the forecast
+                meta = direct_predictor.load_metadata(model_paths(ticker, horizon=horizon)[2]) or meta
+            else:
+                forecast, method = rollout({ticker: predictor}, horizon)[ticker], "rollout"
+            predicted_price = forecast[-1]
         
     except Exception as e:
         st.error(f"❌ Error in prediction: {str(e)}")
@@ -245,7 +130,21 @@ if st.button("🔮 Predict Next Day Price"):
 
     # Display results with your exact UI format
     st.success("✅ Prediction Complete")
-    st.markdown(f"### 📈 Predicted Closing Price for Next Day ({ticker}): **${float(predicted_price):.2f}**")
+    target_label = "for Next Day" if horizon == 1 else f"in {horizon} Trading Days"
+    st.markdown(f"### 📈 Predicted Closing Price {target_label} ({ticker}): **${float(predicted_price):.2f}**")
+    metrics = meta['metrics']
+    st.caption(
+        f"Hold-out metrics from training on {meta['trained_at'][:10]}: "
+        f"MAE ${metrics['mae']:.2f} · RMSE ${metrics['rmse']:.2f} · R² {metrics['r2']:.3f}"
+    )
+    if forecast is not None:
+        dates = pd.bdate_range(df.index[-1] + pd.offsets.BDay(), periods=horizon)
+        st.markdown(f"### 📅 {horizon}-Day Forecast ({ticker})")
+        st.line_chart(pd.Series(forecast, index=dates, name="Predicted Close"))
+        if method == "direct":
+            st.caption(f"Predicted in one pass by a model trained for a {horizon}-day horizon.")
+        else:
+            st.caption("Each day is predicted from the previous days' predictions, so uncertainty grows with the horizon.")
     
 
 # Add some additional info
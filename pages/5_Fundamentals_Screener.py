@@ -0,0 +1,95 @@
+# ---------- 5_Fundamentals_Screener.py — Watchlist view of key fundamentals ----------
+
+import streamlit as st
+from utils.fundamentals import filter_fundamentals, load_fundamentals
+
+# --------------------------
+# Page Setup
+# --------------------------
+st.set_page_config(page_title="🧮 Fundamentals Screener", layout="wide")
+
+# --------------------------
+# Custom Styling
+# --------------------------
+st.markdown("""
+<style>
+body {
+    background: linear-gradient(135deg, #fdfcfb, #f8f3f3);
+    font-family: 'Segoe UI', sans-serif;
+}
+.block {
+    background-color: #ffffffdd;
+    padding: 2rem 2.5rem;
+    margin: 2rem auto;
+    border-radius: 18px;
+    max-width: 1300px;
+    box-shadow: 0 10px 50px rgba(0, 0, 0, 0.08);
+}
+.title-card {
+    background: #e0f2fe;
+    padding: 2rem;
+    text-align: center;
+    border-radius: 14px;
+    margin-bottom: 2rem;
+}
+h1.title {
+    font-size: 2.5rem;
+    font-weight: 800;
+    color: #1f2937;
+}
+.subtitle {
+    font-size: 1.05rem;
+    color: #374151;
+}
+</style>
+""", unsafe_allow_html=True)
+
+# --------------------------
+# UI Layout
+# --------------------------
+with st.container():
+    st.markdown('<div class="block">', unsafe_allow_html=True)
+
+    st.markdown('''
+    <div class="title-card">
+        <h1 class="title">🧮 Fundamentals Screener</h1>
+        <div class="subtitle">Compare PE, EPS, market cap, ROE and beta across a whole watchlist.</div>
+    </div>
+    ''', unsafe_allow_html=True)
+
+    watchlist = st.text_input("Enter Tickers (comma-separated)", value="AAPL, MSFT, GOOGL, AMZN, NVDA")
+    tickers = tuple(t.strip().upper() for t in watchlist.split(",") if t.strip())
+
+    if tickers:
+        # The parsed table is kept per watchlist so sorting and filtering never re-fetch
+        if st.session_state.get("screener_tickers") != tickers:
+            with st.spinner("Loading fundamentals..."):
+                st.session_state["screener_table"] = load_fundamentals(tickers)
+            st.session_state["screener_tickers"] = tickers
+        table = st.session_state["screener_table"]
+
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            sort_by = st.selectbox("Sort by", ["Market Cap", "PE", "EPS", "ROE", "Beta"])
+        with col2:
+            ascending = st.checkbox("Ascending", value=False)
+        with col3:
+            max_pe = st.number_input("Max PE (0 = no limit)", min_value=0.0, value=0.0, step=5.0)
+        with col4:
+            min_roe = st.number_input("Min ROE (0 = no limit)", value=0.0, step=0.05)
+
+        # Unset bounds are skipped so tickers with missing values stay visible
+        bounds = {}
+        if min_roe != 0:
+            bounds["ROE"] = (min_roe, None)
+        if max_pe > 0:
+            bounds["PE"] = (None, max_pe)
+        view = filter_fundamentals(table, sort_by=sort_by, ascending=ascending, **bounds)
+
+        st.dataframe(view.drop(columns=["Error"]), use_container_width=True, hide_index=True)
+
+        failed = table[table["Error"].notna()]
+        if not failed.empty:
+            st.warning("Could not load: " + ", ".join(failed["Ticker"]))
+
+    st.markdown('</div>', unsafe_allow_html=True)
@@ -0,0 +1,93 @@
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+# Tests import the app's modules as `utils.*`, as the pages do
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeAlphaVantage:
+    """Local stand-in for the Alpha Vantage OVERVIEW endpoint
+
+    `overviews` maps symbol -> overview dict (unknown symbols get {} like the real API),
+    `requests` records every symbol asked for, `delay` slows responses down and
+    `quota_exceeded` makes it answer with the free-tier "Note" message.
+    """
+
+    def __init__(self):
+        self.overviews = {}
+        self.requests = []
+        self.delay = 0.0
+        self.quota_exceeded = False
+        self._lock = threading.Lock()
+
+    def count(self, symbol=None):
+        with self._lock:
+            return len([s for s in self.requests if symbol is None or s == symbol])
+
+    def respond(self, query):
+        symbol = query.get('symbol', [''])[0]
+        with self._lock:
+            self.requests.append(symbol)
+        time.sleep(self.delay)
+        if self.quota_exceeded:
+            return {'Note': 'Thank you for using Alpha Vantage! Our standard API call frequency is 5 calls per minute.'}
+        return self.overviews.get(symbol, {})
+
+
+@pytest.fixture
+def stub_server():
+    """Factory starting local JSON HTTP servers for the duration of a test
+
+    `stub_server(respond, path)` serves GETs with `respond(request_path, headers)`, which
+    returns (status, body, headers); body is JSON-encoded, None for an empty response.
+    Returns the server URL with `path` appended.
+    """
+    servers = []
+
+    def start(respond, path=''):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, body, headers = respond(self.path, self.headers)
+                payload = json.dumps(body).encode() if body is not None else b''
+                try:
+                    self.send_response(status)
+                    if body is not None:
+                        self.send_header('Content-Type', 'application/json')
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header('Content-Length', str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client timed out and hung up
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f'http://127.0.0.1:{server.server_port}{path}'
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def alpha_vantage_server(stub_server):
+    fake = FakeAlphaVantage()
+    fake.url = stub_server(
+        lambda path, headers: (200, fake.respond(parse_qs(urlparse(path).query)), {}), path='/query'
+    )
+    return fake
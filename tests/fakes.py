@@ -0,0 +1,48 @@
+"""Test doubles for the external clients the app talks to.
+
+FakeOpenAI mimics the parts of the `openai.OpenAI` chat completions interface the
+summarizer uses, including `stream=True`, so summaries can be tested without
+network access or tokens; pass it through the summarizer's `client` parameter:
+
+    client = FakeOpenAI("- Apple beat estimates\\n\\nGood for the stock.", delay=0.05)
+    for text in stream_summary("AAPL", articles, client=client): ...
+"""
+import time
+from types import SimpleNamespace
+
+
+class _Completions:
+    def __init__(self, owner):
+        self._owner = owner
+
+    def create(self, model, messages, stream=False, **kwargs):
+        self._owner.calls.append({'model': model, 'messages': messages, 'stream': stream})
+        text = self._owner.reply
+        if not stream:
+            message = SimpleNamespace(role='assistant', content=text)
+            return SimpleNamespace(choices=[SimpleNamespace(index=0, message=message)])
+        return self._stream(text)
+
+    def _stream(self, text):
+        if self._owner.first_token_delay:
+            time.sleep(self._owner.first_token_delay)
+        size = self._owner.chunk_size
+        for i in range(0, len(text), size):
+            if i and self._owner.delay:
+                time.sleep(self._owner.delay)
+            delta = SimpleNamespace(role='assistant', content=text[i:i + size])
+            yield SimpleNamespace(choices=[SimpleNamespace(index=0, delta=delta, finish_reason=None)])
+        yield SimpleNamespace(choices=[SimpleNamespace(index=0, delta=SimpleNamespace(content=None),
+                                                       finish_reason='stop')])
+
+
+class FakeOpenAI:
+    """Returns a canned reply, streamed in chunk_size pieces with optional delays"""
+
+    def __init__(self, reply='Summary unavailable.', chunk_size=4, delay=0.0, first_token_delay=0.0):
+        self.reply = reply
+        self.chunk_size = chunk_size
+        self.delay = delay
+        self.first_token_delay = first_token_delay
+        self.calls = []
+        self.chat = SimpleNamespace(completions=_Completions(self))
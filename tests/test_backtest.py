@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import backtest
+from utils.indicators import INDICATORS
+from utils.lstm_predictor import StockLSTMPredictor
+
+LOOKBACK = 10
+FEATURES = ['Open', 'High', 'Low', 'Close', 'Volume'] + INDICATORS
+
+
+def test_fold_bounds_cover_the_tail_contiguously():
+    bounds = backtest.fold_bounds(1000, test_days=100, n_folds=4)
+
+    assert bounds == [(900, 925), (925, 950), (950, 975), (975, 1000)]
+
+
+def test_fold_bounds_leave_training_samples_for_short_histories():
+    bounds = backtest.fold_bounds(50, test_days=504, n_folds=4)
+
+    assert bounds[0][0] == 1
+    assert bounds[-1][1] == 50
+    assert all(a < b for a, b in bounds)
+    assert all(b == a2 for (_, b), (a2, _) in zip(bounds, bounds[1:]))
+
+
+def test_fold_bounds_drop_empty_folds():
+    bounds = backtest.fold_bounds(100, test_days=3, n_folds=5)
+
+    assert sum(b - a for a, b in bounds) == 3
+    assert all(a < b for a, b in bounds)
+
+
+@pytest.fixture
+def stub_training(monkeypatch):
+    """Replace the Keras model with a scripted stub; returns the frame and a record of the fit"""
+    rng = np.random.default_rng(0)
+    n = 300
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    close[250:] += 500  # a late jump that would show up in a scaler fitted on the future
+    frame = pd.DataFrame(rng.uniform(1, 2, (n, len(FEATURES))), columns=FEATURES,
+                         index=pd.bdate_range('2020-01-01', periods=n, name='Date'))
+    frame['Close'] = close
+    record = {'frame': frame}
+
+    class Model:
+        def __init__(self, predictor, lag):
+            self.predictor = predictor
+            self.lag = lag
+
+        def predict(self, dataset, verbose=0):
+            start, stop = dataset
+            closes = self.predictor.scaled_data[:, 3]
+            return closes[start + LOOKBACK - self.lag:stop + LOOKBACK - self.lag, np.newaxis]
+
+    def build_model(self, **kwargs):
+        self.model = Model(self, record['lag'])
+
+    def train_model(self, epochs=50, batch_size=32, **kwargs):
+        record['split_idx'] = self.split_idx
+        record['scaler_max'] = self.scaler.data_max.copy()
+
+    monkeypatch.setattr(StockLSTMPredictor, 'build_model', build_model)
+    monkeypatch.setattr(StockLSTMPredictor, 'train_model', train_model)
+    monkeypatch.setattr(StockLSTMPredictor, 'window_dataset', lambda self, start, stop, **kwargs: (start, stop))
+    return record
+
+
+def test_run_fold_aligns_predictions_with_their_target_days(stub_training):
+    frame = stub_training['frame']
+    # An oracle model that outputs the true next close
+    stub_training['lag'] = 0
+
+    result = backtest._run_fold('TEST', frame, LOOKBACK, 2, 200, 230, epochs=1, batch_size=32)
+
+    targets = frame.iloc[200 + LOOKBACK:230 + LOOKBACK]
+    assert list(result.index) == list(targets.index)
+    assert (result['fold'] == 2).all()
+    np.testing.assert_allclose(result['actual'], targets['Close'])
+    np.testing.assert_allclose(result['prev_close'], frame['Close'].iloc[200 + LOOKBACK - 1:230 + LOOKBACK - 1])
+    np.testing.assert_allclose(result['predicted'], result['actual'], rtol=1e-4)
+
+
+def test_run_fold_prev_close_matches_a_persistence_model(stub_training):
+    stub_training['lag'] = 1
+
+    result = backtest._run_fold('TEST', stub_training['frame'], LOOKBACK, 0, 150, 180, epochs=1, batch_size=32)
+
+    np.testing.assert_allclose(result['predicted'], result['prev_close'], rtol=1e-4)
+    assert not backtest._score(result)['direction_hit'].isna().any()
+
+
+def test_run_fold_trains_only_on_data_before_the_fold(stub_training):
+    frame = stub_training['frame']
+    stub_training['lag'] = 0
+
+    backtest._run_fold('TEST', frame, LOOKBACK, 0, 200, 240, epochs=1, batch_size=32)
+
+    # Training samples [0, 200) end with the target on row 200 + LOOKBACK - 1
+    assert stub_training['split_idx'] == 200
+    np.testing.assert_allclose(stub_training['scaler_max'], frame.iloc[:200 + LOOKBACK].max().to_numpy())
+    assert stub_training['scaler_max'][3] < frame['Close'].iloc[250:].min()
+
+
+def test_walk_forward_hands_every_fold_the_same_frame(stub_training, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    frame = stub_training['frame']
+    stub_training['lag'] = 0
+    pools = []
+    fetches = []
+
+    def fetch_data(self, period='10y'):
+        fetches.append(self.symbol)
+        self.data = frame
+        return frame
+
+    def pool(max_workers, threads_per_worker=None):
+        pools.append((max_workers, threads_per_worker))
+        return ThreadPoolExecutor(max_workers=1)
+
+    monkeypatch.setattr(StockLSTMPredictor, 'fetch_data', fetch_data)
+    monkeypatch.setattr(backtest, 'get_store', lambda: type('Store', (), {'refresh_many': lambda self, t: None})())
+    monkeypatch.setattr(backtest, 'tf_process_pool', pool)
+
+    results = backtest.walk_forward(['TEST'], lookback_window=LOOKBACK, test_days=40, n_folds=2, epochs=1,
+                                    max_workers=2, threads_per_worker=3)
+
+    assert fetches == ['TEST']
+    assert pools == [(2, 3)]
+    assert list(results.index) == list(frame.index[-40:])
+    np.testing.assert_allclose(results['predicted'], results['actual'], rtol=1e-4)
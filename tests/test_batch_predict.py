@@ -0,0 +1,105 @@
+import gc
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from utils import batch_predict
+from utils.model_registry import ModelRegistry
+
+
+class FakeModel:
+    def __init__(self, value):
+        self.value = value
+
+    def predict(self, windows, verbose=0):
+        return np.full((len(windows), 1), self.value)
+
+    def __call__(self, windows, training=False):
+        return self.predict(windows)
+
+
+class FakePredictor:
+    """Predicts last close + 1 with a per-ticker model"""
+
+    ticker_id = None
+
+    def __init__(self, close):
+        self.model = FakeModel(close + 1)
+        self.data = pd.DataFrame({'Close': [close - 1.0, close]}, index=pd.bdate_range('2024-05-01', periods=2))
+
+    def last_window(self):
+        return np.zeros((3, 1), dtype='float32')
+
+    def inverse_close(self, scaled_close):
+        return np.ravel(scaled_close)
+
+
+def test_predictors_are_released_chunk_by_chunk(monkeypatch):
+    alive = weakref.WeakSet()
+    peak = []
+    lock = threading.Lock()
+
+    def load_predictor(ticker, lookback_window, model_dir, registry, use_global=False):
+        if ticker == 'MISSING':
+            return None, 'no_model'
+        predictor = FakePredictor(100.0 + len(ticker))
+        with lock:
+            gc.collect()
+            alive.add(predictor.model)
+            peak.append(len(alive))
+        return predictor, 'ok'
+
+    monkeypatch.setattr(batch_predict, 'load_predictor', load_predictor)
+    tickers = [f'T{"X" * i}' for i in range(10)] + ['MISSING']
+
+    results = batch_predict.predict_watchlist(tickers, registry=ModelRegistry(max_models=3), max_workers=4)
+
+    assert max(peak) <= 3 + 1
+    assert list(results['ticker']) == tickers
+    ok = results[results['status'] == 'ok']
+    assert len(ok) == 10
+    np.testing.assert_allclose(ok['predicted_close'] - ok['last_close'], 1.0)
+    assert results.set_index('ticker').loc['MISSING', 'status'] == 'no_model'
+
+
+def test_chunk_size_overrides_the_registry_size(monkeypatch):
+    alive = weakref.WeakSet()
+    peak = []
+
+    def load_predictor(ticker, *args):
+        gc.collect()
+        predictor = FakePredictor(10.0)
+        alive.add(predictor.model)
+        peak.append(len(alive))
+        return predictor, 'ok'
+
+    monkeypatch.setattr(batch_predict, 'load_predictor', load_predictor)
+
+    results = batch_predict.predict_watchlist(list('ABCDEFG'), registry=ModelRegistry(max_models=16),
+                                              chunk_size=2, max_workers=1)
+
+    assert max(peak) <= 2 + 1
+    assert (results['status'] == 'ok').all()
+
+
+def test_global_model_predicts_every_ticker_in_one_call(monkeypatch):
+    shared = FakeModel(11.0)
+    calls = []
+    shared.predict = lambda windows, verbose=0: calls.append(len(windows)) or np.full((len(windows), 1), 11.0)
+
+    def load_predictor(ticker, lookback_window, model_dir, registry, use_global=False):
+        assert use_global
+        predictor = FakePredictor(10.0)
+        predictor.model = shared
+        return predictor, 'ok'
+
+    monkeypatch.setattr(batch_predict, 'load_predictor', load_predictor)
+    tickers = [f'T{i}' for i in range(40)]
+
+    results = batch_predict.predict_watchlist(tickers, registry=ModelRegistry(max_models=4), use_global=True)
+
+    assert calls == [40]
+    assert list(results['ticker']) == tickers
+    assert (results['predicted_close'] == 11.0).all()
@@ -0,0 +1,26 @@
+import argparse
+
+import pytest
+
+from utils.cli import add_ticker_args, read_tickers
+
+
+def _parse(argv):
+    parser = argparse.ArgumentParser()
+    add_ticker_args(parser)
+    return read_tickers(parser.parse_args(argv), parser)
+
+
+def test_tickers_merge_arguments_and_watchlist(tmp_path):
+    watchlist = tmp_path / 'watchlist.txt'
+    watchlist.write_text('aapl  # Apple\n\n# comment only\nmsft\nAAPL\n')
+
+    assert _parse(['nvda', '--watchlist', str(watchlist)]) == ['NVDA', 'AAPL', 'MSFT']
+
+
+def test_no_tickers_is_a_usage_error(tmp_path):
+    watchlist = tmp_path / 'watchlist.txt'
+    watchlist.write_text('# nothing yet\n')
+
+    with pytest.raises(SystemExit):
+        _parse(['--watchlist', str(watchlist)])
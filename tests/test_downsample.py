@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.downsample import downsample, downsample_for_timeframe, lttb_indices, minmax_indices
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(0)
+    values = 100 + np.cumsum(rng.normal(0, 1, 20000))
+    values[7777] += 80   # a one-bar spike
+    values[12345] -= 80  # and a one-bar crash
+    return pd.Series(values, index=pd.date_range('2024-01-01', periods=len(values), freq='1min'))
+
+
+def test_lttb_keeps_endpoints_and_the_budget(prices):
+    indices = lttb_indices(prices.to_numpy(), 500)
+
+    assert len(indices) == 500
+    assert indices[0] == 0 and indices[-1] == len(prices) - 1
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_lttb_keeps_isolated_spikes(prices):
+    indices = set(lttb_indices(prices.to_numpy(), 500))
+
+    assert {7777, 12345} <= indices
+
+
+def test_minmax_keeps_every_bucket_extreme(prices):
+    values = prices.to_numpy()
+    indices = minmax_indices(values, 400)
+
+    assert indices[0] == 0 and indices[-1] == len(values) - 1
+    assert len(indices) <= 400 + 2
+    assert values[indices].max() == values.max()
+    assert values[indices].min() == values.min()
+    # Every 100-point bucket contributes its own high and low
+    for bucket in np.array_split(np.arange(len(values)), 200):
+        assert bucket[values[bucket].argmax()] in indices
+        assert bucket[values[bucket].argmin()] in indices
+
+
+def test_short_series_are_returned_unchanged(prices):
+    short = prices.iloc[:100]
+
+    assert downsample(short, n_out=800) is short
+    assert list(lttb_indices(short.to_numpy(), 800)) == list(range(100))
+
+
+def test_frames_keep_each_columns_extremes(prices):
+    frame = pd.DataFrame({'AAA': prices, 'BBB': prices.iloc[::-1].to_numpy()}, index=prices.index)
+
+    reduced = downsample_for_timeframe(frame, '1m', n_out=400)
+
+    assert reduced.index.is_monotonic_increasing
+    assert len(reduced) < len(frame)
+    for column in frame:
+        assert reduced[column].max() == frame[column].max()
+        assert reduced[column].min() == frame[column].min()
+    assert reduced.index[0] == frame.index[0] and reduced.index[-1] == frame.index[-1]
@@ -0,0 +1,65 @@
+import gc
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from utils import forecast
+from utils.model_registry import ModelRegistry
+
+
+class FakeModel:
+    pass
+
+
+class FakePredictor:
+    def __init__(self, ticker):
+        self.ticker = ticker
+        self.model = FakeModel()
+        self.data = pd.DataFrame({'Close': [1.0]}, index=pd.DatetimeIndex(['2024-05-03']))
+
+
+def test_per_ticker_forecasts_hold_a_bounded_number_of_models(monkeypatch):
+    alive = weakref.WeakSet()
+    peak = []
+
+    def load_predictor(ticker, *args):
+        gc.collect()
+        predictor = FakePredictor(ticker)
+        alive.add(predictor.model)
+        peak.append(len(alive))
+        return predictor, 'ok'
+
+    def rollout(predictors, horizon):
+        return {t: np.arange(horizon) + 1.0 for t in predictors}
+
+    monkeypatch.setattr(forecast, 'load_direct_predictor', lambda ticker, *args: (None, 'no_model'))
+    monkeypatch.setattr(forecast, 'load_predictor', load_predictor)
+    monkeypatch.setattr(forecast, 'rollout', rollout)
+    tickers = [f'T{i}' for i in range(12)]
+
+    results = forecast.forecast_watchlist(tickers, horizon=3, registry=ModelRegistry(max_models=16),
+                                          chunk_size=3, max_workers=2)
+
+    # The chunk plus the forecast being computed
+    assert max(peak) <= 3 + 1
+    assert list(results['ticker']) == [t for t in tickers for _ in range(3)]
+    assert list(results['date'][:3]) == ['2024-05-06', '2024-05-07', '2024-05-08']
+    assert (results['method'] == 'rollout').all()
+
+
+def test_global_rollout_runs_all_tickers_together(monkeypatch):
+    calls = []
+
+    def rollout(predictors, horizon):
+        calls.append(sorted(predictors))
+        return {t: np.ones(horizon) for t in predictors}
+
+    monkeypatch.setattr(forecast, 'load_predictor', lambda ticker, *args: (FakePredictor(ticker), 'ok'))
+    monkeypatch.setattr(forecast, 'rollout', rollout)
+
+    results = forecast.forecast_watchlist(['A', 'B', 'C'], horizon=2, registry=ModelRegistry(max_models=1),
+                                          use_global=True)
+
+    assert calls == [['A', 'B', 'C']]
+    assert len(results) == 6
@@ -0,0 +1,167 @@
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.fundamentals import DAY, OverviewCache, http_overview_fetcher, load_fundamentals
+from utils.rate_limit import RateLimited, TokenBucket
+
+AAPL = {'Symbol': 'AAPL', 'Name': 'Apple Inc', 'Sector': 'TECHNOLOGY', 'PERatio': '30.5', 'EPS': '6.1',
+        'MarketCapitalization': '3000000000000', 'ReturnOnEquityTTM': '1.5', 'Beta': '1.2'}
+
+
+@pytest.fixture
+def make_cache(tmp_path, alpha_vantage_server):
+    def make(limiter=None, wait_timeout=5):
+        return OverviewCache(
+            db_path=str(tmp_path / 'fundamentals.sqlite'),
+            fetch=http_overview_fetcher(alpha_vantage_server.url, api_key='test'),
+            limiter=limiter or TokenBucket(rate=100, capacity=100),
+            wait_timeout=wait_timeout,
+        )
+    return make
+
+
+def _age_field(cache, ticker, field, seconds):
+    with sqlite3.connect(cache.db_path) as conn:
+        conn.execute('UPDATE overview SET fetched_at = fetched_at - ? WHERE ticker = ? AND field = ?',
+                     (seconds, ticker, field))
+
+
+def _stored_value(cache, ticker, field):
+    with sqlite3.connect(cache.db_path) as conn:
+        row = conn.execute('SELECT value FROM overview WHERE ticker = ? AND field = ?', (ticker, field)).fetchone()
+    return row and row[0]
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.02)
+
+
+def test_concurrent_misses_share_one_request(make_cache, alpha_vantage_server):
+    alpha_vantage_server.overviews['AAPL'] = AAPL
+    alpha_vantage_server.delay = 0.3
+    cache = make_cache()
+    results = []
+
+    def get():
+        results.append(cache.get('aapl'))
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert alpha_vantage_server.count('AAPL') == 1
+    assert results == [AAPL] * 8
+
+
+def test_fresh_entries_are_served_from_disk(make_cache, alpha_vantage_server):
+    alpha_vantage_server.overviews['AAPL'] = AAPL
+    make_cache().get('AAPL')
+
+    # A new cache instance (e.g. after a restart) reads the same database
+    assert make_cache().get('AAPL')['PERatio'] == '30.5'
+    time.sleep(0.1)
+    assert alpha_vantage_server.count() == 1
+
+
+def test_stale_field_is_served_while_revalidating(make_cache, alpha_vantage_server):
+    alpha_vantage_server.overviews['AAPL'] = AAPL
+    cache = make_cache()
+    cache.get('AAPL')
+    alpha_vantage_server.overviews['AAPL'] = dict(AAPL, PERatio='31.0')
+    # PERatio has a one-day TTL; descriptive fields would still be fresh
+    _age_field(cache, 'AAPL', 'PERatio', 2 * DAY)
+
+    assert cache.get('AAPL')['PERatio'] == '30.5'
+    _wait_for(lambda: _stored_value(cache, 'AAPL', 'PERatio') == '31.0')
+    assert cache.get('AAPL')['PERatio'] == '31.0'
+    assert alpha_vantage_server.count('AAPL') == 2
+
+
+def test_slow_fields_stay_fresh_past_fast_field_ttl(make_cache, alpha_vantage_server):
+    alpha_vantage_server.overviews['AAPL'] = AAPL
+    cache = make_cache()
+    cache.get('AAPL')
+    _age_field(cache, 'AAPL', 'Name', 2 * DAY)
+
+    cache.get('AAPL')
+    time.sleep(0.2)
+    assert alpha_vantage_server.count() == 1
+
+
+def test_rate_limit_bounds_requests(make_cache, alpha_vantage_server):
+    for symbol in ('AAA', 'BBB', 'CCC'):
+        alpha_vantage_server.overviews[symbol] = dict(AAPL, Symbol=symbol)
+    cache = make_cache(limiter=TokenBucket(rate=0.01, capacity=2), wait_timeout=0.2)
+
+    cache.get('AAA')
+    cache.get('BBB')
+    with pytest.raises(RateLimited):
+        cache.get('CCC')
+    assert alpha_vantage_server.count() == 2
+
+
+def test_background_refresh_is_skipped_without_budget(make_cache, alpha_vantage_server):
+    alpha_vantage_server.overviews['AAPL'] = AAPL
+    cache = make_cache(limiter=TokenBucket(rate=0.01, capacity=1))
+    cache.get('AAPL')
+    _age_field(cache, 'AAPL', 'PERatio', 2 * DAY)
+
+    assert cache.get('AAPL')['PERatio'] == '30.5'
+    time.sleep(0.3)
+    assert alpha_vantage_server.count() == 1
+
+
+def test_quota_notice_is_an_error_and_not_cached(make_cache, alpha_vantage_server):
+    alpha_vantage_server.quota_exceeded = True
+    cache = make_cache()
+    with pytest.raises(ValueError, match='call frequency'):
+        cache.get('AAPL')
+
+    alpha_vantage_server.quota_exceeded = False
+    alpha_vantage_server.overviews['AAPL'] = AAPL
+    assert cache.get('AAPL') == AAPL
+
+
+def test_load_fundamentals_parses_columns(make_cache, alpha_vantage_server):
+    alpha_vantage_server.overviews['AAPL'] = AAPL
+    table = load_fundamentals(['AAPL'], cache=make_cache())
+
+    row = table.iloc[0]
+    assert row['Company'] == 'Apple Inc'
+    assert row['PE'] == pytest.approx(30.5)
+    assert row['Market Cap'] == 3e12
+    assert row['Error'] is None
+
+
+def test_load_fundamentals_flags_empty_overviews(make_cache, alpha_vantage_server):
+    alpha_vantage_server.overviews['AAPL'] = AAPL
+    table = load_fundamentals(['AAPL', 'NOPE'], cache=make_cache()).set_index('Ticker')
+
+    assert pd.isna(table.loc['AAPL', 'Error'])
+    assert table.loc['NOPE', 'Error'] == 'no data returned'
+    assert np.isnan(table.loc['NOPE', 'PE'])
+
+
+def test_unknown_symbols_are_cached_for_a_day(make_cache, alpha_vantage_server):
+    cache = make_cache()
+
+    assert cache.get('NOPE') == {}
+    assert make_cache().get('NOPE') == {}
+    assert alpha_vantage_server.count('NOPE') == 1
+
+    # Once the negative entry expires the symbol is looked up again
+    _age_field(cache, 'NOPE', '__no_data__', 2 * DAY)
+    alpha_vantage_server.overviews['NOPE'] = dict(AAPL, Symbol='NOPE')
+    assert cache.get('NOPE')['Name'] == 'Apple Inc'
+    assert alpha_vantage_server.count('NOPE') == 2
+    assert '__no_data__' not in make_cache().get('NOPE')
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+tf = pytest.importorskip('tensorflow')
+
+from utils import global_model, ohlcv_store  # noqa: E402
+from utils.indicators import INDICATORS  # noqa: E402
+from utils.lstm_predictor import StockLSTMPredictor  # noqa: E402
+from utils.model_registry import ModelRegistry  # noqa: E402
+from utils.windows import pooled_window_dataset  # noqa: E402
+
+LOOKBACK = 10
+FEATURES = ['Open', 'High', 'Low', 'Close', 'Volume'] + INDICATORS
+
+
+def _synthetic_frame(seed, level, n=400):
+    rng = np.random.default_rng(seed)
+    close = level * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    frame = pd.DataFrame({
+        'Open': close * (1 + rng.normal(0, 0.002, n)),
+        'High': close * 1.01,
+        'Low': close * 0.99,
+        'Close': close,
+        'Volume': rng.uniform(1e6, 2e6, n),
+    }, index=pd.bdate_range('2020-01-01', periods=n, name='Date'))
+    for name in INDICATORS:
+        frame[name] = rng.uniform(0, 1, n)
+    return frame[FEATURES]
+
+
+@pytest.fixture
+def synthetic_market(monkeypatch):
+    frames = {'AAA': _synthetic_frame(0, 50), 'BBB': _synthetic_frame(1, 400), 'ZZZ': _synthetic_frame(2, 5)}
+
+    class Store:
+        def refresh_many(self, tickers, force=False):
+            pass
+
+    def fetch_data(self, period='10y'):
+        self.data = frames[self.symbol].copy()
+        return self.data
+
+    monkeypatch.setattr(ohlcv_store, 'get_store', lambda: Store())
+    monkeypatch.setattr(StockLSTMPredictor, 'fetch_data', fetch_data)
+    return frames
+
+
+def _ids(dataset):
+    return np.concatenate([x[1].numpy()[:, 0] for x, _ in dataset])
+
+
+def test_id_dropout_replaces_a_share_of_ids_with_zero():
+    series = [np.random.default_rng(0).uniform(size=(200, 3)).astype('float32')] * 2
+    ranges = [(0, 150), (0, 150)]
+
+    def ids(rate):
+        return _ids(pooled_window_dataset(series, LOOKBACK, ranges, [1, 2], target_col=0, batch_size=64,
+                                          seed=0, id_dropout=rate))
+
+    assert set(ids(0.0)) == {1, 2}
+    assert set(ids(1.0)) == {0}
+    dropped = np.mean(ids(0.3) == 0)
+    assert 0.15 < dropped < 0.45
+
+
+def test_global_model_serves_unseen_tickers(synthetic_market, tmp_path):
+    meta = global_model.train_global_model(['AAA', 'BBB'], lookback_window=LOOKBACK, epochs=2, batch_size=64,
+                                           model_dir=str(tmp_path), units=8, layers=1, id_dropout=0.2)
+
+    assert meta['tickers'] == ['AAA', 'BBB']
+    assert meta['id_dropout'] == 0.2
+    assert set(meta['metrics']) == {'AAA', 'BBB'}
+    assert global_model.global_model_available(str(tmp_path))
+
+    registry = ModelRegistry()
+    for ticker, expected_id in (('AAA', 1), ('ZZZ', 0)):
+        predictor = StockLSTMPredictor(symbol=ticker, lookback_window=LOOKBACK)
+        predictor.fetch_data()
+        global_model.attach_global_model(predictor, model_dir=str(tmp_path), registry=registry)
+        assert predictor.ticker_id == expected_id
+        price = predictor.predict_next_day()
+        closes = synthetic_market[ticker]['Close']
+        # Per-ticker scaling keeps predictions on the ticker's own price level
+        assert closes.min() * 0.5 < price < closes.max() * 1.5
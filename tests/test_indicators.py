@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.indicators import INDICATORS, LONG_WINDOW, IndicatorEngine, compute_indicators
+
+
+@pytest.fixture
+def closes():
+    # A long random walk at a high price level stresses the running sums' precision
+    rng = np.random.default_rng(0)
+    return 5000 + np.cumsum(rng.normal(0, 25, 3000))
+
+
+def _pandas_indicators(closes):
+    close = pd.Series(closes)
+    return np.column_stack([
+        close.rolling(10).mean(),
+        close.rolling(30).mean(),
+        close.rolling(10).std(),
+        close.pct_change(),
+    ])
+
+
+def test_batch_indicators_match_pandas(closes):
+    # pandas' rolling std is itself an online algorithm, accurate to about 1e-10
+    np.testing.assert_allclose(compute_indicators(closes), _pandas_indicators(closes), rtol=1e-8, equal_nan=True)
+
+
+def test_streaming_engine_matches_batch(closes):
+    streamed = IndicatorEngine().update_many(closes)
+
+    np.testing.assert_allclose(streamed, _pandas_indicators(closes), rtol=1e-8, atol=1e-8, equal_nan=True)
+    assert np.isnan(streamed[:9, 0]).all() and not np.isnan(streamed[9, 0])
+    assert np.isnan(streamed[:LONG_WINDOW - 1, 1]).all() and not np.isnan(streamed[LONG_WINDOW - 1, 1])
+
+
+def test_seeded_and_restored_engines_continue_the_series(closes):
+    expected = compute_indicators(closes)[-100:]
+
+    seeded = IndicatorEngine.seed(closes[:-100])
+    restored = IndicatorEngine.from_dict(IndicatorEngine.seed(closes[:-100]).to_dict())
+
+    np.testing.assert_allclose(seeded.update_many(closes[-100:]), expected, rtol=1e-8)
+    np.testing.assert_allclose(restored.update_many(closes[-100:]), expected, rtol=1e-8)
+
+
+def test_update_returns_one_value_per_indicator(closes):
+    engine = IndicatorEngine.seed(closes)
+    assert len(engine.update(closes[-1])) == len(INDICATORS)
@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+
+import pytest
+
+from utils.model_registry import LoadedModel, ModelRegistry
+
+
+class StubModel:
+    input_shape = (None, 4, 2)
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, inputs, training=False):
+        self.calls += 1
+        return inputs[:, -1, :1]
+
+
+class StubLoader:
+    """Registry loader building StubModels of a fixed size, counting loads per ticker"""
+
+    def __init__(self, nbytes=100, delay=0.0):
+        self.nbytes = nbytes
+        self.delay = delay
+        self.loads = []
+        self._lock = threading.Lock()
+
+    def __call__(self, ticker, version, model_path, scaler_path):
+        time.sleep(self.delay)
+        with self._lock:
+            self.loads.append(ticker)
+        return LoadedModel(ticker, version, StubModel(), None, self.nbytes)
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    def make(ticker):
+        path = tmp_path / f'{ticker}_lstm_model.keras'
+        path.write_bytes(b'model')
+        return str(path)
+    return make
+
+
+def test_hits_reuse_the_loaded_and_warmed_model(model_file):
+    registry, loader = ModelRegistry(), StubLoader()
+    path = model_file('AAA')
+
+    first = registry.get('AAA', path, 'scaler.npz', loader=loader)
+    second = registry.get('AAA', path, 'scaler.npz', loader=loader)
+
+    assert first is second
+    assert first.model.calls == 1  # the warm-up pass
+    assert loader.loads == ['AAA']
+    assert registry.stats() == {'hits': 1, 'misses': 1, 'evictions': 0, 'resident_models': 1,
+                                'resident_bytes': 100}
+
+
+def test_least_recently_used_model_is_evicted_by_count(model_file):
+    registry, loader = ModelRegistry(max_models=2), StubLoader()
+    paths = {t: model_file(t) for t in ('AAA', 'BBB', 'CCC')}
+
+    registry.get('AAA', paths['AAA'], 'scaler.npz', loader=loader)
+    registry.get('BBB', paths['BBB'], 'scaler.npz', loader=loader)
+    registry.get('AAA', paths['AAA'], 'scaler.npz', loader=loader)
+    registry.get('CCC', paths['CCC'], 'scaler.npz', loader=loader)
+    registry.get('AAA', paths['AAA'], 'scaler.npz', loader=loader)
+    registry.get('BBB', paths['BBB'], 'scaler.npz', loader=loader)
+
+    assert loader.loads == ['AAA', 'BBB', 'CCC', 'BBB']
+    stats = registry.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (2, 4, 2)
+    assert stats['resident_models'] == 2
+
+
+def test_models_are_evicted_by_bytes(model_file):
+    registry, loader = ModelRegistry(max_models=10, max_bytes=250), StubLoader(nbytes=100)
+    for ticker in ('AAA', 'BBB', 'CCC'):
+        registry.get(ticker, model_file(ticker), 'scaler.npz', loader=loader)
+
+    stats = registry.stats()
+    assert stats['resident_models'] == 2
+    assert stats['resident_bytes'] == 200
+    assert stats['evictions'] == 1
+
+
+def test_an_oversized_model_stays_resident_alone(model_file):
+    registry, loader = ModelRegistry(max_bytes=50), StubLoader(nbytes=100)
+    path = model_file('BBB')
+    registry.get('AAA', model_file('AAA'), 'scaler.npz', loader=loader)
+    entry = registry.get('BBB', path, 'scaler.npz', loader=loader)
+
+    assert registry.stats()['resident_models'] == 1
+    assert registry.get('BBB', path, 'scaler.npz', loader=loader) is entry
+
+
+def test_retrained_model_is_reloaded_and_replaces_the_old_version(model_file):
+    registry, loader = ModelRegistry(), StubLoader()
+    path = model_file('AAA')
+    old = registry.get('AAA', path, 'scaler.npz', loader=loader)
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    new = registry.get('AAA', path, 'scaler.npz', loader=loader)
+
+    assert new is not old
+    assert new.version == os.stat(path).st_mtime_ns
+    assert loader.loads == ['AAA', 'AAA']
+    assert registry.stats()['resident_models'] == 1
+
+
+def test_concurrent_misses_load_once(model_file):
+    registry, loader = ModelRegistry(), StubLoader(delay=0.2)
+    path = model_file('AAA')
+    results = []
+
+    def get():
+        results.append(registry.get('AAA', path, 'scaler.npz', loader=loader))
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loader.loads == ['AAA']
+    assert len({id(entry) for entry in results}) == 1
+    assert registry.stats()['resident_models'] == 1
@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from utils.news import NewsAPIError, NewsClient
+
+ARTICLES = {'status': 'ok', 'articles': [{'title': 'Apple beats estimates', 'publishedAt': '2024-05-03T12:00:00Z'}]}
+
+
+class FakeNewsAPI:
+    """Scripted NewsAPI: each request pops the next (status, body, headers, delay) from `script`"""
+
+    def __init__(self):
+        self.script = []
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def respond(self, path, headers):
+        with self._lock:
+            self.requests.append((path, dict(headers)))
+            status, body, response_headers, delay = self.script.pop(0) if self.script else (200, ARTICLES, {}, 0)
+        time.sleep(delay)
+        return status, body, response_headers
+
+
+@pytest.fixture
+def news_server(stub_server):
+    fake = FakeNewsAPI()
+    fake.url = stub_server(fake.respond, path='/v2')
+    return fake
+
+
+def _client(server, **kwargs):
+    kwargs.setdefault('backoff_factor', 0)
+    return NewsClient(api_key='test', base_url=server.url, **kwargs)
+
+
+def test_503_is_retried(news_server):
+    news_server.script = [(503, {'status': 'error', 'message': 'busy'}, {}, 0)] * 2
+
+    articles = _client(news_server).fetch_articles('AAPL')
+
+    assert articles == ARTICLES['articles']
+    assert len(news_server.requests) == 3
+
+
+def test_persistent_errors_raise_after_retries(news_server):
+    news_server.script = [(503, {'status': 'error', 'message': 'busy'}, {}, 0)] * 5
+
+    with pytest.raises(NewsAPIError, match='503: busy'):
+        _client(news_server, retries=2).fetch_articles('AAPL')
+    assert len(news_server.requests) == 3
+
+
+def test_304_reuses_cached_articles(news_server):
+    news_server.script = [(200, ARTICLES, {'ETag': '"v1"'}, 0), (304, None, {'ETag': '"v1"'}, 0)]
+    client = _client(news_server, max_age=0)
+
+    first = client.fetch_articles('AAPL')
+    second = client.fetch_articles('AAPL')
+
+    assert first == second == ARTICLES['articles']
+    assert 'If-None-Match' not in news_server.requests[0][1]
+    assert news_server.requests[1][1]['If-None-Match'] == '"v1"'
+
+
+def test_fresh_responses_skip_the_network(news_server):
+    client = _client(news_server, max_age=60)
+    client.fetch_articles('AAPL')
+    client.fetch_articles('AAPL')
+
+    assert len(news_server.requests) == 1
+
+
+def test_slow_responses_time_out(news_server):
+    news_server.script = [(200, ARTICLES, {}, 1.0)] * 2
+    client = _client(news_server, timeout=(1, 0.2), retries=1)
+
+    started = time.perf_counter()
+    with pytest.raises(requests.exceptions.RequestException):
+        client.fetch_articles('AAPL')
+    assert time.perf_counter() - started < 1.5
+    assert len(news_server.requests) == 2
+
+
+def test_cache_is_bounded(news_server):
+    client = _client(news_server, max_entries=3)
+    for ticker in ('AAPL', 'MSFT', 'NVDA', 'AMZN'):
+        client.fetch_articles(ticker)
+    assert len(client._cache) == 3
+
+    # AAPL was evicted as the least recently used query; MSFT is still cached
+    client.fetch_articles('MSFT')
+    client.fetch_articles('AAPL')
+    assert len(news_server.requests) == 5
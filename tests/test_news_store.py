@@ -0,0 +1,92 @@
+import pytest
+
+from utils.news_store import NewsStore, title_hash
+
+
+class FakeNewsClient:
+    """fetch_articles stand-in returning whatever `articles` holds, newest first, and recording calls"""
+
+    def __init__(self):
+        self.articles = []
+        self.calls = []
+
+    def fetch_articles(self, ticker, from_date=None, to_date=None, days=30):
+        self.calls.append({'ticker': ticker, 'from_date': from_date, 'days': days})
+        return sorted(self.articles, key=lambda a: a['publishedAt'], reverse=True)
+
+
+def article(url, title, published_at, source='Reuters'):
+    return {'url': url, 'title': title, 'publishedAt': published_at, 'description': f'{title}.',
+            'source': {'name': source}}
+
+
+@pytest.fixture
+def client():
+    return FakeNewsClient()
+
+
+@pytest.fixture
+def store(tmp_path, client):
+    return NewsStore(db_path=str(tmp_path / 'news.sqlite'), client=client, max_per_ticker=3, min_interval=300)
+
+
+def test_title_hash_drops_only_the_articles_own_source():
+    assert title_hash('Apple beats estimates - Reuters', 'Reuters') == title_hash('Apple beats estimates | Yahoo Finance', 'Yahoo Finance')
+    assert title_hash('Apple beats estimates - iPhone sales jump', 'Reuters') != \
+        title_hash('Apple beats estimates - services slump', 'Reuters')
+    assert title_hash('Apple Beats Estimates!') == title_hash('apple beats estimates')
+
+
+def test_ingest_backfills_then_resumes_from_the_watermark(store, client):
+    client.articles = [article('https://a/1', 'First story', '2024-05-01T10:00:00Z'),
+                       article('https://a/2', 'Second story', '2024-05-02T10:00:00Z')]
+
+    assert store.ingest('aapl') == 2
+    assert client.calls[0]['from_date'] is None
+    assert store.watermark('AAPL')[0] == '2024-05-02T10:00:00Z'
+
+    # The boundary article comes back (NewsAPI's "from" is inclusive) and is not re-added
+    client.articles.append(article('https://a/3', 'Third story', '2024-05-03T09:00:00Z'))
+    assert store.ingest('AAPL', force=True) == 1
+    assert client.calls[1]['from_date'] == '2024-05-02T10:00:00'
+    assert store.watermark('AAPL')[0] == '2024-05-03T09:00:00Z'
+    assert [a['title'] for a in store.latest('AAPL')] == ['Third story', 'Second story', 'First story']
+
+
+def test_ingest_is_rate_limited_per_ticker(store, client):
+    client.articles = [article('https://a/1', 'First story', '2024-05-01T10:00:00Z')]
+    store.ingest('AAPL')
+
+    assert store.ingest('AAPL') == 0
+    assert len(client.calls) == 1
+    store.ingest('MSFT')
+    assert len(client.calls) == 2
+
+
+def test_syndicated_copies_are_stored_once(store, client):
+    client.articles = [
+        article('https://reuters/1', 'Apple beats estimates - Reuters', '2024-05-01T10:00:00Z'),
+        article('https://yahoo/1', 'Apple beats estimates | Yahoo Finance', '2024-05-01T10:05:00Z', 'Yahoo Finance'),
+        article('https://yahoo/1', 'Apple beats estimates (early draft)', '2024-05-01T09:00:00Z', 'Yahoo Finance'),
+    ]
+
+    assert store.ingest('AAPL') == 1
+
+
+def test_headlines_differing_after_a_dash_are_kept(store, client):
+    client.articles = [
+        article('https://a/1', 'Apple beats estimates - iPhone sales jump', '2024-05-01T10:00:00Z'),
+        article('https://a/2', 'Apple beats estimates - services slump', '2024-05-01T11:00:00Z'),
+    ]
+
+    assert store.ingest('AAPL') == 2
+
+
+def test_history_is_capped_per_ticker(store, client):
+    client.articles = [article(f'https://a/{i}', f'Story {i}', f'2024-05-0{i}T10:00:00Z') for i in range(1, 6)]
+    store.ingest('AAPL')
+    client.articles = [article('https://m/1', 'Other story', '2024-05-01T10:00:00Z')]
+    store.ingest('MSFT')
+
+    assert [a['title'] for a in store.latest('AAPL', limit=10)] == ['Story 5', 'Story 4', 'Story 3']
+    assert len(store.latest('MSFT', limit=10)) == 1
@@ -0,0 +1,270 @@
+import multiprocessing
+import os
+import sys
+import threading
+import types
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.ohlcv_store import COLUMNS, OHLCVStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FakeTicker:
+    """Stand-in for yfinance.Ticker serving minute bars up to `now`, like Yahoo only the last 7 days"""
+
+    calls = []
+    now = None
+
+    def __init__(self, ticker):
+        self.ticker = ticker
+
+    def history(self, period=None, start=None, interval='1d'):
+        FakeTicker.calls.append({'period': period, 'start': start, 'interval': interval})
+        now = FakeTicker.now
+        first = now - pd.Timedelta(days=7)
+        if start is not None:
+            first = max(first, pd.Timestamp(start, tz='UTC'))
+        index = pd.date_range(first.ceil('min'), now, freq='1min')
+        index = index[(index.hour >= 14) & (index.hour < 20)]
+        values = np.arange(len(index), dtype='float64')[:, None].repeat(len(COLUMNS), axis=1) + 1
+        return pd.DataFrame(values, index=index, columns=COLUMNS)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, 'yfinance', types.SimpleNamespace(Ticker=FakeTicker))
+    FakeTicker.calls = []
+    return OHLCVStore(str(tmp_path))
+
+
+def test_intraday_refresh_appends_from_last_bar(store, monkeypatch):
+    FakeTicker.now = pd.Timestamp.now(tz='UTC').floor('min')
+    store.refresh_intraday('AAA', force=True)
+    first_len = len(store.load('AAA', '1m')[0])
+    store.refresh_intraday('AAA', force=True)
+
+    assert FakeTicker.calls[0]['period'] == '7d'
+    assert FakeTicker.calls[1]['start'] is not None
+    dates = store.load('AAA', '1m')[0]
+    assert len(dates) == first_len
+    assert np.all(np.diff(dates) > 0)
+
+
+def test_intraday_refresh_recovers_when_file_is_older_than_yahoo_serves(store, monkeypatch):
+    FakeTicker.now = pd.Timestamp.now(tz='UTC').floor('min') - pd.Timedelta(days=10)
+    store.refresh_intraday('AAA', force=True)
+    old_last = store.load('AAA', '1m')[0][-1]
+
+    FakeTicker.now = pd.Timestamp.now(tz='UTC').floor('min')
+    written = store.refresh_intraday('AAA', force=True)
+
+    assert written > 0
+    assert FakeTicker.calls[-1]['period'] == '7d'
+    dates = store.load('AAA', '1m')[0]
+    # Full rewrite: nothing from the stale file survives
+    assert dates[0] > old_last
+
+
+FAKE_DAILY_YFINANCE = '''
+import os
+import time
+import numpy as np
+import pandas as pd
+
+DAYS = pd.bdate_range('2016-01-01', '2026-10-16')
+
+
+class Ticker:
+    def __init__(self, ticker):
+        pass
+
+    def history(self, period=None, start=None, interval='1d'):
+        end = int(os.environ.get('FAKE_YF_BARS', len(DAYS)))
+        index = DAYS[:end]
+        if start is not None:
+            index = index[index >= pd.Timestamp(start)]
+        time.sleep(float(os.environ.get('FAKE_YF_DELAY', 0)))
+        values = np.arange(len(DAYS), dtype='float64')[DAYS.get_indexer(index)] + 1
+        return pd.DataFrame({c: values for c in ['Open', 'High', 'Low', 'Close', 'Volume']}, index=index)
+'''
+
+
+def _refresh_in_subprocess(root):
+    from utils.ohlcv_store import OHLCVStore
+
+    return OHLCVStore(root).refresh('AAA', force=True)
+
+
+@pytest.fixture
+def daily_store(tmp_path, monkeypatch):
+    fake_dir = tmp_path / 'fake'
+    fake_dir.mkdir()
+    (fake_dir / 'yfinance.py').write_text(FAKE_DAILY_YFINANCE)
+    # Spawned workers inherit the environment, so they import the fake too
+    monkeypatch.syspath_prepend(str(fake_dir))
+    monkeypatch.setenv('PYTHONPATH', os.pathsep.join([str(fake_dir), ROOT]))
+    monkeypatch.delitem(sys.modules, 'yfinance', raising=False)
+    return OHLCVStore(str(tmp_path / 'store'))
+
+
+def test_concurrent_process_refreshes_do_not_duplicate_rows(daily_store, monkeypatch):
+    monkeypatch.setenv('FAKE_YF_BARS', '2000')
+    daily_store.refresh('AAA', force=True)
+    monkeypatch.setenv('FAKE_YF_BARS', '2010')
+    monkeypatch.setenv('FAKE_YF_DELAY', '0.2')
+
+    ctx = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=3, mp_context=ctx) as pool:
+        written = list(pool.map(_refresh_in_subprocess, [daily_store.root] * 3))
+
+    dates, values, indicators = daily_store.load('AAA', with_indicators=True)
+    assert sorted(written) == [0, 0, 10]
+    assert len(dates) == len(values) == len(indicators) == 2010
+    assert np.all(np.diff(dates) > 0)
+
+
+def test_readers_see_consistent_snapshots_during_refreshes(daily_store, monkeypatch):
+    monkeypatch.setenv('FAKE_YF_BARS', '1500')
+    daily_store.refresh('AAA', force=True)
+    errors = []
+    done = threading.Event()
+
+    def read():
+        while not done.is_set():
+            try:
+                frame = daily_store.features('AAA', period='max', refresh=False)
+                assert frame.index.is_monotonic_increasing
+                assert len(frame) >= 1500
+            except Exception as e:
+                errors.append(e)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for bars in range(1501, 1540):
+        monkeypatch.setenv('FAKE_YF_BARS', str(bars))
+        daily_store.refresh('AAA', force=True)
+    done.set()
+    for reader in readers:
+        reader.join()
+
+    assert errors == []
+    assert len(daily_store.load('AAA')[0]) == 1539
+
+
+class FakeDailyYahoo:
+    """Stand-in for the daily yfinance API: Ticker().history and batched download
+
+    Each ticker trades every business day of `days[ticker]` at a price fixed per date,
+    so re-downloaded overlap bars always match. Tickers in `broken` come back as an
+    all-NaN column group from download(), as yfinance does when one symbol fails.
+    """
+
+    def __init__(self, days):
+        self.days = days
+        self.broken = set()
+        self.calls = []
+
+    def _bars(self, ticker, start=None):
+        index = self.days[ticker]
+        if start is not None:
+            index = index[index >= pd.Timestamp(start)]
+        close = 100 + np.array([d.toordinal() % 1000 for d in index], dtype='float64') * (1 + len(ticker) % 3)
+        return pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close,
+                             'Volume': np.full(len(index), 1e6)}, index=index)
+
+    def Ticker(self, ticker):
+        fake = self
+
+        class Ticker:
+            def history(self, period=None, start=None, interval='1d'):
+                fake.calls.append(('history', ticker))
+                return fake._bars(ticker, start)
+
+        return Ticker()
+
+    def download(self, tickers, interval='1d', group_by='ticker', start=None, period=None, **kwargs):
+        self.calls.append(('download', tuple(tickers)))
+        frames = {}
+        for ticker in tickers:
+            bars = self._bars(ticker, start)
+            frames[ticker] = bars * np.nan if ticker in self.broken else bars
+        return pd.concat(frames, axis=1)
+
+
+@pytest.fixture
+def daily_yahoo(monkeypatch):
+    today = pd.Timestamp.now().normalize()
+    fake = FakeDailyYahoo({'AAA': pd.bdate_range(end=today - pd.offsets.BDay(5), periods=400),
+                           'BBB': pd.bdate_range(end=today - pd.offsets.BDay(5), periods=100)})
+    monkeypatch.setitem(sys.modules, 'yfinance', fake)
+    return fake
+
+
+def _extend(fake, ticker, bars):
+    index = fake.days[ticker]
+    fake.days[ticker] = index.append(pd.bdate_range(index[-1] + pd.offsets.BDay(), periods=bars))
+
+
+def test_refresh_many_batches_new_and_existing_tickers(tmp_path, daily_yahoo):
+    store = OHLCVStore(str(tmp_path))
+    store.refresh_many(['AAA', 'BBB'])
+
+    assert daily_yahoo.calls == [('download', ('AAA', 'BBB'))]
+    assert len(store.load('AAA')[0]) == 400
+    assert len(store.load('BBB')[0]) == 100
+
+    _extend(daily_yahoo, 'AAA', 3)
+    _extend(daily_yahoo, 'BBB', 3)
+    store.refresh_many(['AAA', 'BBB'], force=True)
+
+    assert daily_yahoo.calls[1:] == [('download', ('AAA', 'BBB'))]
+    assert len(store.load('AAA')[0]) == 403
+    assert len(store.load('BBB')[0]) == 103
+
+
+def test_refresh_many_falls_back_when_a_batch_slice_is_empty(tmp_path, daily_yahoo):
+    store = OHLCVStore(str(tmp_path))
+    store.refresh_many(['AAA', 'BBB'])
+    _extend(daily_yahoo, 'BBB', 2)
+    daily_yahoo.broken = {'BBB'}
+
+    store.refresh_many(['AAA', 'BBB'], force=True)
+
+    assert daily_yahoo.calls[-1] == ('history', 'BBB')
+    assert len(store.load('BBB')[0]) == 102
+    assert store._is_fresh('BBB')
+
+
+def test_failed_refresh_does_not_mark_the_ticker_fresh(tmp_path, daily_yahoo, monkeypatch):
+    store = OHLCVStore(str(tmp_path))
+    store.refresh_many(['AAA', 'BBB'])
+    meta = store._read_meta('BBB')
+    meta['last_checked'] = 0
+    store._write_meta('BBB', meta)
+    daily_yahoo.broken = {'BBB'}
+    monkeypatch.setattr(daily_yahoo, '_bars', lambda ticker, start=None: pd.DataFrame(columns=COLUMNS))
+
+    store.refresh_many(['BBB'])
+
+    assert not store._is_fresh('BBB')
+    assert len(store.load('BBB')[0]) == 100
+
+
+def test_compare_aligns_closes_on_shared_dates(tmp_path, daily_yahoo):
+    store = OHLCVStore(str(tmp_path))
+
+    rebased = store.compare(['aaa', 'BBB'], period='1y')
+
+    assert list(rebased.columns) == ['AAA', 'BBB']
+    assert list(rebased.index) == list(daily_yahoo.days['BBB'])
+    np.testing.assert_allclose(rebased.iloc[0], [100, 100])
+    raw = store.compare(['AAA', 'BBB'], period='1y', normalize=False)
+    expected = daily_yahoo._bars('AAA').loc[daily_yahoo.days['BBB'], 'Close']
+    np.testing.assert_allclose(raw['AAA'], expected)
+    np.testing.assert_allclose(rebased['AAA'], expected / expected.iloc[0] * 100)
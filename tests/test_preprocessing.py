@@ -0,0 +1,53 @@
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from utils.preprocessing import FrozenMinMaxScaler, legacy_scaler_path, load_scaler, scaler_available
+
+
+class FittedMinMaxScaler:
+    """Pickled in place of sklearn's MinMaxScaler, with the attributes a fitted one carries"""
+
+    def __init__(self, data):
+        self.data_min_ = data.min().to_numpy()
+        self.data_max_ = data.max().to_numpy()
+        self.feature_range = (0, 1)
+        self.feature_names_in_ = np.asarray(data.columns, dtype=object)
+
+
+def frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(rng.normal(100, 10, size=(50, 3)), columns=['Open', 'Close', 'Volume'])
+
+
+def test_legacy_pickle_is_converted_once(tmp_path):
+    data = frame()
+    path = str(tmp_path / 'AAPL_scaler.npz')
+    with open(legacy_scaler_path(path), 'wb') as f:
+        pickle.dump(FittedMinMaxScaler(data), f)
+    assert scaler_available(path) and not os.path.exists(path)
+
+    converted = load_scaler(path)
+
+    assert os.path.exists(path)
+    assert converted.feature_names == ['Open', 'Close', 'Volume']
+    np.testing.assert_allclose(converted.transform(data).min(axis=0), 0.0)
+    np.testing.assert_allclose(converted.transform(data).max(axis=0), 1.0)
+    # The .npz is read from now on and yields the same version the metadata records
+    os.remove(legacy_scaler_path(path))
+    reloaded = load_scaler(path)
+    assert reloaded.version == converted.version
+    np.testing.assert_array_equal(reloaded.transform(data), converted.transform(data))
+
+
+def test_version_tracks_the_scaling_parameters(tmp_path):
+    data = frame()
+    scaler = FrozenMinMaxScaler.fit(data)
+    path = str(tmp_path / 'scaler.npz')
+    scaler.save(path)
+
+    assert FrozenMinMaxScaler.load(path).version == scaler.version
+    assert FrozenMinMaxScaler.fit(data * 2).version != scaler.version
+    np.testing.assert_allclose(scaler.inverse_transform(scaler.transform(data)), data.to_numpy())
@@ -0,0 +1,29 @@
+import pytest
+
+from utils.sentiment import _TOKEN, score_texts
+
+
+@pytest.mark.parametrize('word, stem', [
+    ("didn't", 'did'), ("doesn't", 'does'), ("isn't", 'is'), ("wasn't", 'was'), ("won't", 'wo'), ("can't", 'ca'),
+])
+def test_contractions_split_off_negation(word, stem):
+    assert _TOKEN.findall(word) == [stem, "n't"]
+
+
+def test_contraction_negates_next_word():
+    negated, plain = score_texts(["Apple didn't miss estimates", "Apple missed estimates"])
+    assert plain < 0
+    assert negated > 0
+
+
+def test_curly_apostrophe_negates():
+    straight, curly = score_texts(["Shares didn't fall", "Shares didn’t fall"])
+    assert straight == curly > 0
+
+
+def test_possessives_stay_one_token():
+    assert _TOKEN.findall("apple's profit") == ["apple's", 'profit']
+
+
+def test_empty_texts_score_zero():
+    assert list(score_texts(['', None])) == [0.0, 0.0]
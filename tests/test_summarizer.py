@@ -0,0 +1,61 @@
+import pytest
+
+from fakes import FakeOpenAI
+from utils.summarizer import stream_summary, summarize
+from utils.summary_cache import SummaryCache
+
+ARTICLES = [
+    {'title': 'Apple beats estimates', 'description': 'Revenue rose 5% on iPhone sales.'},
+    {'title': 'Apple expands buyback', 'description': 'The board approved $110B in repurchases.'},
+]
+REPLY = '- Apple beat estimates\n- Buyback expanded\n\nGood for the stock.'
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SummaryCache(db_path=str(tmp_path / 'summaries.sqlite'))
+
+
+def test_stream_yields_chunks_in_order(cache):
+    client = FakeOpenAI(REPLY, chunk_size=5, delay=0.01, first_token_delay=0.05)
+    metrics = {}
+
+    chunks = list(stream_summary('AAPL', ARTICLES, client=client, cache=cache, metrics=metrics))
+
+    assert ''.join(chunks) == REPLY
+    assert chunks == [REPLY[i:i + 5] for i in range(0, len(REPLY), 5)]
+    assert metrics['chunks'] == len(chunks)
+    assert metrics['cached'] is False
+    assert 0.05 <= metrics['time_to_first_token'] <= metrics['total_latency']
+    assert client.calls[0]['stream'] is True
+
+
+def test_cache_hit_makes_no_second_call(cache):
+    client = FakeOpenAI(REPLY)
+    list(stream_summary('AAPL', ARTICLES, client=client, cache=cache))
+    metrics = {}
+
+    chunks = list(stream_summary('AAPL', ARTICLES, client=client, cache=cache, metrics=metrics))
+
+    assert chunks == [REPLY]
+    assert len(client.calls) == 1
+    assert metrics['cached'] is True
+    assert metrics['time_to_first_token'] <= metrics['total_latency']
+    # The non-streaming path shares the same cache entry
+    assert summarize('AAPL', ARTICLES, client=client, cache=cache) == (REPLY, True)
+    assert len(client.calls) == 1
+
+
+def test_changed_articles_miss_the_cache(cache):
+    client = FakeOpenAI(REPLY)
+    list(stream_summary('AAPL', ARTICLES, client=client, cache=cache))
+    list(stream_summary('AAPL', ARTICLES[:1], client=client, cache=cache))
+
+    assert len(client.calls) == 2
+
+
+def test_articles_without_text_are_not_sent(cache):
+    client = FakeOpenAI(REPLY)
+
+    assert list(stream_summary('AAPL', [{'title': '', 'description': ''}], client=client, cache=cache)) == []
+    assert client.calls == []
@@ -0,0 +1,57 @@
+import pytest
+
+from utils import summary_cache
+from utils.summary_cache import SummaryCache, summary_key
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(summary_cache.time, 'time', clock)
+    return clock
+
+
+def test_entries_expire_after_the_ttl(tmp_path, clock):
+    cache = SummaryCache(db_path=str(tmp_path / 'summaries.sqlite'), ttl=60)
+    cache.put('k', 'aapl', 'summary')
+
+    clock.now += 59
+    assert cache.get('k') == 'summary'
+    # Reads refresh recency, not age
+    clock.now += 2
+    assert cache.get('k') is None
+    clock.now -= 2
+    assert cache.get('k') is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = SummaryCache(db_path=str(tmp_path / 'summaries.sqlite'), max_entries=2)
+    cache.put('a', 'AAPL', 'A')
+    clock.now += 1
+    cache.put('b', 'MSFT', 'B')
+    clock.now += 1
+    assert cache.get('a') == 'A'
+    clock.now += 1
+
+    cache.put('c', 'TSLA', 'C')
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 'A'
+    assert cache.get('c') == 'C'
+
+
+def test_key_changes_with_the_articles_and_prompt():
+    articles = [{'title': 'Apple beats estimates', 'description': None}]
+    key = summary_key('aapl', articles, 1, 'gpt-3.5-turbo')
+
+    assert key == summary_key('AAPL', [{'title': 'Apple beats estimates'}], 1, 'gpt-3.5-turbo')
+    assert key != summary_key('AAPL', articles, 2, 'gpt-3.5-turbo')
+    assert key != summary_key('AAPL', [{'title': 'Apple misses estimates'}], 1, 'gpt-3.5-turbo')
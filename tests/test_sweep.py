@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+import pytest
+
+from utils.sweep import SEARCH_SPACE, grid_trials, random_trials
+from utils.training_jobs import write_job
+
+
+def test_random_trials_are_distinct_grid_points():
+    trials = random_trials(10, seed=0)
+
+    assert len({tuple(sorted(t.items())) for t in trials}) == 10
+    assert all(t in grid_trials() for t in trials)
+    assert trials == random_trials(10, seed=0)
+    assert len(random_trials(10_000)) == len(grid_trials()) == 4 * 3 * 3 * 3 * 2 * 2
+    assert set(trials[0]) == set(SEARCH_SPACE)
+
+
+def run_epochs(stopper, losses):
+    stopper.set_model(SimpleNamespace(stop_training=False))
+    for epoch, loss in enumerate(losses):
+        stopper.on_epoch_end(epoch, {'val_loss': loss})
+        if stopper.model.stop_training:
+            return epoch
+    return None
+
+
+@pytest.fixture
+def curve_dir(tmp_path):
+    # Finished peers with best val_loss after two epochs of 0.2, 0.3 and 0.4
+    for i, curve in enumerate([[0.5, 0.2, 0.1], [0.6, 0.3, 0.2], [0.7, 0.4, 0.3]]):
+        write_job(str(tmp_path), f'trial_{i:04d}', status='done', val_loss=curve)
+    # Unfinished trials are not compared against
+    write_job(str(tmp_path), 'trial_0003', status='running', val_loss=[0.01, 0.01])
+    return str(tmp_path)
+
+
+def test_median_stopping_stops_a_trial_behind_the_median(curve_dir):
+    pytest.importorskip('tensorflow')
+    from utils.sweep import _median_stopping
+
+    stopper = _median_stopping(curve_dir, 'trial_0009', grace_epochs=2, min_trials=3)
+
+    # The first epoch is in the grace period even though 0.9 trails every peer
+    assert run_epochs(stopper, [0.9, 0.35, 0.1]) == 1
+    assert stopper.stopped
+    assert stopper.curve == [0.9, 0.35]
+
+
+def test_median_stopping_keeps_a_trial_at_or_ahead_of_the_median(curve_dir):
+    pytest.importorskip('tensorflow')
+    from utils.sweep import _median_stopping
+
+    stopper = _median_stopping(curve_dir, 'trial_0009', grace_epochs=2, min_trials=3)
+    assert run_epochs(stopper, [0.9, 0.25, 0.2]) is None
+    assert not stopper.stopped
+
+    # Too few finished peers to judge
+    stopper = _median_stopping(curve_dir, 'trial_0010', grace_epochs=1, min_trials=4)
+    assert run_epochs(stopper, [0.9, 0.9, 0.9]) is None
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+tf = pytest.importorskip('tensorflow')
+
+from utils.model_registry import ModelRegistry  # noqa: E402
+from utils.preprocessing import FrozenMinMaxScaler  # noqa: E402
+from utils.tflite_model import (  # noqa: E402
+    TFLiteRunner, export_tflite, fresh_tflite_path, load_tflite_artifacts, parity_check,
+)
+
+LOOKBACK, FEATURES = 12, 9
+
+
+@pytest.fixture
+def saved_model(tmp_path):
+    """A small LSTM in the production layout (stacked LSTMs, Dense head), saved as .keras"""
+    tf.keras.utils.set_random_seed(0)
+    model = tf.keras.Sequential([
+        tf.keras.layers.Input(shape=(LOOKBACK, FEATURES)),
+        tf.keras.layers.LSTM(8, return_sequences=True),
+        tf.keras.layers.LSTM(8),
+        tf.keras.layers.Dense(4),
+        tf.keras.layers.Dense(1),
+    ])
+    model.compile(optimizer='adam', loss='mse')
+    path = str(tmp_path / 'TEST_lstm_model.keras')
+    model.save(path)
+    return path
+
+
+@pytest.fixture
+def windows():
+    return np.random.default_rng(0).random((16, LOOKBACK, FEATURES), dtype='float32')
+
+
+def test_export_matches_keras(saved_model, windows):
+    lite_path = export_tflite(saved_model)
+    max_diff, ok = parity_check(saved_model, lite_path, windows, atol=1e-4)
+    assert ok, max_diff
+
+
+@pytest.mark.parametrize('quantize, atol', [('float16', 1e-2), ('int8', 5e-2)])
+def test_quantized_export_stays_close(saved_model, windows, quantize, atol):
+    lite_path = export_tflite(saved_model, quantize=quantize, representative_windows=windows)
+    max_diff, ok = parity_check(saved_model, lite_path, windows, atol=atol)
+    assert ok, max_diff
+
+
+def test_runner_serves_through_registry(saved_model, windows, tmp_path):
+    lite_path = export_tflite(saved_model)
+    assert fresh_tflite_path(saved_model) == lite_path
+    scaler_path = str(tmp_path / 'TEST_scaler.npz')
+    FrozenMinMaxScaler(np.zeros(FEATURES), np.ones(FEATURES)).save(scaler_path)
+
+    loaded = ModelRegistry().get('TEST:tflite', lite_path, scaler_path, loader=load_tflite_artifacts)
+    assert isinstance(loaded.model, TFLiteRunner)
+    expected = tf.keras.models.load_model(saved_model)(windows[:1], training=False).numpy()
+    np.testing.assert_allclose(np.asarray(loaded.model(windows[:1], training=False)), expected, atol=1e-4)
+    assert loaded.model.predict(windows, verbose=0).shape == (len(windows), 1)
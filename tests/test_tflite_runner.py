@@ -0,0 +1,124 @@
+import os
+
+import numpy as np
+import pytest
+
+import utils.tflite_model as tflite_model
+from utils.lstm_predictor import StockLSTMPredictor
+from utils.model_registry import ModelRegistry
+from utils.preprocessing import FrozenMinMaxScaler
+
+
+class FakeInterpreter:
+    """Batch-of-one interpreter whose model returns the sum of the last timestep"""
+
+    def __init__(self, model_path, num_threads=1):
+        self.input = None
+
+    def allocate_tensors(self):
+        pass
+
+    def get_input_details(self):
+        return [{'index': 0, 'shape': np.array([1, 4, 3])}]
+
+    def get_output_details(self):
+        return [{'index': 1}]
+
+    def set_tensor(self, index, value):
+        assert value.shape == (1, 4, 3) and value.dtype == np.float32
+        self.input = value
+
+    def invoke(self):
+        pass
+
+    def get_tensor(self, index):
+        return self.input[:, -1].sum(axis=1, keepdims=True)
+
+
+def test_runner_stands_in_for_keras_model(tmp_path, monkeypatch):
+    monkeypatch.setattr(tflite_model, '_interpreter_class', lambda: FakeInterpreter)
+    lite_path = tmp_path / 'AAA_lstm_model.tflite'
+    lite_path.write_bytes(b'\0' * 128)
+    scaler_path = str(tmp_path / 'AAA_scaler.npz')
+    FrozenMinMaxScaler(np.zeros(3), np.ones(3)).save(scaler_path)
+
+    loaded = ModelRegistry().get('AAA:tflite', str(lite_path), scaler_path, loader=tflite_model.load_tflite_artifacts)
+    windows = np.arange(2 * 4 * 3, dtype='float64').reshape(2, 4, 3)
+
+    assert loaded.nbytes == 128
+    assert loaded.model.input_shape == (1, 4, 3)
+    np.testing.assert_allclose(loaded.model.predict(windows, verbose=0), [[30.0], [66.0]])
+    np.testing.assert_allclose(np.asarray(loaded.model(windows[:1], training=False)), [[30.0]])
+
+
+def test_fresh_tflite_path_ignores_stale_exports(tmp_path):
+    model_path = tmp_path / 'AAA_lstm_model.keras'
+    lite_path = tmp_path / 'AAA_lstm_model.tflite'
+    assert tflite_model.fresh_tflite_path(str(model_path)) is None
+
+    model_path.write_bytes(b'keras')
+    lite_path.write_bytes(b'lite')
+    os.utime(model_path, ns=(1, 2_000_000_000))
+    os.utime(lite_path, ns=(1, 1_000_000_000))
+    assert tflite_model.fresh_tflite_path(str(model_path)) is None
+
+    os.utime(lite_path, ns=(1, 3_000_000_000))
+    assert tflite_model.fresh_tflite_path(str(model_path)) == str(lite_path)
+
+
+def test_fresh_tflite_path_serves_the_newest_quantized_export(tmp_path):
+    model_path = tmp_path / 'AAA_lstm_model.keras'
+    model_path.write_bytes(b'keras')
+    os.utime(model_path, ns=(1, 1_000_000_000))
+    for name, mtime in (('AAA_lstm_model.tflite', 2), ('AAA_lstm_model_float16.tflite', 3),
+                        ('AAA_lstm_model_int8.tflite', 0)):
+        (tmp_path / name).write_bytes(b'lite')
+        os.utime(tmp_path / name, ns=(1, mtime * 1_000_000_000))
+
+    assert tflite_model.fresh_tflite_path(str(model_path)) == str(tmp_path / 'AAA_lstm_model_float16.tflite')
+
+
+@pytest.fixture
+def export_cli(tmp_path, monkeypatch):
+    """Run tflite_model.main with data, export and parity stubbed; returns (run, model_path)"""
+    model_path = tmp_path / 'AAA_lstm_model.keras'
+    model_path.write_bytes(b'keras')
+    os.utime(model_path, ns=(1, 1_000_000_000))
+    FrozenMinMaxScaler(np.zeros(3), np.ones(3)).save(str(tmp_path / 'AAA_scaler.npz'))
+
+    def fetch_data(self, period='10y'):
+        self.data = None
+
+    def prepare_data(self, test_size=0.2, fit_scaler=True):
+        self.X_train = self.X_test = np.zeros((4, 4, 3), dtype='float32')
+
+    def export(model_path, output_path=None, quantize=None, representative_windows=None):
+        with open(output_path, 'wb') as f:
+            f.write(b'lite')
+        return output_path
+
+    monkeypatch.setattr(StockLSTMPredictor, 'fetch_data', fetch_data)
+    monkeypatch.setattr(StockLSTMPredictor, 'prepare_data', prepare_data)
+    monkeypatch.setattr(tflite_model, 'export_tflite', export)
+
+    def run(max_diff, *args):
+        monkeypatch.setattr(tflite_model, 'parity_check', lambda *a, atol: (max_diff, max_diff <= atol))
+        tflite_model.main(['AAA', '--model-dir', str(tmp_path), *args])
+
+    return run, str(model_path)
+
+
+def test_export_is_installed_when_parity_passes(export_cli):
+    run, model_path = export_cli
+    run(1e-6, '--quantize', 'float16')
+
+    assert tflite_model.fresh_tflite_path(model_path) == tflite_model.tflite_path(model_path, 'float16')
+
+
+def test_failed_export_is_discarded(export_cli, tmp_path):
+    run, model_path = export_cli
+    with pytest.raises(SystemExit, match='AAA'):
+        run(1.0)
+
+    assert tflite_model.fresh_tflite_path(model_path) is None
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['AAA_lstm_model.keras', 'AAA_scaler.npz']
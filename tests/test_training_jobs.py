@@ -0,0 +1,103 @@
+import json
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.indicators import INDICATORS
+from utils.lstm_predictor import StockLSTMPredictor
+from utils.preprocessing import FrozenMinMaxScaler
+from utils.training_jobs import TrainingJobQueue, model_paths
+
+
+class RecordingExecutor:
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, fn, *args):
+        self.calls.append(args)
+        return Future()
+
+    def shutdown(self, wait=True):
+        pass
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = TrainingJobQueue(max_workers=1, model_dir=str(tmp_path), job_dir=str(tmp_path / 'jobs'))
+    queue._executor.shutdown()
+    queue._executor = RecordingExecutor()
+    return queue
+
+
+@pytest.mark.parametrize('mode, epochs', [('train', 50), ('fine_tune', 3)])
+def test_submit_defaults_epochs_by_mode(queue, mode, epochs):
+    state = queue.submit('AAPL', mode=mode)
+
+    assert state['epochs'] == epochs
+    assert queue._executor.calls[0][2] == epochs
+
+
+def test_submit_keeps_explicit_epochs(queue):
+    assert queue.submit('AAPL', epochs=7, mode='fine_tune')['epochs'] == 7
+
+
+def test_fine_tune_saves_the_model_before_moving_the_watermark(tmp_path, monkeypatch):
+    features = ['Open', 'High', 'Low', 'Close', 'Volume'] + INDICATORS
+    index = pd.bdate_range('2024-01-01', periods=300, name='Date')
+    data = pd.DataFrame(np.random.default_rng(0).uniform(1, 2, (300, len(features))), columns=features, index=index)
+    model_path, scaler_path, meta_path = model_paths('TEST', str(tmp_path))
+    with open(meta_path, 'w') as f:
+        json.dump({'data_watermark': index[-11].strftime('%Y-%m-%d')}, f)
+    events = []
+
+    def load_model_and_scaler(self, model_path, scaler_path):
+        self.scaler = FrozenMinMaxScaler.fit(data)
+        self.model = SimpleNamespace(
+            optimizer=SimpleNamespace(learning_rate=SimpleNamespace(assign=lambda lr: None)),
+            fit=lambda *args, **kwargs: events.append('fit'),
+        )
+
+    def fetch_data(self, period='10y'):
+        self.data = data
+        return data
+
+    def save_model_atomic(self, path):
+        with open(meta_path) as f:
+            events.append(('save', json.load(f)['data_watermark']))
+
+    monkeypatch.setattr(StockLSTMPredictor, 'load_model_and_scaler', load_model_and_scaler)
+    monkeypatch.setattr(StockLSTMPredictor, 'fetch_data', fetch_data)
+    monkeypatch.setattr(StockLSTMPredictor, 'save_model_atomic', save_model_atomic)
+    monkeypatch.setattr(StockLSTMPredictor, 'window_dataset', lambda self, start, stop, **kwargs: (start, stop))
+
+    predictor = StockLSTMPredictor(symbol='TEST', lookback_window=10)
+    assert predictor.fine_tune(model_path, scaler_path, meta_path) == 10
+
+    # The model was written while the metadata still pointed at the old watermark
+    assert events == ['fit', ('save', index[-11].strftime('%Y-%m-%d'))]
+    with open(meta_path) as f:
+        assert json.load(f)['data_watermark'] == index[-1].strftime('%Y-%m-%d')
+
+
+def test_horizons_train_as_separate_jobs(queue, tmp_path):
+    queue.submit('AAPL')
+    state = queue.submit('AAPL', horizon=5)
+
+    assert state['ticker'] == 'AAPL_h5'
+    assert state['horizon'] == 5
+    assert len(queue._executor.calls) == 2
+    assert queue._executor.calls[1][-1] == 5
+    assert queue.status('AAPL', horizon=5)['status'] == 'queued'
+    assert (tmp_path / 'jobs' / 'AAPL_h5.json').exists()
+
+    # A second request for the same horizon joins the queued job
+    queue.submit('AAPL', horizon=5)
+    assert len(queue._executor.calls) == 2
+
+
+def test_direct_models_get_their_own_files():
+    assert model_paths('AAPL', 'models', horizon=5)[0].endswith('AAPL_h5_lstm_model.keras')
+    assert model_paths('AAPL', 'models')[0].endswith('AAPL_lstm_model.keras')
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from utils.lstm_predictor import StockLSTMPredictor, horizon_targets
+from utils.windows import sliding_windows, window_dataset
+
+LOOKBACK = 5
+
+
+@pytest.fixture
+def series():
+    # Row i holds i in every column (scaled by the column number), so values name their row
+    return np.arange(40, dtype='float32')[:, None] * np.arange(1, 4, dtype='float32')
+
+
+def test_sliding_windows_are_consecutive_rows(series):
+    windows = sliding_windows(series, LOOKBACK)
+
+    assert windows.shape == (len(series) - LOOKBACK + 1, LOOKBACK, 3)
+    for i in (0, 7, len(windows) - 1):
+        np.testing.assert_array_equal(windows[i], series[i:i + LOOKBACK])
+    # Strided views, not copies
+    assert np.shares_memory(windows, series)
+
+
+def test_horizon_targets_follow_each_window(series):
+    close = series[:, 2]
+
+    np.testing.assert_array_equal(horizon_targets(close, LOOKBACK, 1), close[LOOKBACK:])
+    targets = horizon_targets(close, LOOKBACK, 3)
+    assert targets.shape == (len(close) - LOOKBACK - 2, 3)
+    np.testing.assert_array_equal(targets[0], close[LOOKBACK:LOOKBACK + 3])
+    np.testing.assert_array_equal(targets[-1], close[-3:])
+
+
+@pytest.mark.parametrize('horizon', [1, 3])
+def test_load_scaled_pairs_windows_with_next_closes(series, horizon):
+    predictor = StockLSTMPredictor(lookback_window=LOOKBACK, horizon=horizon)
+    features = np.repeat(series[:, :1], 9, axis=1)
+    predictor.load_scaled(features, test_size=0.25)
+
+    X = np.concatenate([predictor.X_train, predictor.X_test])
+    y = np.concatenate([predictor.y_train, predictor.y_test])
+    assert len(X) == len(y) == len(series) - LOOKBACK - horizon + 1
+    assert predictor.split_idx == len(predictor.X_train) == int(len(X) * 0.75)
+    # The target of window i is the close right after it (row i + lookback)
+    first_targets = y[:, 0] if horizon > 1 else y
+    np.testing.assert_array_equal(first_targets, X[:, -1, 3] + 1)
+
+
+def test_window_dataset_matches_the_strided_windows(series):
+    pytest.importorskip('tensorflow')
+    windows = sliding_windows(series, LOOKBACK)
+
+    batches = list(window_dataset(series, LOOKBACK, 10, 30, target_col=2, batch_size=8))
+    x = np.concatenate([b[0].numpy() for b in batches])
+    y = np.concatenate([b[1].numpy() for b in batches])
+
+    np.testing.assert_array_equal(x, windows[10:30])
+    np.testing.assert_array_equal(y, series[10 + LOOKBACK:30 + LOOKBACK, 2])
+    y3 = np.concatenate([b[1].numpy() for b in window_dataset(series, LOOKBACK, 0, 4, target_col=2, horizon=3)])
+    np.testing.assert_array_equal(y3, horizon_targets(series[:, 2], LOOKBACK, 3)[:4])
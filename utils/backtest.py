@@ -0,0 +1,157 @@
+"""Walk-forward backtest of next-day LSTM predictions.
+
+The out-of-sample tail is split into consecutive folds. Each fold retrains on every
+window before it (expanding window, scaler fitted on training rows only) and then
+predicts the whole fold in one batched call, so a day is only ever predicted by a
+model that never saw it.
+
+    python -m utils.backtest AAPL MSFT --test-days 504 --folds 4 -o backtest.csv
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.batch_predict import write_results
+from utils.cli import add_ticker_args, read_tickers
+from utils.lstm_predictor import StockLSTMPredictor
+from utils.ohlcv_store import get_store
+from utils.training_jobs import tf_process_pool
+
+RESULT_COLUMNS = ['ticker', 'fold', 'prev_close', 'actual', 'predicted', 'error', 'abs_error', 'direction_hit']
+
+
+def fold_bounds(n_samples, test_days=504, n_folds=4):
+    """(start, stop) sample indices of each fold, covering the last test_days samples"""
+    test_days = min(test_days, n_samples - 1)
+    edges = np.linspace(n_samples - test_days, n_samples, n_folds + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(edges[:-1], edges[1:]) if b > a]
+
+
+def _run_fold(ticker, data, lookback_window, fold, start, stop, epochs, batch_size):
+    """Worker entry point: train on samples [0, start) and predict samples [start, stop)
+
+    data is the parent's feature frame, so every fold of a ticker sees the same rows.
+    """
+    from utils.preprocessing import FrozenMinMaxScaler
+
+    predictor = StockLSTMPredictor(symbol=ticker, lookback_window=lookback_window)
+    predictor.data = data
+
+    # Fit scaling on the rows the training windows and targets cover, then reuse prepare_data
+    predictor.scaler = FrozenMinMaxScaler.fit(predictor.data.iloc[:start + lookback_window])
+    predictor.prepare_data(fit_scaler=False)
+    predictor.split_idx = start
+    predictor.build_model()
+    predictor.train_model(epochs=epochs, batch_size=batch_size)
+
+    # The whole fold is predicted in one pass
+    scaled = predictor.model.predict(predictor.window_dataset(start, stop, batch_size=1024), verbose=0)
+    predicted = predictor.inverse_close(scaled[:, 0])
+
+    closes = predictor.data['Close'].to_numpy()
+    targets = np.arange(start, stop) + lookback_window
+    frame = pd.DataFrame({
+        'ticker': ticker,
+        'fold': fold,
+        'prev_close': closes[targets - 1],
+        'actual': closes[targets],
+        'predicted': predicted,
+    }, index=predictor.data.index[targets])
+    frame.index.name = 'Date'
+    return frame
+
+
+def _score(frame):
+    frame['error'] = frame['predicted'] - frame['actual']
+    frame['abs_error'] = frame['error'].abs()
+    frame['direction_hit'] = (
+        np.sign(frame['predicted'] - frame['prev_close']) == np.sign(frame['actual'] - frame['prev_close'])
+    )
+    return frame[RESULT_COLUMNS]
+
+
+def walk_forward(tickers, lookback_window=90, test_days=504, n_folds=4, epochs=10, batch_size=32,
+                 max_workers=None, threads_per_worker=2):
+    """Backtest every ticker; one row per predicted day with error and direction columns
+
+    Folds of all tickers run in parallel on a process pool, with TensorFlow pinned to
+    threads_per_worker threads in each worker as in utils/sweep.py.
+    """
+    tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+    get_store().refresh_many(tickers)
+
+    tasks = []
+    for ticker in tickers:
+        # Fetched once here; workers re-fetching a relative period could see a shifted window
+        data = StockLSTMPredictor(symbol=ticker, lookback_window=lookback_window).fetch_data(period='10y')
+        n_samples = len(data) - lookback_window
+        if n_samples < 2 * max(n_folds, 1):
+            print(f'Skipping {ticker}: not enough history for a walk-forward backtest')
+            continue
+        for fold, (start, stop) in enumerate(fold_bounds(n_samples, test_days, n_folds)):
+            tasks.append((ticker, data, lookback_window, fold, start, stop, epochs, batch_size))
+
+    if max_workers is None:
+        max_workers = max(1, (os.cpu_count() or 1) // threads_per_worker)
+    frames = []
+    with tf_process_pool(max_workers, threads_per_worker) as pool:
+        futures = [pool.submit(_run_fold, *task) for task in tasks]
+        for task, future in zip(tasks, futures):
+            try:
+                frames.append(future.result())
+            except Exception as e:
+                print(f'Fold {task[3]} of {task[0]} failed: {e}')
+
+    if not frames:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    return _score(pd.concat(frames).sort_index(kind='stable'))
+
+
+def rolling_metrics(results, window=21):
+    """Rolling MAE and directional accuracy per ticker, indexed by date"""
+    by_ticker = results.groupby('ticker')
+    return pd.concat({
+        'mae': by_ticker['abs_error'].rolling(window, min_periods=1).mean(),
+        'directional_accuracy': by_ticker['direction_hit'].rolling(window, min_periods=1).mean(),
+    }, axis=1)
+
+
+def summarize(results):
+    """One row per ticker: sample count, MAE, RMSE, MAPE and directional accuracy"""
+    by_ticker = results.groupby('ticker')
+    return pd.DataFrame({
+        'days': by_ticker.size(),
+        'mae': by_ticker['abs_error'].mean(),
+        'rmse': np.sqrt(by_ticker['error'].apply(lambda e: np.mean(e ** 2))),
+        'mape': (results['abs_error'] / results['actual']).groupby(results['ticker']).mean() * 100,
+        'directional_accuracy': by_ticker['direction_hit'].mean(),
+    })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Walk-forward backtest of next-day predictions.')
+    add_ticker_args(parser)
+    parser.add_argument('-o', '--output', default='backtest.csv', help='output file (.csv, .json or .parquet)')
+    parser.add_argument('--lookback', type=int, default=90)
+    parser.add_argument('--test-days', type=int, default=504, help='predicted days per ticker')
+    parser.add_argument('--folds', type=int, default=4, help='retrains per ticker')
+    parser.add_argument('--epochs', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=None, help='parallel folds (default: CPUs / threads)')
+    parser.add_argument('--threads', type=int, default=2, help='TensorFlow intra-op threads per worker')
+    args = parser.parse_args(argv)
+
+    tickers = read_tickers(args, parser)
+
+    results = walk_forward(tickers, lookback_window=args.lookback, test_days=args.test_days,
+                           n_folds=args.folds, epochs=args.epochs, max_workers=args.workers,
+                           threads_per_worker=args.threads)
+    write_results(results.reset_index(), args.output)
+    if not results.empty:
+        print(summarize(results).to_string(float_format='{:.4f}'.format))
+    print(f'Wrote {len(results)} rows to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+"""Next-day predictions for a whole watchlist.
+
+    python -m utils.batch_predict AAPL MSFT NVDA -o predictions.csv
+    python -m utils.batch_predict --watchlist watchlist.txt -o predictions.json
+    python -m utils.batch_predict --global AAPL MSFT NVDA
+"""
+import argparse
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from utils.cli import add_ticker_args, read_tickers
+from utils.global_model import attach_global_model, global_model_available
+from utils.lstm_predictor import StockLSTMPredictor
+from utils.model_registry import get_registry
+from utils.preprocessing import scaler_available
+from utils.tflite_model import fresh_tflite_path, load_tflite_artifacts
+from utils.training_jobs import MODEL_DIR, model_paths
+
+
+def load_predictor(ticker, lookback_window, model_dir, registry, use_global=False):
+    """Fetch data and attach the resident model; returns (predictor, status)"""
+    model_path, scaler_path, _ = model_paths(ticker, model_dir)
+    if use_global:
+        if not global_model_available(model_dir):
+            return None, 'no_model'
+    elif not (os.path.exists(model_path) and scaler_available(scaler_path)):
+        return None, 'no_model'
+    predictor = StockLSTMPredictor(symbol=ticker, lookback_window=lookback_window)
+    df = predictor.fetch_data(period='10y')
+    if df.shape[0] < lookback_window:
+        return None, 'insufficient_data'
+    if use_global:
+        return attach_global_model(predictor, model_dir, registry), 'ok'
+    lite_path = fresh_tflite_path(model_path)
+    if lite_path is not None:
+        loaded = registry.get(f'{ticker}:tflite', lite_path, scaler_path, loader=load_tflite_artifacts)
+    else:
+        loaded = registry.get(ticker, model_path, scaler_path)
+    predictor.model, predictor.scaler = loaded.model, loaded.scaler
+    return predictor, 'ok'
+
+
+def group_by_model(predictors):
+    """Tickers keyed by the identity of the model object serving them"""
+    groups = {}
+    for ticker, predictor in predictors.items():
+        groups.setdefault(id(predictor.model), []).append(ticker)
+    return list(groups.values())
+
+
+def stacked_inputs(predictors, group, windows):
+    """Model input for one model's stacked windows, adding ticker ids for the global model"""
+    if predictors[group[0]].ticker_id is None:
+        return windows
+    return [windows, np.array([[predictors[t].ticker_id] for t in group], dtype='int32')]
+
+
+def _predict_groups(predictors, rows):
+    """Stacked forward pass per model; each group's predictors are dropped once predicted"""
+    # Tickers served by the same model have their last windows stacked into one forward pass
+    for group in group_by_model(predictors):
+        model = predictors[group[0]].model
+        windows = stacked_inputs(predictors, group, np.stack([predictors[t].last_window() for t in group]))
+        try:
+            scaled = model.predict(windows, verbose=0) if len(group) > 1 else np.asarray(model(windows, training=False))
+        except Exception as e:
+            for ticker in group:
+                rows[ticker].update(status='error', error=str(e))
+                del predictors[ticker]
+            continue
+        for ticker, pred in zip(group, scaled[:, 0]):
+            predictor = predictors.pop(ticker)
+            last_close = float(predictor.data['Close'].iloc[-1])
+            predicted = float(predictor.inverse_close([pred])[0])
+            rows[ticker].update(
+                last_date=predictor.data.index[-1].strftime('%Y-%m-%d'),
+                last_close=last_close,
+                predicted_close=predicted,
+                change_pct=(predicted / last_close - 1) * 100,
+            )
+
+
+def load_concurrently(load, tickers, max_workers=16, window=None):
+    """Yield (ticker, result, error) for load(ticker) as the calls finish
+
+    Data refreshes are network-bound, so loads run on a thread pool. With window set,
+    at most that many loads are in flight besides the result the caller is using, which
+    bounds how many loaded models and frames are alive when each result is used right away.
+    """
+    tickers = iter(tickers)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = {}
+
+        def top_up():
+            while window is None or len(pending) < window:
+                ticker = next(tickers, None)
+                if ticker is None:
+                    return
+                pending[pool.submit(load, ticker)] = ticker
+
+        top_up()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                ticker = pending.pop(future)
+                try:
+                    result, error = future.result(), None
+                except Exception as e:
+                    result, error = None, str(e)
+                yield ticker, result, error
+            # Drop this side's references before loading more
+            done = future = result = None
+            top_up()
+
+
+def predict_watchlist(tickers, lookback_window=90, model_dir=MODEL_DIR, max_workers=16, registry=None,
+                      use_global=False, chunk_size=None):
+    """Predict the next close for every ticker with a saved model; one row per ticker
+
+    Each per-ticker model is used as soon as its data is in and then released, with at
+    most chunk_size (default: the registry's max_models) loaded at once, so models evicted
+    from the registry are not kept alive by this call. use_global=True serves every ticker
+    from the shared global model instead, in one stacked forward pass.
+    """
+    registry = registry or get_registry()
+    tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+    rows = {t: {'ticker': t, 'status': None, 'error': None} for t in tickers}
+    window = None if use_global else max(1, chunk_size or registry.max_models)
+
+    def load(ticker):
+        return load_predictor(ticker, lookback_window, model_dir, registry, use_global)
+
+    predictors = {}
+    for ticker, result, error in load_concurrently(load, tickers, max_workers, window):
+        predictor, status = result or (None, 'error')
+        rows[ticker].update(status=status, error=error)
+        if predictor is None:
+            continue
+        predictors[ticker] = predictor
+        if not use_global:
+            _predict_groups(predictors, rows)
+    _predict_groups(predictors, rows)
+
+    columns = ['ticker', 'last_date', 'last_close', 'predicted_close', 'change_pct', 'status', 'error']
+    return pd.DataFrame(list(rows.values()), columns=columns)
+
+
+def write_results(results, output_path):
+    """Write results as CSV, JSON or Parquet depending on the file extension"""
+    ext = os.path.splitext(output_path)[1].lower()
+    if ext == '.json':
+        results.to_json(output_path, orient='records', indent=2)
+    elif ext == '.parquet':
+        results.to_parquet(output_path, index=False)
+    else:
+        results.to_csv(output_path, index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Batch next-day close predictions for a watchlist.')
+    add_ticker_args(parser)
+    parser.add_argument('-o', '--output', default='predictions.csv', help='output file (.csv, .json or .parquet)')
+    parser.add_argument('--lookback', type=int, default=90)
+    parser.add_argument('--model-dir', default=MODEL_DIR)
+    parser.add_argument('--workers', type=int, default=16, help='concurrent data downloads')
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help='per-ticker models held in memory at once (default: model registry size)')
+    parser.add_argument('--global', dest='use_global', action='store_true',
+                        help='serve every ticker from the shared global model')
+    args = parser.parse_args(argv)
+
+    tickers = read_tickers(args, parser)
+
+    results = predict_watchlist(tickers, lookback_window=args.lookback, model_dir=args.model_dir,
+                                max_workers=args.workers, use_global=args.use_global, chunk_size=args.chunk_size)
+    write_results(results, args.output)
+    ok = int((results['status'] == 'ok').sum())
+    print(f'Wrote {len(results)} rows ({ok} predicted) to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
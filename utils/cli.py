@@ -0,0 +1,19 @@
+"""Shared command-line helpers for the batch tools in utils/."""
+
+
+def add_ticker_args(parser):
+    """Positional tickers plus a --watchlist file, read back with read_tickers"""
+    parser.add_argument('tickers', nargs='*', help='ticker symbols, e.g. AAPL MSFT')
+    parser.add_argument('--watchlist', help="file with one ticker per line ('#' starts a comment)")
+
+
+def read_tickers(args, parser):
+    """Upper-cased, de-duplicated tickers from the command line and the watchlist file"""
+    tickers = list(args.tickers)
+    if args.watchlist:
+        with open(args.watchlist) as f:
+            tickers += [line.split('#')[0] for line in f]
+    tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+    if not tickers:
+        parser.error('no tickers given')
+    return tickers
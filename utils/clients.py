@@ -0,0 +1,27 @@
+import os
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+# Load .env if running locally
+load_dotenv()
+
+
+@lru_cache(maxsize=None)
+def get_openai_client():
+    """Shared OpenAI client, constructed on first use"""
+    from openai import OpenAI
+
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+
+@lru_cache(maxsize=None)
+def get_fundamental_data():
+    """Shared Alpha Vantage FundamentalData client, constructed on first use"""
+    from alpha_vantage.fundamentaldata import FundamentalData
+
+    return FundamentalData(key=os.getenv("ALPHA_VANTAGE_API_KEY"), output_format='json')
+
+
+def news_api_key():
+    return os.getenv("NEWS_API_KEY")
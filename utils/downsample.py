@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+# Roughly the plot width in pixels; more points than this cannot be told apart
+DEFAULT_POINT_BUDGET = 800
+
+# Long daily histories keep their shape best with LTTB; dense intraday series are
+# dominated by spikes, which min/max bucketing preserves exactly
+TIMEFRAME_METHODS = {
+    '1y': 'lttb', '2y': 'lttb', '5y': 'lttb', '10y': 'lttb',
+    '1m': 'minmax', '5m': 'minmax', '15m': 'minmax', '30m': 'minmax', '1h': 'minmax',
+}
+
+
+def lttb_indices(y, n_out, x=None):
+    """Indices chosen by Largest-Triangle-Three-Buckets, always keeping the first and last point"""
+    y = np.asarray(y, dtype='float64')
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype='float64') if x is None else np.asarray(x, dtype='float64')
+
+    # Bucket boundaries over the interior points; bucket i spans edges[i]:edges[i + 1]
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(edges).astype('float64')
+    # Third vertex for bucket i: the mean of bucket i + 1 (the last point for the final bucket)
+    avg_x = np.append(np.add.reduceat(x[:n - 1], edges[:-1]) / counts, x[-1])[1:]
+    avg_y = np.append(np.add.reduceat(y[:n - 1], edges[:-1]) / counts, y[-1])[1:]
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        bx, by = x[start:stop], y[start:stop]
+        area = np.abs((x[prev] - avg_x[i]) * (by - y[prev]) - (x[prev] - bx) * (avg_y[i] - y[prev]))
+        prev = start + int(area.argmax())
+        selected[i + 1] = prev
+    return selected
+
+
+def minmax_indices(y, n_out):
+    """Indices of the minimum and maximum of each of n_out // 2 equal buckets, in order"""
+    y = np.asarray(y, dtype='float64')
+    n = len(y)
+    buckets = n_out // 2
+    if n_out >= n or buckets < 1:
+        return np.arange(n)
+    size = -(-n // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(buckets, size)
+    valid = ~np.all(np.isnan(padded), axis=1)
+    offsets = np.arange(buckets)[valid] * size
+    filled_min = np.where(np.isnan(padded[valid]), np.inf, padded[valid])
+    filled_max = np.where(np.isnan(padded[valid]), -np.inf, padded[valid])
+    lows = offsets + filled_min.argmin(axis=1)
+    highs = offsets + filled_max.argmax(axis=1)
+    return np.unique(np.concatenate([[0, n - 1], lows, highs]))
+
+
+def downsample(series, n_out=DEFAULT_POINT_BUDGET, method='lttb'):
+    """Subset of a Series (or each column of a DataFrame) that preserves its visual peaks and troughs"""
+    if len(series) <= n_out or method is None:
+        return series
+    if isinstance(series, pd.DataFrame):
+        # Keep every point any column needs, so each line retains its own extremes
+        per_column = max(3, n_out // max(1, series.shape[1]))
+        indices = np.unique(np.concatenate([
+            _indices(series[column].to_numpy(), per_column, method) for column in series.columns
+        ]))
+        return series.iloc[indices]
+    return series.iloc[_indices(series.to_numpy(), n_out, method)]
+
+
+def _indices(values, n_out, method):
+    if method == 'minmax':
+        return minmax_indices(values, n_out)
+    return lttb_indices(values, n_out)
+
+
+def downsample_for_timeframe(series, timeframe, n_out=DEFAULT_POINT_BUDGET):
+    """downsample() with the method picked for the chart timeframe"""
+    return downsample(series, n_out=n_out, method=TIMEFRAME_METHODS.get(timeframe, 'lttb'))
@@ -0,0 +1,176 @@
+"""Multi-day close forecasts (1-30 trading days) for one ticker or a watchlist.
+
+Two modes:
+- direct: a model trained with StockLSTMPredictor(horizon=H) emits all H closes in one pass;
+  train one with `python -m utils.training_jobs AAPL --horizon 5`
+- rollout: the next-day model is fed its own predictions; the rolling indicators
+  are advanced with IndicatorEngine instead of recomputing the frame
+
+Rollouts of every ticker that shares a model advance together, one predict call per step.
+
+    python -m utils.forecast AAPL MSFT --horizon 5
+    python -m utils.forecast AAPL --horizon 30 --method direct
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.batch_predict import group_by_model, load_concurrently, load_predictor, stacked_inputs, write_results
+from utils.cli import add_ticker_args, read_tickers
+from utils.indicators import INDICATORS, SHORT_WINDOW, IndicatorEngine
+from utils.lstm_predictor import StockLSTMPredictor
+from utils.model_registry import get_registry
+from utils.preprocessing import scaler_available
+from utils.training_jobs import MODEL_DIR, model_paths
+
+MAX_HORIZON = 30
+FORECAST_COLUMNS = ['ticker', 'method', 'step', 'date', 'predicted_close', 'status', 'error']
+
+
+def _predict(model, inputs, n):
+    # model.predict's batching machinery is overkill for a single window
+    return model.predict(inputs, verbose=0) if n > 1 else np.asarray(model(inputs, training=False))
+
+
+def rollout(predictors, horizon):
+    """Autoregressive forecasts for fetched predictors with next-day models; {ticker: closes}
+
+    Each step appends the predicted close as a bar with Open = High = Low = Close and
+    the recent average volume, so the window keeps the training feature layout.
+    """
+    forecasts = {}
+    for group in group_by_model(predictors):
+        model = predictors[group[0]].model
+        windows = np.stack([predictors[t].last_window() for t in group])
+        engines = [IndicatorEngine.seed(predictors[t].data['Close'].to_numpy()) for t in group]
+        volumes = [predictors[t].data['Volume'].iloc[-SHORT_WINDOW:].mean() for t in group]
+        closes = np.empty((len(group), horizon))
+
+        for step in range(horizon):
+            scaled = _predict(model, stacked_inputs(predictors, group, windows), len(group))[:, 0]
+            rows = []
+            for i, ticker in enumerate(group):
+                predictor = predictors[ticker]
+                close = predictor.inverse_close(scaled[i:i + 1])[0]
+                closes[i, step] = close
+                bar = {'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': volumes[i]}
+                bar.update(zip(INDICATORS, engines[i].update(close)))
+                raw = np.array([[bar[c] for c in predictor.data.columns]])
+                rows.append(predictor.scaler.transform(raw)[0])
+            windows = np.concatenate([windows[:, 1:], np.asarray(rows, dtype='float32')[:, np.newaxis]], axis=1)
+
+        forecasts.update(zip(group, closes))
+    return forecasts
+
+
+def direct(predictors, horizon):
+    """Forecasts from multi-output models, one predict call per model; {ticker: closes}"""
+    forecasts = {}
+    for group in group_by_model(predictors):
+        model = predictors[group[0]].model
+        windows = np.stack([predictors[t].last_window() for t in group])
+        scaled = _predict(model, stacked_inputs(predictors, group, windows), len(group))
+        for ticker, row in zip(group, scaled):
+            forecasts[ticker] = predictors[ticker].inverse_close(row[:horizon])
+    return forecasts
+
+
+def load_direct_predictor(ticker, horizon, lookback_window=90, model_dir=MODEL_DIR, registry=None):
+    """Fetch data and attach a saved horizon-step model; returns (predictor, status)"""
+    model_path, scaler_path, _ = model_paths(ticker, model_dir, horizon=horizon)
+    if not (os.path.exists(model_path) and scaler_available(scaler_path)):
+        return None, 'no_model'
+    predictor = StockLSTMPredictor(symbol=ticker, lookback_window=lookback_window, horizon=horizon)
+    if predictor.fetch_data(period='10y').shape[0] < lookback_window:
+        return None, 'insufficient_data'
+    loaded = (registry or get_registry()).get(f'{ticker}_h{horizon}', model_path, scaler_path)
+    predictor.model, predictor.scaler = loaded.model, loaded.scaler
+    return predictor, 'ok'
+
+
+def _forecast_rows(run, mode, predictors, horizon):
+    try:
+        forecasts = run(predictors, horizon)
+    except Exception as e:
+        return {t: [{'ticker': t, 'method': mode, 'status': 'error', 'error': str(e)}] for t in predictors}
+    rows = {}
+    for ticker, closes in forecasts.items():
+        # Business days approximate the trading calendar; exchange holidays are not skipped
+        dates = pd.bdate_range(predictors[ticker].data.index[-1] + pd.offsets.BDay(), periods=horizon)
+        rows[ticker] = [
+            {'ticker': ticker, 'method': mode, 'step': step + 1, 'date': date.strftime('%Y-%m-%d'),
+             'predicted_close': float(close), 'status': 'ok', 'error': None}
+            for step, (date, close) in enumerate(zip(dates, closes))
+        ]
+    return rows
+
+
+def forecast_watchlist(tickers, horizon=5, method='auto', lookback_window=90, model_dir=MODEL_DIR,
+                       max_workers=16, registry=None, use_global=False, chunk_size=None):
+    """Forecast the next horizon closes for every ticker; one row per ticker and step
+
+    method='auto' uses a direct horizon-step model where one is saved and rolls out
+    the next-day model otherwise. As in predict_watchlist, per-ticker models are used
+    as soon as they load, at most chunk_size at a time, while use_global=True rolls
+    every ticker out together on the shared model.
+    """
+    if not 1 <= horizon <= MAX_HORIZON:
+        raise ValueError(f'horizon must be between 1 and {MAX_HORIZON}')
+    registry = registry or get_registry()
+    tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+    window = None if use_global else max(1, chunk_size or registry.max_models)
+    runs = {'direct': direct, 'rollout': rollout}
+
+    def load(ticker):
+        if method in ('auto', 'direct') and not use_global:
+            predictor, status = load_direct_predictor(ticker, horizon, lookback_window, model_dir, registry)
+            if predictor is not None or method == 'direct':
+                return predictor, status, 'direct'
+        predictor, status = load_predictor(ticker, lookback_window, model_dir, registry, use_global)
+        return predictor, status, 'rollout'
+
+    rows = {}
+    shared = {}
+    for ticker, result, error in load_concurrently(load, tickers, max_workers, window):
+        predictor, status, mode = result or (None, 'error', None)
+        if predictor is None:
+            rows[ticker] = [{'ticker': ticker, 'method': mode, 'status': status, 'error': error}]
+        elif use_global:
+            shared[ticker] = predictor
+        else:
+            rows.update(_forecast_rows(runs[mode], mode, {ticker: predictor}, horizon))
+    if shared:
+        rows.update(_forecast_rows(rollout, 'rollout', shared, horizon))
+
+    return pd.DataFrame([row for t in tickers for row in rows.get(t, [])], columns=FORECAST_COLUMNS)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Multi-day close forecasts for a watchlist.')
+    add_ticker_args(parser)
+    parser.add_argument('--horizon', type=int, default=5, help=f'trading days ahead (1-{MAX_HORIZON})')
+    parser.add_argument('--method', choices=['auto', 'direct', 'rollout'], default='auto')
+    parser.add_argument('-o', '--output', default='forecast.csv', help='output file (.csv, .json or .parquet)')
+    parser.add_argument('--lookback', type=int, default=90)
+    parser.add_argument('--model-dir', default=MODEL_DIR)
+    parser.add_argument('--workers', type=int, default=16, help='concurrent data downloads')
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help='per-ticker models held in memory at once (default: model registry size)')
+    parser.add_argument('--global', dest='use_global', action='store_true',
+                        help='roll out the shared global model for every ticker')
+    args = parser.parse_args(argv)
+
+    tickers = read_tickers(args, parser)
+
+    results = forecast_watchlist(tickers, horizon=args.horizon, method=args.method, lookback_window=args.lookback,
+                                 model_dir=args.model_dir, max_workers=args.workers, use_global=args.use_global,
+                                 chunk_size=args.chunk_size)
+    write_results(results, args.output)
+    ok = results.loc[results['status'] == 'ok', 'ticker'].nunique()
+    print(f'Wrote {len(results)} rows ({ok} tickers forecast) to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.clients import get_fundamental_data
+from utils.rate_limit import RateLimited, TokenBucket
+
+DEFAULT_DB = os.path.join('data', 'fundamentals.sqlite')
+ALPHA_VANTAGE_URL = 'https://www.alphavantage.co/query'
+
+DAY = 24 * 60 * 60
+# Descriptive fields almost never change; price-derived ratios move daily;
+# everything else comes from quarterly filings
+FIELD_TTLS = {
+    'Name': 30 * DAY, 'Sector': 30 * DAY, 'Industry': 30 * DAY, 'Currency': 30 * DAY,
+    'Exchange': 30 * DAY, 'Country': 30 * DAY, 'Description': 30 * DAY, 'Address': 30 * DAY,
+    'MarketCapitalization': DAY, 'PERatio': DAY, 'PEGRatio': DAY, 'PriceToBookRatio': DAY,
+    'DividendYield': DAY, 'Beta': DAY, 'TrailingPE': DAY, 'ForwardPE': DAY,
+    '52WeekHigh': DAY, '52WeekLow': DAY, '50DayMovingAverage': DAY, '200DayMovingAverage': DAY,
+}
+DEFAULT_TTL = 7 * DAY
+# Row recording that Alpha Vantage had no overview for a symbol (unknown or typo'd);
+# it answers with {} for a day so bad tickers do not spend the request budget on every rerun
+NO_DATA_FIELD = '__no_data__'
+FIELD_TTLS[NO_DATA_FIELD] = DAY
+
+# Overview field -> screener column, with the dtype used in the columnar table
+SCREENER_FIELDS = {
+    'PERatio': ('PE', 'float32'),
+    'EPS': ('EPS', 'float32'),
+    'MarketCapitalization': ('Market Cap', 'float64'),
+    'ReturnOnEquityTTM': ('ROE', 'float32'),
+    'Beta': ('Beta', 'float32'),
+}
+
+# Alpha Vantage free tier: 5 requests per minute
+ALPHA_VANTAGE_LIMITER = TokenBucket(rate=5 / 60, capacity=5)
+
+
+def _fetch_overview(ticker):
+    data, _ = get_fundamental_data().get_company_overview(ticker)
+    return data
+
+
+def http_overview_fetcher(base_url=ALPHA_VANTAGE_URL, api_key=None, timeout=10):
+    """OVERVIEW fetch over plain HTTP, for pointing an OverviewCache at another server (e.g. a local stub)"""
+    import requests
+
+    session = requests.Session()
+
+    def fetch(ticker):
+        response = session.get(base_url, timeout=timeout, params={
+            'function': 'OVERVIEW', 'symbol': ticker,
+            'apikey': api_key or os.getenv('ALPHA_VANTAGE_API_KEY'),
+        })
+        response.raise_for_status()
+        data = response.json()
+        # Errors and quota notices come back as 200s with a single message field
+        for key in ('Error Message', 'Note', 'Information'):
+            if key in data:
+                raise ValueError(data[key])
+        return data
+
+    return fetch
+
+
+class OverviewCache:
+    """SQLite-backed company overview cache with per-field TTL and stale-while-revalidate
+
+    Fresh entries are served from disk. Stale entries are served immediately while one
+    background refresh runs. Concurrent misses for the same ticker share a single
+    Alpha Vantage call, and every call goes through the rate limiter. Symbols with no
+    overview are remembered as such for a day.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB, fetch=_fetch_overview, limiter=ALPHA_VANTAGE_LIMITER,
+                 wait_timeout=30):
+        self.db_path = db_path
+        self.fetch = fetch
+        self.limiter = limiter
+        self.wait_timeout = wait_timeout
+        self._inflight = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS overview ('
+                ' ticker TEXT NOT NULL, field TEXT NOT NULL, value TEXT,'
+                ' fetched_at REAL NOT NULL, PRIMARY KEY (ticker, field))'
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def _read(self, ticker):
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT field, value, fetched_at FROM overview WHERE ticker = ?', (ticker,)
+            ).fetchall()
+        return {field: (value, fetched_at) for field, value, fetched_at in rows}
+
+    def _write(self, ticker, data):
+        now = time.time()
+        with self._connect() as conn:
+            if not data:
+                conn.execute('DELETE FROM overview WHERE ticker = ?', (ticker,))
+                data = {NO_DATA_FIELD: None}
+            else:
+                conn.execute('DELETE FROM overview WHERE ticker = ? AND field = ?', (ticker, NO_DATA_FIELD))
+            conn.executemany(
+                'INSERT OR REPLACE INTO overview (ticker, field, value, fetched_at) VALUES (?, ?, ?, ?)',
+                [(ticker, field, None if value is None else str(value), now) for field, value in data.items()],
+            )
+
+    @staticmethod
+    def _is_stale(field, fetched_at, now):
+        return now - fetched_at > FIELD_TTLS.get(field, DEFAULT_TTL)
+
+    def _fetch_coalesced(self, ticker, block=True):
+        """Fetch and store a ticker's overview; concurrent callers share one request"""
+        with self._lock:
+            future = self._inflight.get(ticker)
+            leader = future is None
+            if leader:
+                future = self._inflight[ticker] = Future()
+        if not leader:
+            return future.result() if block else future
+
+        try:
+            if block:
+                self.limiter.acquire(timeout=self.wait_timeout)
+            elif not self.limiter.try_acquire():
+                raise RateLimited('background refresh skipped: no request budget')
+            data = self.fetch(ticker)
+            self._write(ticker, data)
+            future.set_result(data)
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._inflight.pop(ticker, None)
+        return future.result() if block else future
+
+    def _revalidate(self, ticker):
+        def run():
+            try:
+                self._fetch_coalesced(ticker, block=False).result()
+            except Exception as e:
+                print(f"Background refresh of {ticker} overview failed: {e}")
+
+        threading.Thread(target=run, name=f'overview-refresh-{ticker}', daemon=True).start()
+
+    def get(self, ticker):
+        """Company overview dict for a ticker (field values as returned by Alpha Vantage)"""
+        ticker = ticker.upper()
+        cached = self._read(ticker)
+        now = time.time()
+        if NO_DATA_FIELD in cached and self._is_stale(NO_DATA_FIELD, cached[NO_DATA_FIELD][1], now):
+            cached = {}
+        if not cached:
+            return self._fetch_coalesced(ticker) or {}
+
+        if any(self._is_stale(field, fetched_at, now) for field, (_, fetched_at) in cached.items()):
+            self._revalidate(ticker)
+        return {field: value for field, (value, _) in cached.items() if field != NO_DATA_FIELD}
+
+
+def load_fundamentals(tickers, max_workers=4, cache=None):
+    """Screener table (PE, EPS, market cap, ROE, beta) for many tickers
+
+    Fetches fan out over a bounded thread pool; the cache's rate limiter and request
+    coalescing still apply, so cached tickers return immediately and the rest are
+    paced to the API budget. Values are parsed into numeric columns once, so the
+    table can be sorted and filtered without re-fetching.
+    """
+    cache = cache or get_overview_cache()
+    tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+
+    def load(ticker):
+        try:
+            data = cache.get(ticker)
+        except Exception as e:
+            return {}, str(e)
+        # Unknown symbols come back as an empty overview rather than an error
+        return data, None if data else 'no data returned'
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(load, tickers))
+
+    table = pd.DataFrame({
+        'Ticker': tickers,
+        'Company': [data.get('Name') for data, _ in results],
+        'Sector': pd.Categorical([data.get('Sector') for data, _ in results]),
+    })
+    for field, (column, dtype) in SCREENER_FIELDS.items():
+        # Alpha Vantage reports missing values as "None" or "-"
+        values = pd.to_numeric(pd.Series([data.get(field) for data, _ in results]), errors='coerce')
+        table[column] = values.to_numpy(dtype=dtype, na_value=np.nan)
+    table['Error'] = [error for _, error in results]
+    return table
+
+
+def filter_fundamentals(table, sort_by='Market Cap', ascending=False, **bounds):
+    """Sort and filter a screener table in memory; bounds are column=(low, high), None for open ends"""
+    mask = np.ones(len(table), dtype=bool)
+    for column, (low, high) in bounds.items():
+        values = table[column].to_numpy()
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+    return table[mask].sort_values(sort_by, ascending=ascending, na_position='last')
+
+
+_cache = None
+_cache_guard = threading.Lock()
+
+
+def get_overview_cache():
+    """Process-wide OverviewCache shared by all sessions"""
+    global _cache
+    with _cache_guard:
+        if _cache is None:
+            _cache = OverviewCache()
+        return _cache
@@ -0,0 +1,215 @@
+"""One LSTM shared by many tickers.
+
+Each ticker keeps its own min-max scaling and gets a learned embedding id, so a
+single resident model can serve the whole watchlist. Tickers the model was not
+trained on use the shared "unknown" id 0 and a scaler fitted on their own history;
+training feeds id 0 for a random id_dropout share of windows so that embedding is
+learned as a ticker-agnostic fallback.
+
+    python -m utils.global_model AAPL MSFT NVDA --epochs 20
+"""
+import argparse
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+from utils.cli import add_ticker_args, read_tickers
+from utils.model_registry import LoadedModel, get_registry, weights_nbytes
+from utils.preprocessing import FrozenMinMaxScaler
+from utils.training_jobs import MODEL_DIR
+from utils.windows import pooled_window_dataset
+
+GLOBAL_KEY = '__global__'
+
+
+def global_model_paths(model_dir=MODEL_DIR):
+    """Saved global model, per-ticker scalers and metadata paths"""
+    return (
+        os.path.join(model_dir, 'global_lstm_model.keras'),
+        os.path.join(model_dir, 'global_scalers.npz'),
+        os.path.join(model_dir, 'global_meta.json'),
+    )
+
+
+class TickerScalers:
+    """Per-ticker FrozenMinMaxScalers plus the ticker -> embedding id vocabulary"""
+
+    def __init__(self, scalers):
+        self.scalers = dict(scalers)
+        # Id 0 is reserved for tickers the model has never seen
+        self.ids = {ticker: i + 1 for i, ticker in enumerate(self.scalers)}
+
+    @property
+    def vocab_size(self):
+        return len(self.ids) + 1
+
+    def id_for(self, ticker):
+        return self.ids.get(ticker, 0)
+
+    def scaler_for(self, ticker, data):
+        """The training-time scaler, or one fitted on the ticker's own history if it is new"""
+        scaler = self.scalers.get(ticker)
+        return scaler if scaler is not None else FrozenMinMaxScaler.fit(data, feature_range=(0, 1))
+
+    def save(self, path):
+        tickers = list(self.scalers)
+        first = self.scalers[tickers[0]]
+        with open(path, 'wb') as f:
+            np.savez(
+                f,
+                tickers=np.asarray(tickers, dtype='U'),
+                data_min=np.stack([self.scalers[t].data_min for t in tickers]),
+                data_max=np.stack([self.scalers[t].data_max for t in tickers]),
+                feature_range=np.asarray(first.feature_range),
+                feature_names=np.asarray(first.feature_names or [], dtype='U'),
+            )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            names = [str(n) for n in f['feature_names']] or None
+            feature_range = tuple(f['feature_range'])
+            return cls({
+                str(ticker): FrozenMinMaxScaler(lo, hi, feature_range, names)
+                for ticker, lo, hi in zip(f['tickers'], f['data_min'], f['data_max'])
+            })
+
+
+def build_global_model(lookback_window, n_features, vocab_size, embedding_dim=8, units=50, layers=3,
+                       dropout=0.2, learning_rate=0.001):
+    """LSTM stack over the window, joined with a ticker embedding before the dense head"""
+    from tensorflow.keras import Model
+    from tensorflow.keras.layers import LSTM, Concatenate, Dense, Dropout, Embedding, Flatten, Input
+    from tensorflow.keras.optimizers import Adam
+
+    window = Input(shape=(lookback_window, n_features), name='window')
+    ticker_id = Input(shape=(1,), dtype='int32', name='ticker_id')
+    x = window
+    for i in range(layers):
+        x = LSTM(units, return_sequences=i < layers - 1)(x)
+        x = Dropout(dropout)(x)
+    embedding = Flatten()(Embedding(vocab_size, embedding_dim)(ticker_id))
+    x = Dense(max(units // 2, 1))(Concatenate()([x, embedding]))
+    model = Model([window, ticker_id], Dense(1)(x))
+    model.compile(optimizer=Adam(learning_rate=learning_rate), loss='mse', metrics=['mae'])
+    return model
+
+
+def train_global_model(tickers, lookback_window=90, epochs=20, batch_size=256, test_size=0.2,
+                       validation_split=0.2, model_dir=MODEL_DIR, callbacks=None, id_dropout=0.1, **model_kwargs):
+    """Train one model on the pooled windows of every ticker and save it; returns the metadata"""
+    from tensorflow.keras.callbacks import EarlyStopping
+    from utils.lstm_predictor import StockLSTMPredictor, save_model_atomic
+    from utils.ohlcv_store import get_store
+
+    tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+    get_store().refresh_many(tickers)
+
+    predictors = []
+    for ticker in tickers:
+        predictor = StockLSTMPredictor(symbol=ticker, lookback_window=lookback_window)
+        if len(predictor.fetch_data(period='10y')) < lookback_window + 100:
+            print(f'Skipping {ticker}: not enough history')
+            continue
+        # Normalization is per ticker, so prices of any magnitude share the model's input range
+        predictor.prepare_data(test_size=test_size)
+        predictors.append(predictor)
+    if not predictors:
+        raise ValueError('No ticker has enough history to train on.')
+
+    scalers = TickerScalers((p.symbol, p.scaler) for p in predictors)
+    series = [p.scaled_data for p in predictors]
+    ids = [scalers.id_for(p.symbol) for p in predictors]
+    fit_sizes = [int(np.ceil(p.split_idx * (1 - validation_split))) for p in predictors]
+    n_samples = [len(p.X_train) + len(p.X_test) for p in predictors]
+
+    def dataset(ranges, shuffle=False, id_dropout=0.0):
+        return pooled_window_dataset(series, lookback_window, ranges, ids, batch_size=batch_size,
+                                     shuffle=shuffle, id_dropout=id_dropout)
+
+    model = build_global_model(lookback_window, series[0].shape[1], scalers.vocab_size, **model_kwargs)
+    model.fit(
+        dataset([(0, f) for f in fit_sizes], shuffle=True, id_dropout=id_dropout),
+        validation_data=dataset([(f, p.split_idx) for f, p in zip(fit_sizes, predictors)]),
+        epochs=epochs,
+        callbacks=[EarlyStopping(monitor='val_loss', patience=5, restore_best_weights=True)] + list(callbacks or []),
+        verbose=1,
+    )
+
+    # Every ticker's hold-out windows go through one predict call, then are split back out
+    test_pred = model.predict(dataset([(p.split_idx, n) for p, n in zip(predictors, n_samples)]), verbose=0)[:, 0]
+    metrics = {}
+    start = 0
+    for predictor in predictors:
+        stop = start + len(predictor.y_test)
+        actual = predictor.inverse_close(predictor.y_test)
+        predicted = predictor.inverse_close(test_pred[start:stop])
+        metrics[predictor.symbol] = {
+            'mae': float(np.mean(np.abs(predicted - actual))),
+            'rmse': float(np.sqrt(np.mean((predicted - actual) ** 2))),
+        }
+        start = stop
+
+    model_path, scalers_path, meta_path = global_model_paths(model_dir)
+    os.makedirs(model_dir, exist_ok=True)
+    meta = {
+        'tickers': list(scalers.ids),
+        'lookback_window': lookback_window,
+        'features': list(predictors[0].data.columns),
+        'id_dropout': id_dropout,
+        'trained_at': datetime.now().isoformat(timespec='seconds'),
+        'metrics': metrics,
+    }
+    with open(meta_path, 'w') as f:
+        json.dump(meta, f, indent=2)
+    scalers.save(scalers_path)
+    save_model_atomic(model, model_path)
+    return meta
+
+
+def global_model_available(model_dir=MODEL_DIR):
+    model_path, scalers_path, _ = global_model_paths(model_dir)
+    return os.path.exists(model_path) and os.path.exists(scalers_path)
+
+
+def load_global_artifacts(ticker, version, model_path, scalers_path):
+    """Registry loader: the global model with all of its per-ticker scalers"""
+    from tensorflow.keras.models import load_model
+
+    model = load_model(model_path)
+    return LoadedModel(ticker, version, model, TickerScalers.load(scalers_path), weights_nbytes(model))
+
+
+def attach_global_model(predictor, model_dir=MODEL_DIR, registry=None):
+    """Serve a fetched StockLSTMPredictor from the resident global model"""
+    model_path, scalers_path, _ = global_model_paths(model_dir)
+    loaded = (registry or get_registry()).get(GLOBAL_KEY, model_path, scalers_path, loader=load_global_artifacts)
+    predictor.model = loaded.model
+    predictor.scaler = loaded.scaler.scaler_for(predictor.symbol, predictor.data)
+    predictor.ticker_id = loaded.scaler.id_for(predictor.symbol)
+    return predictor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Train one LSTM shared by many tickers.')
+    add_ticker_args(parser)
+    parser.add_argument('--lookback', type=int, default=90)
+    parser.add_argument('--epochs', type=int, default=20)
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--id-dropout', type=float, default=0.1, help='share of windows trained as the unknown id')
+    parser.add_argument('--model-dir', default=MODEL_DIR)
+    args = parser.parse_args(argv)
+
+    tickers = read_tickers(args, parser)
+
+    meta = train_global_model(tickers, lookback_window=args.lookback, epochs=args.epochs,
+                              batch_size=args.batch_size, model_dir=args.model_dir,
+                              id_dropout=args.id_dropout)
+    for ticker, metrics in meta['metrics'].items():
+        print(f"{ticker}: MAE ${metrics['mae']:.2f} · RMSE ${metrics['rmse']:.2f}")
+
+
+if __name__ == '__main__':
+    main()
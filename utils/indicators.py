@@ -0,0 +1,112 @@
+import math
+from collections import deque
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+INDICATORS = ['MA_10', 'MA_30', 'Volatility', 'Price_Change']
+SHORT_WINDOW = 10
+LONG_WINDOW = 30
+
+
+def _rolling(close, window, reduce):
+    out = np.full(len(close), np.nan)
+    if len(close) >= window:
+        out[window - 1:] = reduce(sliding_window_view(close, window), axis=1)
+    return out
+
+
+def compute_indicators(close):
+    """Vectorized batch mode: indicator columns for a full close series, shape (n, 4)
+
+    Matches pandas rolling(10/30).mean(), rolling(10).std() and pct_change().
+    """
+    close = np.asarray(close, dtype='float64')
+    out = np.empty((len(close), len(INDICATORS)))
+    out[:, 0] = _rolling(close, SHORT_WINDOW, np.mean)
+    out[:, 1] = _rolling(close, LONG_WINDOW, np.mean)
+    out[:, 2] = _rolling(close, SHORT_WINDOW, lambda w, axis: np.std(w, axis=axis, ddof=1))
+    out[:, 3] = np.nan
+    out[1:, 3] = close[1:] / close[:-1] - 1
+    return out
+
+
+class IndicatorEngine:
+    """Streaming mode: O(1) running state per indicator, updated one bar at a time
+
+    Moving averages keep running sums; volatility keeps a sliding-window Welford
+    mean and sum of squared deviations. Only the last LONG_WINDOW closes are kept,
+    to know which value leaves each window.
+    """
+
+    def __init__(self):
+        self.closes = deque(maxlen=LONG_WINDOW)
+        self.sum_short = 0.0
+        self.sum_long = 0.0
+        self.mean_short = 0.0
+        self.m2_short = 0.0
+
+    @classmethod
+    def seed(cls, closes):
+        """Engine state after the given closes; only the last LONG_WINDOW are replayed"""
+        engine = cls()
+        engine.update_many(np.asarray(closes, dtype='float64')[-LONG_WINDOW:])
+        return engine
+
+    def update(self, close):
+        """Add one bar and return its (MA_10, MA_30, Volatility, Price_Change)"""
+        close = float(close)
+        n = len(self.closes)
+        last_close = self.closes[-1] if n else None
+
+        if n == LONG_WINDOW:
+            self.sum_long -= self.closes[0]
+        self.sum_long += close
+
+        if n >= SHORT_WINDOW:
+            # Slide the Welford window: one value in, one value out
+            leaving = self.closes[-SHORT_WINDOW]
+            old_mean = self.mean_short
+            self.mean_short = old_mean + (close - leaving) / SHORT_WINDOW
+            self.m2_short += (close - leaving) * (close - self.mean_short + leaving - old_mean)
+            self.sum_short += close - leaving
+        else:
+            delta = close - self.mean_short
+            self.mean_short += delta / (n + 1)
+            self.m2_short += delta * (close - self.mean_short)
+            self.sum_short += close
+
+        self.closes.append(close)
+        n += 1
+
+        ma_short = self.sum_short / SHORT_WINDOW if n >= SHORT_WINDOW else math.nan
+        ma_long = self.sum_long / LONG_WINDOW if n >= LONG_WINDOW else math.nan
+        volatility = math.sqrt(max(self.m2_short, 0.0) / (SHORT_WINDOW - 1)) if n >= SHORT_WINDOW else math.nan
+        price_change = close / last_close - 1 if last_close is not None else math.nan
+        return ma_short, ma_long, volatility, price_change
+
+    def update_many(self, closes):
+        """Add several bars in order; returns an (n, 4) array"""
+        out = np.empty((len(closes), len(INDICATORS)))
+        for i, close in enumerate(closes):
+            out[i] = self.update(close)
+        return out
+
+    def to_dict(self):
+        return {
+            'closes': list(self.closes),
+            'sum_short': self.sum_short,
+            'sum_long': self.sum_long,
+            'mean_short': self.mean_short,
+            'm2_short': self.m2_short,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        engine = cls()
+        engine.closes.extend(state['closes'])
+        engine.sum_short = state['sum_short']
+        engine.sum_long = state['sum_long']
+        engine.mean_short = state['mean_short']
+        engine.m2_short = state['m2_short']
+        return engine
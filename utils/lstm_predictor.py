@@ -0,0 +1,285 @@
+import os
+import json
+from datetime import datetime
+
+import numpy as np
+
+from utils.indicators import INDICATORS
+from utils.ohlcv_store import get_store
+from utils.preprocessing import FrozenMinMaxScaler, load_scaler
+from utils.windows import sliding_windows, window_dataset
+
+
+def horizon_targets(series, lookback_window, horizon):
+    """Next-step target per window, or the next horizon targets as rows when horizon > 1"""
+    if horizon == 1:
+        return series[lookback_window:]
+    return sliding_windows(series[lookback_window:, np.newaxis], horizon)[:, :, 0]
+
+
+def save_model_atomic(model, model_path):
+    """Write a Keras model to a temporary file and swap it into place
+    
+    Readers treat the model file as the "ready" signal, so callers write it last.
+    """
+    tmp_model_path = model_path[:-len('.keras')] + '.tmp.keras'
+    model.save(tmp_model_path)
+    os.replace(tmp_model_path, model_path)
+
+
+class StockLSTMPredictor:
+    def __init__(self, symbol='AAPL', lookback_window=90, horizon=1):
+        self.symbol = symbol
+        self.lookback_window = lookback_window
+        # horizon > 1 trains a direct multi-output head predicting the next horizon closes
+        self.horizon = horizon
+        self.scaler = None
+        self.model = None
+        # Embedding id when served by the shared global model (see utils/global_model.py)
+        self.ticker_id = None
+        
+    def fetch_data(self, period='10y'):
+        """Fetch stock data from the local OHLCV store (refreshed from Yahoo Finance)"""
+        print(f"Fetching {self.symbol} data...")
+        data = get_store().features(self.symbol, period=period)
+        
+        # Use multiple features for better prediction; technical indicators
+        # (MA_10, MA_30, Volatility, Price_Change) are maintained incrementally by the store
+        features = ['Open', 'High', 'Low', 'Close', 'Volume'] + INDICATORS
+        self.data = data[features].copy()
+        
+        # Drop NaN values
+        self.data = self.data.dropna()
+        
+        return self.data
+    
+    def prepare_data(self, test_size=0.2, fit_scaler=True):
+        """Prepare data for LSTM training
+        
+        With fit_scaler=False the already loaded scaler is applied transform-only.
+        """
+        # Scale the data
+        if fit_scaler or self.scaler is None:
+            self.scaler = FrozenMinMaxScaler.fit(self.data, feature_range=(0, 1))
+        self.load_scaled(self.scaler.transform(self.data).astype('float32'), test_size=test_size)
+    
+    def load_scaled(self, scaled_data, test_size=0.2):
+        """Window an already scaled series (e.g. a shared memory-mapped .npy) into train/test sets"""
+        self.scaled_data = scaled_data
+        
+        # Create sequences as strided views; the last windows have no complete target
+        y = horizon_targets(self.scaled_data[:, 3], self.lookback_window, self.horizon)  # Close price is at index 3
+        X = sliding_windows(self.scaled_data, self.lookback_window)[:len(y)]
+        
+        # Split into train and test sets
+        split_idx = int(len(X) * (1 - test_size))
+        self.split_idx = split_idx
+        
+        self.X_train = X[:split_idx]
+        self.X_test = X[split_idx:]
+        self.y_train = y[:split_idx]
+        self.y_test = y[split_idx:]
+    
+    def window_dataset(self, start, stop, batch_size=32, shuffle=False):
+        """Lazily batched windows for sample indices [start, stop)"""
+        return window_dataset(self.scaled_data, self.lookback_window, start, stop,
+                              batch_size=batch_size, shuffle=shuffle, horizon=self.horizon)
+        
+    def build_model(self, units=50, layers=3, dropout=0.2, learning_rate=0.001):
+        """Build LSTM model; the defaults are the production architecture"""
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import LSTM, Dense, Dropout, Input
+        from tensorflow.keras.optimizers import Adam
+        
+        model = Sequential([Input(shape=(self.X_train.shape[1], self.X_train.shape[2]))])
+        for i in range(layers):
+            model.add(LSTM(units, return_sequences=i < layers - 1))
+            model.add(Dropout(dropout))
+        model.add(Dense(max(units // 2, 1)))
+        model.add(Dense(self.horizon))
+        
+        model.compile(optimizer=Adam(learning_rate=learning_rate), loss='mse', metrics=['mae'])
+        self.model = model
+        
+    def train_model(self, epochs=50, batch_size=32, validation_split=0.2, callbacks=None):
+        """Train the LSTM model"""
+        from tensorflow.keras.callbacks import EarlyStopping
+        
+        early_stopping = EarlyStopping(
+            monitor='val_loss', patience=10, restore_best_weights=True
+        )
+        
+        # Hold out the tail of the training windows for validation, as validation_split would
+        fit_size = int(np.ceil(self.split_idx * (1 - validation_split)))
+        
+        history = self.model.fit(
+            self.window_dataset(0, fit_size, batch_size=batch_size, shuffle=True),
+            validation_data=self.window_dataset(fit_size, self.split_idx, batch_size=batch_size),
+            epochs=epochs,
+            callbacks=[early_stopping] + list(callbacks or []),
+            verbose=1
+        )
+        
+        return history
+    
+    def evaluate_model(self):
+        """Evaluate model performance (next-day column of a multi-horizon model)"""
+        from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+        
+        # Make predictions
+        n_samples = len(self.X_train) + len(self.X_test)
+        train_pred = self.model.predict(self.window_dataset(0, self.split_idx, batch_size=256))
+        test_pred = self.model.predict(self.window_dataset(self.split_idx, n_samples, batch_size=256))
+        
+        # Inverse transform predictions (only for close price)
+        # Create dummy array with same shape as original data
+        dummy_train = np.zeros((len(train_pred), self.data.shape[1]))
+        dummy_test = np.zeros((len(test_pred), self.data.shape[1]))
+        dummy_train[:, 3] = train_pred[:, 0]
+        dummy_test[:, 3] = test_pred[:, 0]
+        
+        train_pred_scaled = self.scaler.inverse_transform(dummy_train)[:, 3]
+        test_pred_scaled = self.scaler.inverse_transform(dummy_test)[:, 3]
+        
+        # Inverse transform actual values
+        dummy_y_train = np.zeros((len(self.y_train), self.data.shape[1]))
+        dummy_y_test = np.zeros((len(self.y_test), self.data.shape[1]))
+        dummy_y_train[:, 3] = self.y_train if self.horizon == 1 else self.y_train[:, 0]
+        dummy_y_test[:, 3] = self.y_test if self.horizon == 1 else self.y_test[:, 0]
+        
+        y_train_scaled = self.scaler.inverse_transform(dummy_y_train)[:, 3]
+        y_test_scaled = self.scaler.inverse_transform(dummy_y_test)[:, 3]
+        
+        # Calculate metrics
+        test_rmse = np.sqrt(mean_squared_error(y_test_scaled, test_pred_scaled))
+        test_mae = mean_absolute_error(y_test_scaled, test_pred_scaled)
+        test_r2 = r2_score(y_test_scaled, test_pred_scaled)
+        
+        return test_mae, test_rmse, test_r2
+    
+    def last_window(self):
+        """Scaled final lookback window, shape (lookback_window, features)"""
+        return self.scaler.transform(self.data.tail(self.lookback_window)).astype('float32')
+    
+    def inverse_close(self, scaled_close):
+        """Map scaled Close predictions back to prices"""
+        dummy = np.zeros((len(scaled_close), len(self.scaler.data_min)))
+        dummy[:, 3] = np.ravel(scaled_close)
+        return self.scaler.inverse_transform(dummy)[:, 3]
+    
+    def model_inputs(self, windows):
+        """Model input for stacked windows; the global model also takes each window's ticker id"""
+        if self.ticker_id is None:
+            return windows
+        return [windows, np.full((len(windows), 1), self.ticker_id, dtype='int32')]
+    
+    def predict_next_day(self):
+        """Predict next day's closing price"""
+        # Get last sequence from the data
+        last_sequence = self.last_window()[np.newaxis]
+        
+        # Single forward pass; model.predict's batching machinery is overkill for one window.
+        # np.asarray also accepts a TFLiteRunner's output
+        pred_scaled = np.asarray(self.model(self.model_inputs(last_sequence), training=False))
+        
+        # Inverse transform
+        pred_price = self.inverse_close(pred_scaled[:, 0])[0]
+        
+        return pred_price
+    
+    def save_model_and_scaler(self, model_path, scaler_path):
+        """Save trained model and scaler"""
+        self.model.save(model_path)
+        self.scaler.save(scaler_path)
+    
+    def load_model_and_scaler(self, model_path, scaler_path):
+        """Load trained model and scaler"""
+        from tensorflow.keras.models import load_model
+        
+        self.model = load_model(model_path)
+        self.scaler = load_scaler(scaler_path)
+    
+    def save_metadata(self, meta_path, metrics):
+        """Save training-time evaluation metrics next to the model"""
+        mae, rmse, r2 = metrics
+        meta = {
+            'symbol': self.symbol,
+            'lookback_window': self.lookback_window,
+            'horizon': self.horizon,
+            'features': list(self.data.columns),
+            'trained_at': datetime.now().isoformat(timespec='seconds'),
+            'data_watermark': self.data.index[-1].strftime('%Y-%m-%d'),
+            'scaler_version': self.scaler.version,
+            'metrics': {'mae': float(mae), 'rmse': float(rmse), 'r2': float(r2)},
+        }
+        with open(meta_path, 'w') as f:
+            json.dump(meta, f, indent=2)
+    
+    @staticmethod
+    def load_metadata(meta_path):
+        """Load model metadata, or None if the model predates metadata files"""
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            return json.load(f)
+    
+    def update_metadata(self, meta_path, **fields):
+        """Merge fields into an existing metadata file"""
+        meta = self.load_metadata(meta_path) or {}
+        meta.update(fields)
+        with open(meta_path, 'w') as f:
+            json.dump(meta, f, indent=2)
+        return meta
+    
+    def save_model_atomic(self, model_path):
+        """Write the model to a temporary file and swap it into place"""
+        save_model_atomic(self.model, model_path)
+    
+    def train_and_save(self, model_path, scaler_path, meta_path, epochs=50, batch_size=32, callbacks=None):
+        """Train a fresh model on fetched data, evaluate it once and persist model, scaler and metadata"""
+        self.prepare_data(test_size=0.2)
+        self.build_model()
+        self.train_model(epochs=epochs, batch_size=batch_size, callbacks=callbacks)
+        self.save_metadata(meta_path, self.evaluate_model())
+        
+        self.scaler.save(scaler_path)
+        self.save_model_atomic(model_path)
+    
+    def fine_tune(self, model_path, scaler_path, meta_path, epochs=3, recent_windows=250,
+                  batch_size=32, learning_rate=1e-4, callbacks=None):
+        """Fine-tune a saved model on the bars that arrived since its data watermark
+        
+        Returns the number of new bars; 0 means the model was already up to date.
+        """
+        self.load_model_and_scaler(model_path, scaler_path)
+        meta = self.load_metadata(meta_path) or {}
+        self.fetch_data(period='10y')
+        
+        watermark = meta.get('data_watermark')
+        new_bars = int((self.data.index > watermark).sum()) if watermark else len(self.data)
+        if new_bars == 0:
+            return 0
+        
+        # The scaler stays frozen: the model only knows the scaling it was trained with
+        self.scaled_data = self.scaler.transform(self.data).astype('float32')
+        n_samples = len(self.scaled_data) - self.lookback_window - self.horizon + 1
+        start = max(0, n_samples - max(recent_windows, new_bars))
+        
+        self.model.optimizer.learning_rate.assign(learning_rate)
+        self.model.fit(
+            self.window_dataset(start, n_samples, batch_size=batch_size, shuffle=True),
+            epochs=epochs,
+            callbacks=list(callbacks or []),
+            verbose=0
+        )
+        
+        # The watermark only moves once the tuned model is on disk; a crash in between
+        # re-tunes on the same bars instead of skipping them
+        self.save_model_atomic(model_path)
+        self.update_metadata(
+            meta_path,
+            data_watermark=self.data.index[-1].strftime('%Y-%m-%d'),
+            fine_tuned_at=datetime.now().isoformat(timespec='seconds'),
+            fine_tune_count=meta.get('fine_tune_count', 0) + 1,
+        )
+        return new_bars
@@ -0,0 +1,130 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from utils.preprocessing import load_scaler
+
+
+class LoadedModel:
+    """A deserialized model and its scaler, as held by the registry"""
+
+    def __init__(self, ticker, version, model, scaler, nbytes):
+        self.ticker = ticker
+        self.version = version
+        self.model = model
+        self.scaler = scaler
+        self.nbytes = nbytes
+
+
+def model_version(model_path):
+    """Version of a saved model file; changes whenever the model is retrained"""
+    return os.stat(model_path).st_mtime_ns
+
+
+def warm_up(model):
+    """Run one dummy forward pass so graph tracing happens before the first real request"""
+    shapes = model.input_shape if isinstance(model.input_shape, list) else [model.input_shape]
+    inputs = [np.zeros(tuple(1 if dim is None else dim for dim in shape), dtype='float32') for shape in shapes]
+    model(inputs if len(inputs) > 1 else inputs[0], training=False)
+
+
+def weights_nbytes(model):
+    return int(sum(w.nbytes for w in model.get_weights()))
+
+
+def load_artifacts(ticker, version, model_path, scaler_path):
+    """Deserialize a saved Keras model and its scaler"""
+    from tensorflow.keras.models import load_model
+
+    model = load_model(model_path)
+    scaler = load_scaler(scaler_path)
+    return LoadedModel(ticker, version, model, scaler, weights_nbytes(model))
+
+
+class ModelRegistry:
+    """Process-wide LRU cache of loaded models keyed by (ticker, model version)"""
+
+    def __init__(self, max_models=16, max_bytes=512 * 1024 * 1024):
+        self.max_models = max_models
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _insert(self, entry):
+        key = (entry.ticker, entry.version)
+        # A retrained model supersedes every older version of the same ticker
+        for stale in [k for k in self._entries if k[0] == entry.ticker and k != key]:
+            del self._entries[stale]
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._evict()
+
+    def _evict(self):
+        # Always keep the most recently used entry, even if it alone exceeds max_bytes
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_models or self.resident_bytes() > self.max_bytes
+        ):
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def resident_bytes(self):
+        return sum(entry.nbytes for entry in self._entries.values())
+
+    def get(self, ticker, model_path, scaler_path, loader=load_artifacts):
+        """Return the resident LoadedModel for a ticker, loading and warming it up on a miss"""
+        version = model_version(model_path)
+        key = (ticker, version)
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.hits += 1
+                return entry
+            self.misses += 1
+            # Concurrent misses for the same key wait on a single load
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                entry = self._lookup(key)
+            if entry is None:
+                entry = loader(ticker, version, model_path, scaler_path)
+                warm_up(entry.model)
+                with self._lock:
+                    self._insert(entry)
+                    self._loading.pop(key, None)
+        return entry
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'resident_models': len(self._entries),
+                'resident_bytes': self.resident_bytes(),
+            }
+
+
+_registry = None
+_registry_guard = threading.Lock()
+
+
+def get_registry():
+    """Process-wide ModelRegistry shared across Streamlit reruns and sessions"""
+    global _registry
+    with _registry_guard:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
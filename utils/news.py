@@ -0,0 +1,132 @@
+import datetime
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.clients import news_api_key
+
+NEWS_API_URL = 'https://newsapi.org/v2'
+# (connect, read) seconds
+DEFAULT_TIMEOUT = (3.05, 10)
+
+
+class NewsAPIError(Exception):
+    """NewsAPI returned an error response"""
+
+
+class NewsClient:
+    """Pooled NewsAPI client with timeouts, backoff retries and conditional caching
+
+    One requests.Session is shared by all callers, so connections (and TLS sessions)
+    are reused. Responses are cached per query; within max_age no request is made,
+    after that the cached ETag / Last-Modified are sent and a 304 reuses the articles.
+    The "from" date moves every day, so the cache keeps only the max_entries most
+    recently used queries.
+    """
+
+    def __init__(self, api_key=None, base_url=NEWS_API_URL, timeout=DEFAULT_TIMEOUT,
+                 retries=3, backoff_factor=0.5, max_age=300, pool_size=16, max_entries=256):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET']),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, path, params):
+        """GET with conditional caching; returns the decoded JSON body"""
+        key = (path, tuple(sorted(params.items())))
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+        if cached is not None and time.time() - cached['fetched_at'] < self.max_age:
+            return cached['body']
+
+        headers = {'X-Api-Key': self.api_key or news_api_key() or ''}
+        if cached is not None:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        response = self.session.get(f'{self.base_url}/{path}', params=params, headers=headers,
+                                    timeout=self.timeout)
+        if response.status_code == 304 and cached is not None:
+            body = cached['body']
+        elif response.status_code == 200:
+            body = response.json()
+        else:
+            try:
+                message = response.json().get('message', response.reason)
+            except ValueError:
+                message = response.reason
+            raise NewsAPIError(f'{response.status_code}: {message}')
+
+        with self._lock:
+            self._cache[key] = {
+                'body': body,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'fetched_at': time.time(),
+            }
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return body
+
+    def fetch_articles(self, ticker, from_date=None, to_date=None, days=30):
+        """Articles mentioning a ticker, newest first (default window: the last 30 days)"""
+        from_date = from_date or (to_date or datetime.date.today()) - datetime.timedelta(days=days)
+        params = {
+            'q': ticker,
+            'from': str(from_date),
+            'sortBy': 'publishedAt',
+            'language': 'en',
+        }
+        # Without "to" NewsAPI returns everything up to now
+        if to_date is not None:
+            params['to'] = str(to_date)
+        return self._get('everything', params).get('articles', [])
+
+    def fetch_many(self, tickers, max_workers=8, **kwargs):
+        """Fetch several tickers concurrently; failed tickers map to their exception"""
+        def fetch(ticker):
+            try:
+                return self.fetch_articles(ticker, **kwargs)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return dict(zip(tickers, pool.map(fetch, tickers)))
+
+
+_client = None
+_client_guard = threading.Lock()
+
+
+def get_news_client():
+    """Process-wide NewsClient shared by all sessions"""
+    global _client
+    with _client_guard:
+        if _client is None:
+            _client = NewsClient()
+        return _client
@@ -0,0 +1,151 @@
+import datetime
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from utils.news import get_news_client
+
+DEFAULT_DB = os.path.join('data', 'news.sqlite')
+
+# Trailing " - Reuters" / " | Yahoo Finance" style source suffixes on syndicated headlines
+_SOURCE_SUFFIX = re.compile(r'^(.*\S)\s+[-|–—]\s+([^-|–—]{1,40})$')
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+
+def _normalize(text):
+    return _NON_WORD.sub(' ', text.lower()).strip()
+
+
+def title_hash(title, source=None):
+    """Hash of a headline normalized so syndicated copies of one story collide
+
+    A trailing " - <source>" is only dropped when it names the article's own source,
+    so headlines that differ only after a dash stay distinct.
+    """
+    text = (title or '').strip()
+    match = _SOURCE_SUFFIX.match(text)
+    if match and source and _normalize(match.group(2)) == _normalize(source):
+        text = match.group(1)
+    return hashlib.sha1(_normalize(text).encode('utf-8')).hexdigest()
+
+
+class NewsStore:
+    """Per-ticker incremental news ingestion with URL and headline deduplication
+
+    Each ticker remembers the newest publishedAt it has seen and only asks NewsAPI
+    for articles from that point on. History is capped at max_per_ticker articles.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB, client=None, max_per_ticker=500, min_interval=300, backfill_days=30):
+        self.db_path = db_path
+        self.client = client
+        self.max_per_ticker = max_per_ticker
+        self.min_interval = min_interval
+        self.backfill_days = backfill_days
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS articles ('
+                ' ticker TEXT NOT NULL, url TEXT NOT NULL, title_hash TEXT NOT NULL,'
+                ' published_at TEXT NOT NULL, title TEXT, description TEXT, source TEXT,'
+                ' PRIMARY KEY (ticker, url), UNIQUE (ticker, title_hash))'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS articles_recent ON articles (ticker, published_at)')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS watermarks ('
+                ' ticker TEXT PRIMARY KEY, newest_published_at TEXT, last_ingested REAL NOT NULL)'
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def watermark(self, ticker):
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT newest_published_at, last_ingested FROM watermarks WHERE ticker = ?', (ticker.upper(),)
+            ).fetchone()
+        return row if row is not None else (None, 0.0)
+
+    def ingest(self, ticker, force=False):
+        """Pull articles newer than the ticker's watermark; returns how many distinct stories were added"""
+        ticker = ticker.upper()
+        newest, last_ingested = self.watermark(ticker)
+        if not force and time.time() - last_ingested < self.min_interval:
+            return 0
+
+        client = self.client or get_news_client()
+        if newest is None:
+            articles = client.fetch_articles(ticker, days=self.backfill_days)
+        else:
+            # NewsAPI's "from" is inclusive; the boundary article is dropped as a duplicate
+            articles = client.fetch_articles(ticker, from_date=newest.rstrip('Z'))
+
+        rows = []
+        for a in articles:
+            if not (a.get('url') and a.get('title')):
+                continue
+            source = (a.get('source') or {}).get('name')
+            rows.append((
+                ticker, a['url'], title_hash(a['title'], source), a.get('publishedAt') or '',
+                a['title'], a.get('description'), source,
+            ))
+        with self._connect() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                'INSERT OR IGNORE INTO articles'
+                ' (ticker, url, title_hash, published_at, title, description, source)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?)',
+                rows,
+            )
+            added = conn.total_changes - before
+            conn.execute(
+                'DELETE FROM articles WHERE ticker = ? AND url NOT IN ('
+                ' SELECT url FROM articles WHERE ticker = ? ORDER BY published_at DESC LIMIT ?)',
+                (ticker, ticker, self.max_per_ticker),
+            )
+            newest_seen = max([r[3] for r in rows if r[3]] + ([newest] if newest else []), default=None)
+            conn.execute(
+                'INSERT OR REPLACE INTO watermarks (ticker, newest_published_at, last_ingested) VALUES (?, ?, ?)',
+                (ticker, newest_seen, time.time()),
+            )
+        return added
+
+    def latest(self, ticker, limit=5, since=None):
+        """Most recent distinct stories for a ticker, in NewsAPI article shape"""
+        query = 'SELECT title, description, url, published_at, source FROM articles WHERE ticker = ?'
+        params = [ticker.upper()]
+        if since is not None:
+            query += ' AND published_at >= ?'
+            params.append(since)
+        query += ' ORDER BY published_at DESC LIMIT ?'
+        params.append(limit)
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [
+            {'title': title, 'description': description, 'url': url,
+             'publishedAt': published_at, 'source': {'name': source}}
+            for title, description, url, published_at, source in rows
+        ]
+
+    def recent(self, ticker, days=30, limit=None):
+        """All stored stories from the last `days` days"""
+        since = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=days)
+        since = since.strftime('%Y-%m-%dT%H:%M:%SZ')
+        return self.latest(ticker, limit=limit or self.max_per_ticker, since=since)
+
+
+_store = None
+_store_guard = threading.Lock()
+
+
+def get_news_store():
+    """Process-wide NewsStore shared by all sessions"""
+    global _store
+    with _store_guard:
+        if _store is None:
+            _store = NewsStore()
+        return _store
@@ -0,0 +1,477 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: locking falls back to in-process only
+    fcntl = None
+
+import numpy as np
+import pandas as pd
+
+from utils.indicators import INDICATORS, LONG_WINDOW, IndicatorEngine, compute_indicators
+
+DEFAULT_ROOT = os.path.join('data', 'ohlcv')
+COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+PERIOD_YEARS = {'1y': 1, '2y': 2, '5y': 5, '10y': 10}
+# Bars re-downloaded on every refresh so late corrections and today's partial bar are replaced
+OVERLAP_BARS = 5
+
+MINUTE_NS = 60 * 10**9
+DAY_NS = 24 * 60 * MINUTE_NS
+# Intraday intervals stored on disk, with how many days of bars each keeps
+INTRADAY_RETENTION_DAYS = {'1m': 7}
+# Coarser intervals derived from stored ones: (source interval, bar length, bucket offset).
+# Hourly buckets start at :30 to line up with the US session open.
+DERIVED_INTERVALS = {
+    '5m': ('1m', 5 * MINUTE_NS, 0),
+    '15m': ('1m', 15 * MINUTE_NS, 0),
+    '30m': ('1m', 30 * MINUTE_NS, 0),
+    '1h': ('1m', 60 * MINUTE_NS, 30 * MINUTE_NS),
+}
+
+
+def resample_ohlcv(dates, values, step_ns, offset_ns=0):
+    """Aggregate sorted bars into step_ns buckets (first open, max high, min low, last close, summed volume)"""
+    dates = np.asarray(dates)
+    values = np.asarray(values)
+    if len(dates) == 0:
+        return dates, values
+    buckets = (dates - offset_ns) // step_ns
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(buckets)) + 1])
+    ends = np.append(starts[1:], len(dates)) - 1
+    out = np.empty((len(starts), len(COLUMNS)))
+    out[:, 0] = values[starts, 0]
+    out[:, 1] = np.maximum.reduceat(values[:, 1], starts)
+    out[:, 2] = np.minimum.reduceat(values[:, 2], starts)
+    out[:, 3] = values[ends, 3]
+    out[:, 4] = np.add.reduceat(values[:, 4], starts)
+    return buckets[starts] * step_ns + offset_ns, out
+
+
+class OHLCVStore:
+    """On-disk OHLCV store with one columnar file set per ticker and interval
+
+    Daily bars carry persisted indicators; 1-minute bars are kept for a bounded number
+    of days, and coarser intraday intervals are resampled from them on read.
+
+    Writers hold an exclusive flock on a per-ticker .lock file (shared with training
+    and backtest worker processes) and swap in new files with os.replace, never
+    truncating in place; readers map all columns under a shared lock, so every
+    snapshot is consistent and stays valid after later writes.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, max_age=900, initial_period='10y'):
+        self.root = root
+        self.max_age = max_age
+        self.initial_period = initial_period
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _thread_lock(self, ticker, interval):
+        with self._locks_guard:
+            return self._locks.setdefault((ticker, interval), threading.Lock())
+
+    @contextmanager
+    def _lock(self, ticker, interval='1d', shared=False):
+        """Per-ticker lock across threads and processes; shared=True for readers"""
+        lock_path = os.path.join(self.root, ticker.upper(), f'{interval}.lock')
+        os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+        # A sidecar file, since the meta file itself is replaced on every write
+        with open(lock_path, 'a') as f:
+            if fcntl is None:
+                with self._thread_lock(ticker.upper(), interval):
+                    yield
+                return
+            fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _paths(self, ticker, interval='1d'):
+        base = os.path.join(self.root, ticker.upper())
+        return (
+            os.path.join(base, f'{interval}.dates.bin'),
+            os.path.join(base, f'{interval}.ohlcv.bin'),
+            os.path.join(base, f'{interval}.json'),
+            os.path.join(base, f'{interval}.indicators.bin'),
+        )
+
+    def _read_meta(self, ticker, interval='1d'):
+        meta_path = self._paths(ticker, interval)[2]
+        if not os.path.exists(meta_path):
+            return {}
+        with open(meta_path) as f:
+            return json.load(f)
+
+    def _write_meta(self, ticker, meta, interval='1d'):
+        meta_path = self._paths(ticker, interval)[2]
+        tmp_path = meta_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    @staticmethod
+    def _map(path, dtype, width=None):
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return np.empty(0, dtype=dtype) if width is None else np.empty((0, width), dtype=dtype)
+        array = np.memmap(path, dtype=dtype, mode='r')
+        return array if width is None else array.reshape(-1, width)
+
+    def _map_files(self, ticker, interval='1d'):
+        """Unlocked load(); callers hold the ticker lock"""
+        dates_path, values_path, _, _ = self._paths(ticker, interval)
+        return self._map(dates_path, 'int64'), self._map(values_path, 'float64', len(COLUMNS))
+
+    def _map_indicators(self, ticker):
+        return self._map(self._paths(ticker)[3], 'float64', len(INDICATORS))
+
+    def load(self, ticker, interval='1d', with_indicators=False):
+        """Memory-map the stored dates (int64 ns) and OHLCV rows (float64) for a ticker
+
+        with_indicators=True also returns the indicator rows from the same snapshot.
+        """
+        with self._lock(ticker, interval, shared=True):
+            dates, values = self._map_files(ticker, interval)
+            if with_indicators:
+                return dates, values, self._map_indicators(ticker)
+        return dates, values
+
+    def load_indicators(self, ticker):
+        """Memory-map the stored indicator rows (float64), aligned with load()"""
+        with self._lock(ticker, shared=True):
+            return self._map_indicators(ticker)
+
+    def _download(self, ticker, start=None):
+        import yfinance as yf
+
+        stock = yf.Ticker(ticker)
+        if start is None:
+            data = stock.history(period=self.initial_period, interval='1d')
+        else:
+            data = stock.history(start=start, interval='1d')
+        return self._clean_daily(data)
+
+    @staticmethod
+    def _clean_daily(data):
+        if data.empty:
+            return data
+        data = data[COLUMNS].dropna()
+        if data.index.tz is not None:
+            data.index = data.index.tz_localize(None)
+        data.index = data.index.normalize()
+        return data
+
+    def _write_files(self, ticker, keep_rows, dates, values, indicators=None, interval='1d'):
+        """Keep the first keep_rows bars of every column file and append the given rows
+
+        Each file is written to a temporary path and swapped in, so live memory maps
+        keep reading the old file instead of faulting on truncated pages. The files
+        are small (~100 KB for 10 years of daily bars), so copying the kept rows is cheap.
+        """
+        paths = self._paths(ticker, interval)
+        os.makedirs(os.path.dirname(paths[0]), exist_ok=True)
+        columns = [(paths[0], dates), (paths[1], values)]
+        if indicators is not None:
+            columns.append((paths[3], indicators))
+        for path, array in columns:
+            array = np.ascontiguousarray(array)
+            row_bytes = array.itemsize * (array.shape[1] if array.ndim == 2 else 1)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as out:
+                if keep_rows and os.path.exists(path):
+                    with open(path, 'rb') as f:
+                        out.write(f.read(keep_rows * row_bytes))
+                out.write(array.tobytes())
+            os.replace(tmp_path, path)
+
+    def _rewrite(self, ticker, frame, meta):
+        """Replace the stored history and recompute indicators in batch mode"""
+        closes = frame['Close'].to_numpy(dtype='float64')
+        self._write_files(
+            ticker, 0,
+            frame.index.values.astype('datetime64[ns]').view('int64'),
+            frame[COLUMNS].to_numpy(dtype='float64'),
+            compute_indicators(closes),
+        )
+        meta['indicator_state'] = IndicatorEngine.seed(closes).to_dict()
+
+    def _append(self, ticker, keep_rows, frame, meta, stored_closes):
+        """Keep the first keep_rows bars, append frame and stream indicators for the new bars"""
+        if keep_rows == len(stored_closes) and 'indicator_state' in meta:
+            engine = IndicatorEngine.from_dict(meta['indicator_state'])
+        else:
+            # Replaced bars invalidate the saved state; replay the window before them instead
+            engine = IndicatorEngine.seed(stored_closes[max(0, keep_rows - LONG_WINDOW):keep_rows])
+        indicators = engine.update_many(frame['Close'].to_numpy(dtype='float64'))
+        self._write_files(
+            ticker, keep_rows,
+            frame.index.values.astype('datetime64[ns]').view('int64'),
+            frame[COLUMNS].to_numpy(dtype='float64'),
+            indicators,
+        )
+        meta['indicator_state'] = engine.to_dict()
+
+    def refresh(self, ticker, force=False, prefetched=None):
+        """Download only the bars newer than the last stored date; returns the number of bars written
+
+        prefetched is a daily frame already downloaded by refresh_many(); it is used
+        instead of a per-ticker request when it covers the bars needed.
+        """
+        ticker = ticker.upper()
+        with self._lock(ticker):
+            meta = self._read_meta(ticker)
+            if not force and time.time() - meta.get('last_checked', 0) < self.max_age:
+                return 0
+
+            dates, values = self._map_files(ticker)
+            if len(dates) == 0:
+                frame = prefetched if prefetched is not None else self._download(ticker)
+                if frame.empty:
+                    return 0
+                self._rewrite(ticker, frame, meta)
+                written = len(frame)
+            else:
+                if len(self._map_indicators(ticker)) != len(dates):
+                    # History stored before indicators were persisted
+                    self._rewrite(ticker, self._frame(dates, values), meta)
+                overlap = min(OVERLAP_BARS, len(dates))
+                first_overlap = len(dates) - overlap
+                start = pd.Timestamp(dates[first_overlap]).date()
+                if prefetched is not None:
+                    frame = prefetched[prefetched.index >= pd.Timestamp(start)]
+                else:
+                    frame = self._download(ticker, start=start)
+                if frame.empty:
+                    # The overlap bars always come back, so an empty frame is a failed or partial
+                    # download; last_checked stays put and the next call tries again
+                    return 0
+                written = 0
+                # Dividends and splits rescale the whole adjusted history, so a
+                # mismatch on the oldest overlapping bar means a full re-download
+                stored_close = values[first_overlap, COLUMNS.index('Close')]
+                fetched_first = frame.index[0].value == dates[first_overlap]
+                if fetched_first and not np.isclose(frame['Close'].iloc[0], stored_close, rtol=1e-6):
+                    frame = self._download(ticker)
+                    self._rewrite(ticker, frame, meta)
+                    written = len(frame)
+                else:
+                    # Skip re-fetched bars that are unchanged; usually only today's bar moves
+                    positions = np.searchsorted(dates, frame.index.values.astype('datetime64[ns]').view('int64'))
+                    unchanged = 0
+                    for pos, row in zip(positions, frame[COLUMNS].to_numpy(dtype='float64')):
+                        if pos >= len(dates) or not np.allclose(values[pos], row, rtol=1e-9):
+                            break
+                        unchanged += 1
+                    frame = frame.iloc[unchanged:]
+                    if not frame.empty:
+                        keep_rows = int(np.searchsorted(dates, frame.index[0].value))
+                        stored_closes = np.array(values[:, COLUMNS.index('Close')])
+                        del dates, values
+                        self._append(ticker, keep_rows, frame, meta, stored_closes)
+                        written = len(frame)
+
+            meta['last_checked'] = time.time()
+            self._write_meta(ticker, meta)
+            return written
+
+    def _is_fresh(self, ticker):
+        return time.time() - self._read_meta(ticker).get('last_checked', 0) < self.max_age
+
+    def refresh_many(self, tickers, force=False):
+        """Refresh several tickers with one batched yf.download per kind of request
+
+        Tickers with no stored history share one full download; the rest share one
+        download starting at the earliest bar any of them needs.
+        """
+        import yfinance as yf
+
+        tickers = [t.upper() for t in dict.fromkeys(tickers)]
+        stale = [t for t in tickers if force or not self._is_fresh(t)]
+        new, existing = [], {}
+        for ticker in stale:
+            dates, _ = self.load(ticker)
+            if len(dates) == 0:
+                new.append(ticker)
+            else:
+                existing[ticker] = pd.Timestamp(dates[len(dates) - min(OVERLAP_BARS, len(dates))]).date()
+
+        batches = []
+        if new:
+            batches.append((new, {'period': self.initial_period}))
+        if existing:
+            batches.append((list(existing), {'start': min(existing.values())}))
+        for batch, window in batches:
+            try:
+                data = yf.download(batch, interval='1d', group_by='ticker', auto_adjust=True,
+                                   threads=True, progress=False, **window)
+            except Exception as e:
+                print(f"Batched download failed ({e}); refreshing individually")
+                data = None
+            for ticker in batch:
+                prefetched = None
+                if data is not None and isinstance(data.columns, pd.MultiIndex) and ticker in data.columns.levels[0]:
+                    prefetched = self._clean_daily(data[ticker])
+                elif data is not None and len(batch) == 1:
+                    prefetched = self._clean_daily(data)
+                if prefetched is not None and prefetched.empty:
+                    # yfinance leaves a missing or all-NaN column group when one ticker of a batch fails
+                    prefetched = None
+                self.refresh(ticker, force=True, prefetched=prefetched)
+
+    def compare(self, tickers, period='1y', interval='1d', days=None, normalize=True):
+        """Closes for several tickers aligned on their shared timestamps, rebased to 100 by default"""
+        tickers = [t.upper() for t in dict.fromkeys(tickers)]
+        if interval == '1d':
+            self.refresh_many(tickers)
+            closes = {t: self.history(t, period=period, refresh=False)['Close'] for t in tickers}
+        else:
+            source = DERIVED_INTERVALS.get(interval, (interval,))[0]
+            with ThreadPoolExecutor(max_workers=min(8, len(tickers))) as pool:
+                list(pool.map(lambda t: self.refresh_intraday(t, source), tickers))
+            closes = {t: self.bars(t, interval=interval, days=days, refresh=False)['Close'] for t in tickers}
+
+        aligned = pd.concat(closes, axis=1, join='inner').dropna()
+        if normalize and not aligned.empty:
+            aligned = aligned / aligned.iloc[0] * 100
+        return aligned
+
+    @staticmethod
+    def _frame(dates, values):
+        index = pd.DatetimeIndex(np.asarray(dates).view('datetime64[ns]'), name='Date')
+        return pd.DataFrame(np.asarray(values), index=index, columns=COLUMNS)
+
+    @staticmethod
+    def _period_start(dates, period):
+        if len(dates) == 0 or period not in PERIOD_YEARS:
+            return 0
+        cutoff = pd.Timestamp.now().normalize() - pd.DateOffset(years=PERIOD_YEARS[period])
+        return int(np.searchsorted(dates, cutoff.value))
+
+    def slice(self, ticker, period='10y'):
+        """Zero-copy (dates, values) views covering the requested period"""
+        dates, values = self.load(ticker.upper())
+        start = self._period_start(dates, period)
+        return dates[start:], values[start:]
+
+    def history(self, ticker, period='10y', refresh=True):
+        """Daily OHLCV frame for the requested period, refreshed from Yahoo Finance when stale"""
+        if refresh:
+            self.refresh(ticker)
+        dates, values = self.slice(ticker, period)
+        index = pd.DatetimeIndex(dates.view('datetime64[ns]'), name='Date')
+        return pd.DataFrame(values, index=index, columns=COLUMNS, copy=False)
+
+    def features(self, ticker, period='10y', refresh=True):
+        """history() plus the persisted MA_10, MA_30, Volatility and Price_Change columns"""
+        ticker = ticker.upper()
+        if refresh:
+            self.refresh(ticker)
+        dates, values, indicators = self.load(ticker, with_indicators=True)
+        if len(indicators) != len(dates):
+            return pd.DataFrame(columns=COLUMNS + INDICATORS, index=pd.DatetimeIndex([], name='Date'))
+        start = self._period_start(dates, period)
+        index = pd.DatetimeIndex(dates[start:].view('datetime64[ns]'), name='Date')
+        return pd.concat([
+            pd.DataFrame(values[start:], index=index, columns=COLUMNS, copy=False),
+            pd.DataFrame(indicators[start:], index=index, columns=INDICATORS, copy=False),
+        ], axis=1)
+
+
+    def _download_intraday(self, ticker, interval, start=None):
+        import yfinance as yf
+
+        stock = yf.Ticker(ticker)
+        if start is None:
+            data = stock.history(period=f'{INTRADAY_RETENTION_DAYS[interval]}d', interval=interval)
+        else:
+            data = stock.history(start=start, interval=interval)
+        if data.empty:
+            return data
+        data = data[COLUMNS].dropna()
+        # Intraday timestamps are stored as naive UTC
+        data.index = data.index.tz_convert('UTC').tz_localize(None)
+        return data
+
+    def refresh_intraday(self, ticker, interval='1m', force=False):
+        """Append new intraday bars and drop those past the retention window; returns bars written"""
+        ticker = ticker.upper()
+        with self._lock(ticker, interval):
+            meta = self._read_meta(ticker, interval)
+            if not force and time.time() - meta.get('last_checked', 0) < min(self.max_age, 60):
+                return 0
+
+            dates, values = self._map_files(ticker, interval)
+            # Yahoo only serves the last few days of minute bars, so a file older than
+            # that cannot be bridged incrementally; start over from a full download
+            stale_ns = (INTRADAY_RETENTION_DAYS[interval] - 1) * DAY_NS
+            if len(dates) == 0 or time.time_ns() - int(dates[-1]) > stale_ns:
+                frame = self._download_intraday(ticker, interval)
+                keep_rows = 0
+            else:
+                # Re-fetch from the last stored bar, which may still have been forming
+                frame = self._download_intraday(ticker, interval, start=pd.Timestamp(dates[-1]).date())
+                if not frame.empty:
+                    keep_rows = int(np.searchsorted(dates, frame.index[0].value))
+            written = len(frame)
+            if written:
+                new_dates = frame.index.values.astype('datetime64[ns]').view('int64')
+                new_values = frame[COLUMNS].to_numpy(dtype='float64')
+                cutoff = new_dates[-1] - INTRADAY_RETENTION_DAYS[interval] * DAY_NS
+                expired = int(np.searchsorted(dates, cutoff)) if keep_rows else 0
+                if expired > keep_rows // 4:
+                    # Compact once a quarter of the file has aged out, rather than on every refresh
+                    new_dates = np.concatenate([dates[expired:keep_rows], new_dates])
+                    new_values = np.concatenate([values[expired:keep_rows], new_values])
+                    keep_rows = 0
+                del dates, values
+                self._write_files(ticker, keep_rows, new_dates, new_values, interval=interval)
+
+            meta['last_checked'] = time.time()
+            self._write_meta(ticker, meta, interval)
+            return written
+
+    def bars(self, ticker, interval='1d', days=None, refresh=True):
+        """OHLCV frame at any supported interval, optionally limited to the last `days` days
+
+        '1d' and stored intraday intervals are zero-copy views; derived intervals
+        ('5m', '15m', '30m', '1h') are resampled from stored 1-minute bars.
+        """
+        ticker = ticker.upper()
+        if interval == '1d':
+            if refresh:
+                self.refresh(ticker)
+            dates, values = self.load(ticker)
+        else:
+            source, step_ns, offset_ns = DERIVED_INTERVALS.get(interval, (interval, None, 0))
+            if source not in INTRADAY_RETENTION_DAYS:
+                raise ValueError(f'Unsupported interval: {interval}')
+            if refresh:
+                self.refresh_intraday(ticker, source)
+            dates, values = self.load(ticker, source)
+            if step_ns is not None:
+                dates, values = resample_ohlcv(dates, values, step_ns, offset_ns)
+
+        if days is not None and len(dates):
+            start = int(np.searchsorted(dates, dates[-1] - days * DAY_NS, side='right'))
+            dates, values = dates[start:], values[start:]
+        index = pd.DatetimeIndex(np.asarray(dates).view('datetime64[ns]'), name='Date')
+        return pd.DataFrame(values, index=index, columns=COLUMNS, copy=False)
+
+
+_store = None
+_store_guard = threading.Lock()
+
+
+def get_store():
+    """Process-wide OHLCVStore shared by all pages and sessions"""
+    global _store
+    with _store_guard:
+        if _store is None:
+            _store = OHLCVStore()
+        return _store
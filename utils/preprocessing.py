@@ -0,0 +1,88 @@
+import hashlib
+import os
+import pickle
+
+import numpy as np
+
+
+class FrozenMinMaxScaler:
+    """Min-max feature scaling with fixed parameters, stored as a small .npz artifact
+
+    Equivalent to sklearn's MinMaxScaler once fitted, but immutable: the inference
+    path can only transform, so a model always sees the scaling it was trained with.
+    """
+
+    def __init__(self, data_min, data_max, feature_range=(0, 1), feature_names=None):
+        self.data_min = np.asarray(data_min, dtype='float64')
+        self.data_max = np.asarray(data_max, dtype='float64')
+        self.feature_range = tuple(float(v) for v in feature_range)
+        self.feature_names = list(feature_names) if feature_names is not None else None
+
+        data_range = self.data_max - self.data_min
+        # Constant features map to the lower bound, as in sklearn
+        data_range[data_range == 0.0] = 1.0
+        lo, hi = self.feature_range
+        self.scale = (hi - lo) / data_range
+        self.min = lo - self.data_min * self.scale
+        for array in (self.data_min, self.data_max, self.scale, self.min):
+            array.setflags(write=False)
+
+    @classmethod
+    def fit(cls, data, feature_range=(0, 1)):
+        values = np.asarray(data, dtype='float64')
+        names = list(data.columns) if hasattr(data, 'columns') else None
+        return cls(np.nanmin(values, axis=0), np.nanmax(values, axis=0), feature_range, names)
+
+    @classmethod
+    def from_sklearn(cls, scaler, feature_names=None):
+        names = getattr(scaler, 'feature_names_in_', feature_names)
+        return cls(scaler.data_min_, scaler.data_max_, scaler.feature_range, names)
+
+    @property
+    def version(self):
+        """Short content hash of the scaling parameters"""
+        digest = hashlib.sha1()
+        for array in (self.data_min, self.data_max, np.asarray(self.feature_range)):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        return digest.hexdigest()[:12]
+
+    def transform(self, data):
+        return np.asarray(data, dtype='float64') * self.scale + self.min
+
+    def inverse_transform(self, data):
+        return (np.asarray(data, dtype='float64') - self.min) / self.scale
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            np.savez(
+                f,
+                data_min=self.data_min,
+                data_max=self.data_max,
+                feature_range=np.asarray(self.feature_range),
+                feature_names=np.asarray(self.feature_names or [], dtype='U'),
+            )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            names = [str(n) for n in f['feature_names']] or None
+            return cls(f['data_min'], f['data_max'], tuple(f['feature_range']), names)
+
+
+def legacy_scaler_path(path):
+    """Pickled sklearn scaler written by older versions next to the .npz artifact"""
+    return os.path.splitext(path)[0] + '.pkl'
+
+
+def scaler_available(path):
+    return os.path.exists(path) or os.path.exists(legacy_scaler_path(path))
+
+
+def load_scaler(path):
+    """Load a frozen scaler, converting a legacy pickled MinMaxScaler on first use"""
+    if not os.path.exists(path):
+        with open(legacy_scaler_path(path), 'rb') as f:
+            scaler = FrozenMinMaxScaler.from_sklearn(pickle.load(f))
+        scaler.save(path)
+        return scaler
+    return FrozenMinMaxScaler.load(path)
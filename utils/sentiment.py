@@ -0,0 +1,87 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Compact finance-oriented lexicon (in the spirit of Loughran-McDonald); weights in [-2, 2]
+POSITIVE = {
+    'beat': 2, 'beats': 2, 'record': 1, 'surge': 2, 'surges': 2, 'soar': 2, 'soars': 2, 'jump': 1,
+    'jumps': 1, 'rally': 1, 'rallies': 1, 'gain': 1, 'gains': 1, 'rise': 1, 'rises': 1, 'growth': 1,
+    'grow': 1, 'grows': 1, 'profit': 1, 'profits': 1, 'profitable': 1, 'upgrade': 2, 'upgrades': 2,
+    'upgraded': 2, 'outperform': 2, 'outperforms': 2, 'strong': 1, 'stronger': 1, 'bullish': 2,
+    'boost': 1, 'boosts': 1, 'raise': 1, 'raises': 1, 'raised': 1, 'exceed': 1, 'exceeds': 1,
+    'exceeded': 1, 'optimistic': 1, 'positive': 1, 'buy': 1, 'win': 1, 'wins': 1, 'innovation': 1,
+    'expands': 1, 'expansion': 1, 'rebound': 1, 'rebounds': 1, 'high': 1, 'highs': 1, 'approval': 1,
+    'approved': 1, 'dividend': 1, 'buyback': 1,
+}
+NEGATIVE = {
+    'miss': -2, 'misses': -2, 'missed': -2, 'plunge': -2, 'plunges': -2, 'slump': -2, 'slumps': -2,
+    'fall': -1, 'falls': -1, 'drop': -1, 'drops': -1, 'decline': -1, 'declines': -1, 'loss': -1,
+    'losses': -1, 'weak': -1, 'weaker': -1, 'downgrade': -2, 'downgrades': -2, 'downgraded': -2,
+    'underperform': -2, 'bearish': -2, 'cut': -1, 'cuts': -1, 'lawsuit': -1, 'probe': -1,
+    'investigation': -1, 'fine': -1, 'fined': -1, 'recall': -1, 'layoffs': -1, 'warning': -1,
+    'warns': -1, 'risk': -1, 'risks': -1, 'concern': -1, 'concerns': -1, 'sell': -1, 'selloff': -2,
+    'crash': -2, 'lower': -1, 'low': -1, 'lows': -1, 'delay': -1, 'delays': -1, 'slowdown': -1,
+    'bankruptcy': -2, 'fraud': -2, 'tariff': -1, 'tariffs': -1,
+}
+NEGATIONS = {'not', 'no', 'never', "n't", 'without', 'fails', 'failed'}
+LEXICON = {**POSITIVE, **NEGATIVE}
+
+# "n't" is split off its verb ("didn't" -> "did", "n't") so contractions negate like "not"
+_TOKEN = re.compile(r"[a-z]+?(?=n't)|n't|[a-z]+(?:'[a-z]+)?")
+
+
+def score_texts(texts):
+    """Sentiment score in (-1, 1) for each text, computed as one vectorized batch
+
+    Tokens are looked up once per distinct word, a negation flips the next token's
+    weight, and per-text sums are normalized by the total absolute weight.
+    """
+    token_lists = [_TOKEN.findall((text or '').lower().replace('\u2019', "'")) for text in texts]
+    lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists))
+    if lengths.sum() == 0:
+        return np.zeros(len(token_lists))
+
+    tokens = [token for tokens in token_lists for token in tokens]
+    doc_ids = np.repeat(np.arange(len(token_lists)), lengths)
+    inverse, vocab = pd.factorize(pd.Series(tokens, dtype=object))
+    weights = np.array([LEXICON.get(word, 0) for word in vocab], dtype='float64')[inverse]
+    negates = np.array([word in NEGATIONS for word in vocab])[inverse]
+
+    # Flip a weight when the previous token in the same text is a negation
+    flip = np.zeros(len(tokens), dtype=bool)
+    flip[1:] = negates[:-1] & (doc_ids[1:] == doc_ids[:-1])
+    weights[flip] *= -1
+
+    total = np.bincount(doc_ids, weights=weights, minlength=len(token_lists))
+    magnitude = np.bincount(doc_ids, weights=np.abs(weights), minlength=len(token_lists))
+    return total / (magnitude + 1.0)
+
+
+def score_articles(articles):
+    """Scores for NewsAPI-shaped articles, from title plus description"""
+    return score_texts(f"{a.get('title') or ''}. {a.get('description') or ''}" for a in articles)
+
+
+def sentiment_series(articles, freq='D'):
+    """Mean article sentiment per period, indexed by publication date"""
+    if not articles:
+        return pd.Series(dtype='float64', name='Sentiment')
+    published = pd.to_datetime([a.get('publishedAt') for a in articles], utc=True, errors='coerce')
+    scores = pd.Series(score_articles(articles), index=published, name='Sentiment')
+    scores = scores[scores.index.notna()].sort_index()
+    return scores.resample(freq).mean().dropna()
+
+
+def watchlist_sentiment(tickers, store, days=30):
+    """Mean sentiment and article count per ticker from stored news, without any LLM calls"""
+    rows = []
+    for ticker in tickers:
+        articles = store.recent(ticker, days=days)
+        scores = score_articles(articles)
+        rows.append({
+            'Ticker': ticker.upper(),
+            'Sentiment': float(scores.mean()) if len(scores) else np.nan,
+            'Articles': len(articles),
+        })
+    return pd.DataFrame(rows)
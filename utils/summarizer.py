@@ -0,0 +1,94 @@
+import time
+from collections import deque
+
+from utils.clients import get_openai_client
+from utils.summary_cache import get_summary_cache, summary_key
+
+SUMMARY_MODEL = 'gpt-3.5-turbo'
+# Bump whenever the prompt wording changes so cached summaries are not reused
+PROMPT_VERSION = 1
+
+# Latency of recent summaries (most recent last), for monitoring
+recent_metrics = deque(maxlen=500)
+
+
+def build_prompt(ticker, articles):
+    """Summarization prompt for a ticker's articles, or None if there is nothing to summarize"""
+    combined_text = "\n\n".join(
+        f"{article.get('title', '')}\n{article.get('description', '')}" for article in articles
+    )
+    if not combined_text.strip():
+        return None
+    return f"Summarize the following news and present them in bullet points. Add a short summary paragraph after the bullet indicating wether it is good or bad for the stock price. {ticker}:\n\n{combined_text}"
+
+
+def summarize(ticker, articles, client=None, cache=None):
+    """LLM summary of the articles, served from the summary cache when the article set is unchanged
+
+    Returns (summary, cached); summary is None when the articles have no text.
+    """
+    prompt = build_prompt(ticker, articles)
+    if prompt is None:
+        return None, False
+
+    cache = cache or get_summary_cache()
+    key = summary_key(ticker, articles, PROMPT_VERSION, SUMMARY_MODEL)
+    summary = cache.get(key)
+    if summary is not None:
+        return summary, True
+
+    client = client or get_openai_client()
+    response = client.chat.completions.create(
+        model=SUMMARY_MODEL,
+        messages=[{"role": "user", "content": prompt}]
+    )
+    summary = response.choices[0].message.content
+    cache.put(key, ticker, summary)
+    return summary, False
+
+
+def stream_summary(ticker, articles, client=None, cache=None, metrics=None):
+    """Yield the summary as it is generated, token chunk by token chunk
+
+    A cache hit yields the whole summary at once. If a metrics dict is passed it is
+    filled with time_to_first_token, total_latency (seconds), chunks and cached.
+    """
+    metrics = metrics if metrics is not None else {}
+    start = time.perf_counter()
+    prompt = build_prompt(ticker, articles)
+    if prompt is None:
+        return
+
+    cache = cache or get_summary_cache()
+    key = summary_key(ticker, articles, PROMPT_VERSION, SUMMARY_MODEL)
+    summary = cache.get(key)
+    if summary is not None:
+        elapsed = time.perf_counter() - start
+        metrics.update(time_to_first_token=elapsed, total_latency=elapsed, chunks=1, cached=True)
+        recent_metrics.append(dict(metrics, ticker=ticker))
+        yield summary
+        return
+
+    client = client or get_openai_client()
+    stream = client.chat.completions.create(
+        model=SUMMARY_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        stream=True,
+    )
+    parts = []
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        text = chunk.choices[0].delta.content
+        if not text:
+            continue
+        if not parts:
+            metrics['time_to_first_token'] = time.perf_counter() - start
+        parts.append(text)
+        yield text
+
+    metrics.update(total_latency=time.perf_counter() - start, chunks=len(parts), cached=False)
+    metrics.setdefault('time_to_first_token', metrics['total_latency'])
+    recent_metrics.append(dict(metrics, ticker=ticker))
+    if parts:
+        cache.put(key, ticker, ''.join(parts))
@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_DB = os.path.join('data', 'summaries.sqlite')
+
+
+def summary_key(ticker, articles, prompt_version, model):
+    """Content hash of everything that determines a summary"""
+    payload = json.dumps(
+        [ticker.upper(), prompt_version, model,
+         [[a.get('title') or '', a.get('description') or ''] for a in articles]],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SummaryCache:
+    """Disk-backed LLM summary cache with TTL expiry and LRU eviction"""
+
+    def __init__(self, db_path=DEFAULT_DB, ttl=6 * 60 * 60, max_entries=2000):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS summaries ('
+                ' key TEXT PRIMARY KEY, ticker TEXT NOT NULL, summary TEXT NOT NULL,'
+                ' created_at REAL NOT NULL, last_access REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS summaries_lru ON summaries (last_access)')
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def get(self, key):
+        """Cached summary, or None if missing or older than the TTL"""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute('SELECT summary, created_at FROM summaries WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl:
+                conn.execute('DELETE FROM summaries WHERE key = ?', (key,))
+                return None
+            conn.execute('UPDATE summaries SET last_access = ? WHERE key = ?', (now, key))
+        return row[0]
+
+    def put(self, key, ticker, summary):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO summaries (key, ticker, summary, created_at, last_access)'
+                ' VALUES (?, ?, ?, ?, ?)',
+                (key, ticker.upper(), summary, now, now),
+            )
+            conn.execute('DELETE FROM summaries WHERE created_at < ?', (now - self.ttl,))
+            # Least recently used entries beyond max_entries are evicted
+            conn.execute(
+                'DELETE FROM summaries WHERE key IN ('
+                ' SELECT key FROM summaries ORDER BY last_access DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,),
+            )
+
+
+_cache = None
+_cache_guard = threading.Lock()
+
+
+def get_summary_cache():
+    """Process-wide SummaryCache shared by all sessions"""
+    global _cache
+    with _cache_guard:
+        if _cache is None:
+            _cache = SummaryCache()
+        return _cache
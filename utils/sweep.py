@@ -0,0 +1,191 @@
+"""Hyperparameter sweep for StockLSTMPredictor.
+
+Trials run on a CPU process pool with TensorFlow pinned to a few threads per
+worker. The scaled feature series is written once as .npy and memory-mapped by
+every trial, and trials whose validation loss trails the median of finished
+trials at the same epoch are stopped early.
+
+    python -m utils.sweep AAPL --trials 20 --workers 4
+    python -m utils.sweep AAPL --grid --max-epochs 30
+"""
+import argparse
+import itertools
+import os
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.training_jobs import MODEL_DIR, read_job, tf_process_pool, write_job
+
+SWEEP_DIR = os.path.join(MODEL_DIR, 'sweeps')
+SEARCH_SPACE = {
+    'lookback_window': [30, 60, 90, 120],
+    'units': [32, 50, 64],
+    'layers': [1, 2, 3],
+    'dropout': [0.1, 0.2, 0.3],
+    'learning_rate': [1e-3, 5e-4],
+    'batch_size': [32, 64],
+}
+LEADERBOARD_COLUMNS = [
+    'trial', 'lookback_window', 'units', 'layers', 'dropout', 'learning_rate', 'batch_size',
+    'epochs_run', 'stopped_early', 'val_loss', 'mae', 'rmse', 'r2', 'train_seconds', 'inference_ms', 'error',
+]
+
+
+def grid_trials(space=SEARCH_SPACE):
+    """Every combination in the search space"""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[n] for n in names))]
+
+
+def random_trials(n_trials, space=SEARCH_SPACE, seed=None):
+    """n_trials distinct combinations sampled from the search space"""
+    grid = grid_trials(space)
+    return random.Random(seed).sample(grid, min(n_trials, len(grid)))
+
+
+def prepare_dataset(ticker, sweep_dir):
+    """Fetch and scale a ticker's features once; returns (series .npy path, scaler path)"""
+    from utils.lstm_predictor import StockLSTMPredictor
+    from utils.preprocessing import FrozenMinMaxScaler
+
+    os.makedirs(sweep_dir, exist_ok=True)
+    predictor = StockLSTMPredictor(symbol=ticker)
+    data = predictor.fetch_data(period='10y')
+    scaler = FrozenMinMaxScaler.fit(data, feature_range=(0, 1))
+    dataset_path = os.path.join(sweep_dir, 'scaled.npy')
+    scaler_path = os.path.join(sweep_dir, 'scaler.npz')
+    np.save(dataset_path, scaler.transform(data).astype('float32'))
+    scaler.save(scaler_path)
+    return dataset_path, scaler_path
+
+
+def _median_stopping(curve_dir, trial_name, grace_epochs, min_trials):
+    """Keras callback stopping a trial whose best val_loss is worse than the median of finished trials"""
+    from tensorflow.keras.callbacks import Callback
+
+    class MedianStopping(Callback):
+        def __init__(self):
+            super().__init__()
+            self.curve = []
+            self.stopped = False
+
+        def on_epoch_end(self, epoch, logs=None):
+            self.curve.append(float((logs or {}).get('val_loss', np.inf)))
+            write_job(curve_dir, trial_name, status='running', val_loss=self.curve)
+            if epoch + 1 < grace_epochs:
+                return
+            peers = []
+            for name in os.listdir(curve_dir):
+                state = read_job(curve_dir, name[:-len('.json')]) if name.endswith('.json') else None
+                if state and state.get('status') == 'done' and len(state['val_loss']) > epoch:
+                    peers.append(min(state['val_loss'][:epoch + 1]))
+            if len(peers) >= min_trials and min(self.curve) > np.median(peers):
+                self.stopped = True
+                self.model.stop_training = True
+
+    return MedianStopping()
+
+
+def _run_trial(trial, params, ticker, dataset_path, scaler_path, curve_dir, max_epochs,
+               grace_epochs, min_trials):
+    """Worker entry point: train one configuration and time it; returns a leaderboard row"""
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+    from utils.lstm_predictor import StockLSTMPredictor
+    from utils.preprocessing import FrozenMinMaxScaler
+
+    trial_name = f'trial_{trial:04d}'
+    row = dict(params, trial=trial)
+    predictor = StockLSTMPredictor(symbol=ticker, lookback_window=params['lookback_window'])
+    predictor.scaler = FrozenMinMaxScaler.load(scaler_path)
+    predictor.load_scaled(np.load(dataset_path, mmap_mode='r'), test_size=0.2)
+    predictor.build_model(units=params['units'], layers=params['layers'], dropout=params['dropout'],
+                          learning_rate=params['learning_rate'])
+
+    stopper = _median_stopping(curve_dir, trial_name, grace_epochs, min_trials)
+    started = time.perf_counter()
+    history = predictor.train_model(epochs=max_epochs, batch_size=params['batch_size'], callbacks=[stopper])
+    train_seconds = time.perf_counter() - started
+    write_job(curve_dir, trial_name, status='done' if not stopper.stopped else 'stopped')
+
+    n_samples = len(predictor.X_train) + len(predictor.X_test)
+    test_pred = predictor.model.predict(predictor.window_dataset(predictor.split_idx, n_samples, batch_size=1024),
+                                        verbose=0)
+    actual = predictor.inverse_close(predictor.y_test)
+    predicted = predictor.inverse_close(test_pred[:, 0])
+
+    # Single-window latency, as served by the prediction page
+    window = np.ascontiguousarray(predictor.X_test[-1:], dtype='float32')
+    predictor.model(window, training=False)
+    timings = []
+    for _ in range(20):
+        started = time.perf_counter()
+        predictor.model(window, training=False)
+        timings.append(time.perf_counter() - started)
+
+    row.update(
+        epochs_run=len(history.history['loss']),
+        stopped_early=stopper.stopped,
+        val_loss=float(min(history.history['val_loss'])),
+        mae=float(mean_absolute_error(actual, predicted)),
+        rmse=float(np.sqrt(mean_squared_error(actual, predicted))),
+        r2=float(r2_score(actual, predicted)),
+        train_seconds=train_seconds,
+        inference_ms=float(np.median(timings) * 1000),
+    )
+    return row
+
+
+def run_sweep(ticker, trials, sweep_dir=None, max_workers=None, threads_per_worker=2, max_epochs=50,
+              grace_epochs=5, min_trials=3):
+    """Train every trial configuration and write leaderboard.csv; returns the leaderboard sorted by RMSE"""
+    ticker = ticker.upper()
+    sweep_dir = sweep_dir or os.path.join(SWEEP_DIR, ticker)
+    curve_dir = os.path.join(sweep_dir, 'curves')
+    os.makedirs(curve_dir, exist_ok=True)
+    for name in os.listdir(curve_dir):
+        os.remove(os.path.join(curve_dir, name))
+    dataset_path, scaler_path = prepare_dataset(ticker, sweep_dir)
+
+    if max_workers is None:
+        max_workers = max(1, (os.cpu_count() or 1) // threads_per_worker)
+    rows = []
+    with tf_process_pool(max_workers, threads_per_worker) as pool:
+        futures = [
+            pool.submit(_run_trial, trial, params, ticker, dataset_path, scaler_path, curve_dir,
+                        max_epochs, grace_epochs, min_trials)
+            for trial, params in enumerate(trials)
+        ]
+        for (trial, params), future in zip(enumerate(trials), futures):
+            try:
+                rows.append(future.result())
+            except Exception as e:
+                rows.append(dict(params, trial=trial, error=str(e)))
+
+    leaderboard = pd.DataFrame(rows, columns=LEADERBOARD_COLUMNS).sort_values('rmse', na_position='last')
+    leaderboard.to_csv(os.path.join(sweep_dir, 'leaderboard.csv'), index=False)
+    return leaderboard
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Hyperparameter sweep for the LSTM predictor.')
+    parser.add_argument('ticker')
+    parser.add_argument('--grid', action='store_true', help='try every combination instead of sampling')
+    parser.add_argument('--trials', type=int, default=20, help='random trials to sample')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=None, help='parallel trials (default: CPUs / threads)')
+    parser.add_argument('--threads', type=int, default=2, help='TensorFlow intra-op threads per worker')
+    parser.add_argument('--max-epochs', type=int, default=50)
+    parser.add_argument('--sweep-dir', default=None)
+    args = parser.parse_args(argv)
+
+    trials = grid_trials() if args.grid else random_trials(args.trials, seed=args.seed)
+    leaderboard = run_sweep(args.ticker, trials, sweep_dir=args.sweep_dir, max_workers=args.workers,
+                            threads_per_worker=args.threads, max_epochs=args.max_epochs)
+    print(leaderboard.head(10).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+"""Lean CPU inference artifacts for saved LSTM models.
+
+Exports models/{ticker}_lstm_model.keras to TensorFlow Lite, optionally quantized,
+and runs it with the standalone tflite_runtime interpreter when it is installed,
+so serving workers do not need to import full TensorFlow. The prediction page and
+batch_predict serve an export instead of the Keras model whenever one is up to date.
+
+    python -m utils.tflite_model AAPL --quantize float16
+"""
+import argparse
+import os
+
+import numpy as np
+
+from utils.model_registry import LoadedModel
+
+QUANTIZATION_MODES = (None, 'float16', 'int8')
+
+
+def tflite_path(model_path, quantize=None):
+    """Path of the exported model next to the Keras file"""
+    base = model_path[:-len('.keras')] if model_path.endswith('.keras') else os.path.splitext(model_path)[0]
+    return f'{base}_{quantize}.tflite' if quantize else f'{base}.tflite'
+
+
+def fresh_tflite_path(model_path):
+    """Newest export of a Keras model (any quantization), or None if none is newer than the model
+
+    Only exports that passed the parity check in main() are ever written to these paths.
+    """
+    if not os.path.exists(model_path):
+        return None
+    model_mtime = os.stat(model_path).st_mtime_ns
+    fresh = []
+    for quantize in QUANTIZATION_MODES:
+        lite_path = tflite_path(model_path, quantize)
+        if os.path.exists(lite_path) and os.stat(lite_path).st_mtime_ns >= model_mtime:
+            fresh.append((os.stat(lite_path).st_mtime_ns, lite_path))
+    return max(fresh)[1] if fresh else None
+
+
+def export_tflite(model_path, output_path=None, quantize=None, representative_windows=None):
+    """Convert a saved Keras model to TFLite; returns the written path
+
+    quantize='float16' halves the weights; quantize='int8' quantizes weights and,
+    when representative_windows are given, calibrates activations on them too.
+    """
+    import tensorflow as tf
+
+    if quantize not in QUANTIZATION_MODES:
+        raise ValueError(f'quantize must be one of {QUANTIZATION_MODES}')
+    model = tf.keras.models.load_model(model_path)
+    _, lookback, n_features = model.input_shape
+
+    # A fixed batch of one lets the converter fuse each LSTM into a single builtin op
+    serve = tf.function(lambda x: model(x, training=False))
+    concrete = serve.get_concrete_function(tf.TensorSpec([1, lookback, n_features], tf.float32))
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([concrete], model)
+
+    if quantize == 'float16':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif quantize == 'int8':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        if representative_windows is not None:
+            windows = np.asarray(representative_windows, dtype='float32')
+
+            def representative_dataset():
+                for window in windows[-200:]:
+                    yield [window[np.newaxis]]
+
+            converter.representative_dataset = representative_dataset
+
+    output_path = output_path or tflite_path(model_path, quantize)
+    tmp_path = f'{output_path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(converter.convert())
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def _interpreter_class():
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        import tensorflow as tf
+
+        Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+
+class TFLiteRunner:
+    """Batch-of-one TFLite interpreter that stands in for a single-input Keras model
+
+    Supports what serving uses: predict(), calling it on a batch, and input_shape.
+    """
+
+    def __init__(self, path, num_threads=1):
+        self.path = path
+        self.interpreter = _interpreter_class()(model_path=path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+
+    @property
+    def input_shape(self):
+        return tuple(self._input['shape'])
+
+    def _invoke(self, window):
+        self.interpreter.set_tensor(self._input['index'], window[np.newaxis])
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self._output['index'])[0]
+
+    def predict(self, windows, verbose=0):
+        """Scaled predictions for windows of shape (n, lookback, features), shape (n, 1)"""
+        windows = np.asarray(windows, dtype='float32')
+        return np.stack([self._invoke(window) for window in windows])
+
+    def __call__(self, windows, training=False):
+        return self.predict(windows)
+
+
+def load_tflite_artifacts(ticker, version, lite_path, scaler_path):
+    """Registry loader for an exported model; resident size is the flatbuffer size"""
+    from utils.preprocessing import load_scaler
+
+    return LoadedModel(ticker, version, TFLiteRunner(lite_path), load_scaler(scaler_path),
+                       os.path.getsize(lite_path))
+
+
+def parity_check(model_path, lite_path, windows, atol=1e-3):
+    """Compare Keras and TFLite outputs on the same scaled windows
+
+    Returns (max absolute difference, within tolerance). Quantized exports need a
+    looser atol, e.g. 1e-2 for int8.
+    """
+    from tensorflow.keras.models import load_model
+
+    windows = np.asarray(windows, dtype='float32')
+    expected = load_model(model_path)(windows, training=False).numpy()
+    actual = TFLiteRunner(lite_path).predict(windows)
+    max_diff = float(np.max(np.abs(expected - actual)))
+    return max_diff, max_diff <= atol
+
+
+def main(argv=None):
+    from utils.lstm_predictor import StockLSTMPredictor
+    from utils.preprocessing import load_scaler
+    from utils.training_jobs import MODEL_DIR, model_paths
+
+    parser = argparse.ArgumentParser(description='Export a saved LSTM model to TensorFlow Lite.')
+    parser.add_argument('tickers', nargs='+')
+    parser.add_argument('--quantize', choices=['float16', 'int8'], default=None,
+                        help='quantized exports are served too, whichever passing export is newest')
+    parser.add_argument('--model-dir', default=MODEL_DIR)
+    parser.add_argument('--lookback', type=int, default=90)
+    parser.add_argument('--atol', type=float, default=None, help='parity tolerance (default depends on --quantize)')
+    args = parser.parse_args(argv)
+    atol = args.atol or {None: 1e-4, 'float16': 1e-3, 'int8': 2e-2}[args.quantize]
+
+    failed = []
+    for ticker in args.tickers:
+        ticker = ticker.upper()
+        model_path, scaler_path, _ = model_paths(ticker, args.model_dir)
+        predictor = StockLSTMPredictor(symbol=ticker, lookback_window=args.lookback)
+        predictor.fetch_data(period='10y')
+        predictor.scaler = load_scaler(scaler_path)
+        predictor.prepare_data(fit_scaler=False)
+
+        # Serving picks exports up by path, so a candidate only goes live once it passes parity
+        lite_path = tflite_path(model_path, args.quantize)
+        candidate = export_tflite(model_path, output_path=f'{lite_path}.pending', quantize=args.quantize,
+                                  representative_windows=predictor.X_train)
+        max_diff, ok = parity_check(model_path, candidate, predictor.X_test[-64:], atol=atol)
+        if ok:
+            os.replace(candidate, lite_path)
+            print(f'{ticker}: wrote {lite_path} ({os.path.getsize(lite_path) / 1024:.0f} KiB, '
+                  f'Keras {os.path.getsize(model_path) / 1024:.0f} KiB); max |diff| {max_diff:.2e} ok')
+        else:
+            os.remove(candidate)
+            failed.append(ticker)
+            print(f'{ticker}: discarded export; max |diff| {max_diff:.2e} EXCEEDS {atol}')
+
+    if failed:
+        raise SystemExit(f'Parity check failed for {", ".join(failed)}; no export was installed.')
+
+if __name__ == '__main__':
+    main()
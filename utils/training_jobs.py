@@ -0,0 +1,236 @@
+"""Background model training on a process pool, with job state persisted as JSON.
+
+    python -m utils.training_jobs AAPL MSFT
+    python -m utils.training_jobs AAPL --horizon 5   # direct 5-day model for utils.forecast
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.cli import add_ticker_args, read_tickers
+
+MODEL_DIR = 'models'
+JOB_DIR = os.path.join(MODEL_DIR, 'jobs')
+ACTIVE_STATES = ('queued', 'running')
+# A fine-tune only sees the newest bars, so it runs a few epochs at a low learning rate
+DEFAULT_EPOCHS = {'train': 50, 'fine_tune': 3}
+
+
+def model_paths(ticker, model_dir=MODEL_DIR, horizon=1):
+    """Saved model, scaler and metadata paths for a ticker; horizon > 1 names a direct multi-step model"""
+    name = job_name(ticker, horizon)
+    return (
+        os.path.join(model_dir, f'{name}_lstm_model.keras'),
+        os.path.join(model_dir, f'{name}_scaler.npz'),
+        os.path.join(model_dir, f'{name}_meta.json'),
+    )
+
+
+def job_name(ticker, horizon=1):
+    """Job (and model file) name; each horizon of a ticker trains as its own job"""
+    return ticker if horizon == 1 else f'{ticker}_h{horizon}'
+
+
+def init_tf_worker(intra_op_threads, inter_op_threads=1):
+    """Pool initializer: cap TensorFlow's thread pools before it starts"""
+    os.environ['TF_NUM_INTRAOP_THREADS'] = str(intra_op_threads)
+    os.environ['TF_NUM_INTEROP_THREADS'] = str(inter_op_threads)
+    os.environ['OMP_NUM_THREADS'] = str(intra_op_threads)
+    import tensorflow as tf
+
+    tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+    tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+
+
+def tf_process_pool(max_workers, threads_per_worker=None):
+    """Process pool for TensorFlow work; threads_per_worker pins each worker's thread pools
+
+    Without pinning, every worker sizes its pools to all cores and parallel jobs oversubscribe them.
+    """
+    if threads_per_worker is None:
+        initializer, initargs = None, ()
+    else:
+        initializer, initargs = init_tf_worker, (threads_per_worker, 1)
+    # TensorFlow is not fork-safe, so workers start from a fresh interpreter
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'),
+                               initializer=initializer, initargs=initargs)
+
+
+def _job_path(job_dir, ticker):
+    return os.path.join(job_dir, f'{ticker}.json')
+
+
+def read_job(job_dir, ticker):
+    path = _job_path(job_dir, ticker)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_job(job_dir, ticker, **fields):
+    """Merge fields into the persisted job state (atomic replace)"""
+    os.makedirs(job_dir, exist_ok=True)
+    state = read_job(job_dir, ticker) or {'ticker': ticker}
+    state.update(fields)
+    path = _job_path(job_dir, ticker)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+    return state
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except (OSError, TypeError):
+        return False
+    return True
+
+
+def _run_training_job(ticker, lookback_window, epochs, batch_size, model_dir, job_dir, mode='train', horizon=1):
+    """Worker entry point: train (or fine-tune) and save one ticker's model"""
+    from tensorflow.keras.callbacks import Callback
+    from utils.lstm_predictor import StockLSTMPredictor
+
+    name = job_name(ticker, horizon)
+
+    class JobProgress(Callback):
+        def on_epoch_end(self, epoch, logs=None):
+            write_job(job_dir, name, epoch=epoch + 1,
+                      val_loss=float((logs or {}).get('val_loss', float('nan'))))
+
+    write_job(job_dir, name, status='running', started_at=time.time(), worker_pid=os.getpid())
+    try:
+        predictor = StockLSTMPredictor(symbol=ticker, lookback_window=lookback_window, horizon=horizon)
+        model_path, scaler_path, meta_path = model_paths(ticker, model_dir, horizon=horizon)
+        if mode == 'fine_tune':
+            new_bars = predictor.fine_tune(model_path, scaler_path, meta_path, epochs=epochs,
+                                           batch_size=batch_size, callbacks=[JobProgress()])
+            write_job(job_dir, name, status='done', new_bars=new_bars, finished_at=time.time())
+            return
+        df = predictor.fetch_data(period='10y')
+        if df.empty or df.shape[0] < 100:
+            raise ValueError('Not enough historical data downloaded.')
+        predictor.train_and_save(model_path, scaler_path, meta_path, epochs=epochs,
+                                 batch_size=batch_size, callbacks=[JobProgress()])
+    except Exception as e:
+        write_job(job_dir, name, status='failed', error=str(e), finished_at=time.time())
+        raise
+    write_job(job_dir, name, status='done', finished_at=time.time())
+
+
+class TrainingJobQueue:
+    """Trains models on a process pool, one job per ticker at a time"""
+
+    def __init__(self, max_workers=2, model_dir=MODEL_DIR, job_dir=JOB_DIR):
+        self.model_dir = model_dir
+        self.job_dir = job_dir
+        self._executor = tf_process_pool(max_workers)
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def _in_flight(self, name):
+        future = self._futures.get(name)
+        if future is not None:
+            return not future.done()
+        # Jobs persisted by another live server process are still in flight
+        state = read_job(self.job_dir, name)
+        return (
+            state is not None
+            and state.get('status') in ACTIVE_STATES
+            and state.get('owner_pid') != os.getpid()
+            and _pid_alive(state.get('owner_pid'))
+        )
+
+    def submit(self, ticker, lookback_window=90, epochs=None, batch_size=32, mode='train', horizon=1):
+        """Queue a training job unless one for this ticker and horizon is already queued or running
+
+        mode='fine_tune' updates an existing model with the bars since its data watermark.
+        epochs defaults to DEFAULT_EPOCHS[mode]. horizon > 1 trains the direct multi-step
+        model that utils.forecast serves for that horizon.
+        """
+        if epochs is None:
+            epochs = DEFAULT_EPOCHS[mode]
+        name = job_name(ticker, horizon)
+        with self._lock:
+            if self._in_flight(name):
+                return self.status(ticker, horizon)
+            state = write_job(
+                self.job_dir, name, status='queued', mode=mode, horizon=horizon, submitted_at=time.time(),
+                owner_pid=os.getpid(), epoch=0, epochs=epochs, error=None,
+                started_at=None, finished_at=None,
+            )
+            future = self._executor.submit(
+                _run_training_job, ticker, lookback_window, epochs, batch_size,
+                self.model_dir, self.job_dir, mode, horizon,
+            )
+            future.add_done_callback(lambda f, n=name: self._on_done(n, f))
+            self._futures[name] = future
+            return state
+
+    def _on_done(self, name, future):
+        # The worker records its own failures; this catches crashed or killed workers
+        error = future.exception()
+        state = read_job(self.job_dir, name) or {}
+        if error is not None and state.get('status') in ACTIVE_STATES:
+            write_job(self.job_dir, name, status='failed', error=str(error), finished_at=time.time())
+
+    def status(self, ticker, horizon=1):
+        """Persisted job state for a ticker's model, or None if it was never submitted"""
+        name = job_name(ticker, horizon)
+        state = read_job(self.job_dir, name)
+        if state is not None and state.get('status') in ACTIVE_STATES and not self._in_flight(name):
+            # Left behind by a server process that exited mid-job
+            state = write_job(self.job_dir, name, status='failed', error='Training was interrupted.')
+        return state
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+_queue = None
+_queue_guard = threading.Lock()
+
+
+def get_job_queue():
+    """Process-wide TrainingJobQueue shared across Streamlit sessions"""
+    global _queue
+    with _queue_guard:
+        if _queue is None:
+            _queue = TrainingJobQueue()
+        return _queue
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Train (or fine-tune) LSTM models for a watchlist.')
+    add_ticker_args(parser)
+    parser.add_argument('--horizon', type=int, default=1, help='train a direct model for this many days ahead')
+    parser.add_argument('--fine-tune', action='store_true', help='update existing models with new bars')
+    parser.add_argument('--epochs', type=int, default=None)
+    parser.add_argument('--lookback', type=int, default=90)
+    parser.add_argument('--model-dir', default=MODEL_DIR)
+    parser.add_argument('--workers', type=int, default=2)
+    args = parser.parse_args(argv)
+
+    tickers = read_tickers(args, parser)
+
+    queue = TrainingJobQueue(max_workers=args.workers, model_dir=args.model_dir,
+                             job_dir=os.path.join(args.model_dir, 'jobs'))
+    for ticker in tickers:
+        queue.submit(ticker, lookback_window=args.lookback, epochs=args.epochs,
+                     mode='fine_tune' if args.fine_tune else 'train', horizon=args.horizon)
+    queue.shutdown(wait=True)
+    for ticker in tickers:
+        state = queue.status(ticker, args.horizon) or {}
+        print(f"{job_name(ticker, args.horizon)}: {state.get('status')}"
+              + (f" ({state['error']})" if state.get('error') else ''))
+
+
+if __name__ == '__main__':
+    main()
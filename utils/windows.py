@@ -0,0 +1,68 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def sliding_windows(data, lookback):
+    """Read-only strided view of every lookback-length window, shape (n - lookback + 1, lookback, features)"""
+    data = np.asarray(data)
+    return sliding_window_view(data, lookback, axis=0).transpose(0, 2, 1)
+
+
+def window_dataset(data, lookback, start, stop, target_col=3, batch_size=32, shuffle=False, seed=None,
+                   horizon=1):
+    """tf.data pipeline yielding (window, next-step target) batches for sample indices [start, stop)
+
+    Sample i is the window data[i:i + lookback] with target data[i + lookback, target_col];
+    with horizon > 1 the target is the next horizon values of target_col.
+    Only the series itself is held in memory; windows are gathered one batch at a time.
+    """
+    import tensorflow as tf
+
+    series = tf.constant(np.asarray(data, dtype='float32'))
+    offsets = tf.range(lookback, dtype=tf.int64)
+    steps = tf.range(horizon, dtype=tf.int64)
+
+    def gather(idx):
+        x = tf.gather(series, idx[:, None] + offsets[None, :])
+        if horizon == 1:
+            y = tf.gather(series[:, target_col], idx + lookback)
+        else:
+            y = tf.gather(series[:, target_col], idx[:, None] + lookback + steps[None, :])
+        return x, y
+
+    ds = tf.data.Dataset.range(start, stop)
+    if shuffle:
+        ds = ds.shuffle(stop - start, seed=seed, reshuffle_each_iteration=True)
+    ds = ds.batch(batch_size).map(gather, num_parallel_calls=tf.data.AUTOTUNE)
+    return ds.prefetch(tf.data.AUTOTUNE)
+
+
+def pooled_window_dataset(series_list, lookback, ranges, ids, target_col=3, batch_size=32, shuffle=False, seed=None,
+                          id_dropout=0.0):
+    """tf.data pipeline over windows of several series, yielding ((window, series id), target) batches
+
+    ranges[k] = (start, stop) are sample indices into series_list[k], as in window_dataset,
+    and ids[k] is fed alongside each of its windows. Windows never cross series boundaries.
+    id_dropout is the fraction of samples, redrawn every epoch, whose id is replaced by 0.
+    """
+    import tensorflow as tf
+
+    offsets = np.concatenate([[0], np.cumsum([len(s) for s in series_list])[:-1]])
+    series = tf.constant(np.concatenate([np.asarray(s, dtype='float32') for s in series_list]))
+    starts = np.concatenate([np.arange(a, b) + off for (a, b), off in zip(ranges, offsets)]).astype('int64')
+    sample_ids = np.concatenate([np.full(b - a, i) for (a, b), i in zip(ranges, ids)]).astype('int32')
+    window_offsets = tf.range(lookback, dtype=tf.int64)
+
+    def gather(idx, series_id):
+        x = tf.gather(series, idx[:, None] + window_offsets[None, :])
+        y = tf.gather(series[:, target_col], idx + lookback)
+        if id_dropout:
+            dropped = tf.random.uniform(tf.shape(series_id), seed=seed) < id_dropout
+            series_id = tf.where(dropped, tf.zeros_like(series_id), series_id)
+        return (x, series_id[:, None]), y
+
+    ds = tf.data.Dataset.from_tensor_slices((starts, sample_ids))
+    if shuffle:
+        ds = ds.shuffle(len(starts), seed=seed, reshuffle_each_iteration=True)
+    ds = ds.batch(batch_size).map(gather, num_parallel_calls=tf.data.AUTOTUNE)
+    return ds.prefetch(tf.data.AUTOTUNE)